@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+산출물 위치・형식 자동 판별 리더 (변환 캐시 포함)
+항공사마다 산출물 배치가 다르다 (airline_01: 최상위 CSV, airline_02: analytics_data/ 아래 .xlsx 등).
+알려진 위치(항공사 폴더, analytics_data/)와 형식(CSV, 압축 CSV, .xlsx)을 차례로 찾아 읽고,
+처음 읽을 때 DataFrame을 바이너리(pickle)로 변환해 .artifact_cache/에 보관한다.
+캐시는 원본 경로・수정 시각(ns)・크기가 모두 같을 때만 쓰므로, 원본을 다시 생성하면 자동으로 무효가 된다.
+"""
+
+import os
+import sys
+import json
+import tempfile
+import pandas as pd
+from typing import Dict, Optional, Tuple
+
+from excel_io import (
+    CANDIDATE_EXCEL_FILE, CANDIDATE_EXCEL_SHEETS, EXCEL_SHEET_NAMES, read_excel_table, workbook_sheet_names
+)
+from output_compression import resolve_input_path
+
+# 산출물별 탐색 위치 (항공사 폴더 기준 경로(확장자 제외), Excel 시트명), 앞쪽 우선
+# 각 위치는 CSV(압축본 포함) → .xlsx 순으로 찾는다. 시트명이 None이면 첫 시트.
+ARTIFACT_LOCATIONS = {
+    "minimum_operations": [
+        ("monthly_minimum_operations_standard", EXCEL_SHEET_NAMES["monthly_minimum_operations_standard"]),
+        ("analytics_data/monthly_minimum_operations_standard", EXCEL_SHEET_NAMES["monthly_minimum_operations_standard"])
+    ],
+    "airport_schedule": [
+        ("airport_schedule_data", EXCEL_SHEET_NAMES["airport_schedule_data"]),
+        ("analytics_data/airport_schedule_data", EXCEL_SHEET_NAMES["airport_schedule_data"])
+    ],
+    # flat 레이아웃 운항후보 데이터셋 (candidate_data.xlsx 시트, 예전 international/・domestic/ 폴더 배치 포함)
+    "candidate_international_departure": [
+        ("analytics_data/candidate/international_departure", None),
+        ("analytics_data/candidate/candidate_data", CANDIDATE_EXCEL_SHEETS["international_departure"]),
+        ("analytics_data/candidate/international/international_departure", None)
+    ],
+    "candidate_international_arrival": [
+        ("analytics_data/candidate/international_arrival", None),
+        ("analytics_data/candidate/candidate_data", CANDIDATE_EXCEL_SHEETS["international_arrival"]),
+        ("analytics_data/candidate/international/international_arrival", None)
+    ],
+    "candidate_domestic": [
+        ("analytics_data/candidate/domestic", None),
+        ("analytics_data/candidate/candidate_data", CANDIDATE_EXCEL_SHEETS["domestic"]),
+        ("analytics_data/candidate/domestic/domestic_all", None)
+    ]
+}
+
+ARTIFACT_CACHE_DIR = ".artifact_cache"
+
+
+def locate_artifact(airline_dir: str, artifact: str) -> Optional[Tuple[str, Optional[str]]]:
+    """산출물 (파일 경로, Excel 시트명), 없으면 None
+
+    CSV(압축본 포함)가 하나라도 있으면 CSV를, 없으면 시트가 실제로 있는 .xlsx를 위치 순서대로 고른다.
+    """
+    locations = ARTIFACT_LOCATIONS[artifact]
+    for stem, _ in locations:
+        path = resolve_input_path(os.path.join(airline_dir, f"{stem}.csv"))
+        if path is not None:
+            return path, None
+    for stem, sheet in locations:
+        path = os.path.join(airline_dir, f"{stem}.xlsx")
+        if not os.path.exists(path):
+            continue
+        if sheet is None or sheet in workbook_sheet_names(path):
+            return path, sheet
+        # 시트명이 다른 예전 워크북은 첫 시트를 읽는다 (운항후보 통합 워크북은 데이터셋 시트가 있어야 함)
+        if os.path.basename(stem) != os.path.splitext(CANDIDATE_EXCEL_FILE)[0]:
+            return path, None
+    return None
+
+
+def parse_artifact(path: str, sheet: Optional[str] = None) -> pd.DataFrame:
+    """산출물 원본 파싱 (확장자로 CSV / Excel 판별)"""
+    if not path.endswith(".xlsx"):
+        return pd.read_csv(path)
+    return read_excel_table(path, sheet)
+
+
+class ArtifactReader:
+    """항공사 산출물 리더 (위치・형식 자동 판별 + 변환 캐시)"""
+
+    def __init__(self, use_cache: bool = True):
+        self.use_cache = use_cache
+        self.last_status: Dict[str, str] = {}  # 산출물별 마지막 읽기 결과 ("cache" / "parsed" / "missing")
+
+    def cache_paths(self, airline_dir: str, artifact: str) -> Dict[str, str]:
+        cache_dir = os.path.join(airline_dir, ARTIFACT_CACHE_DIR)
+        return {
+            "data": os.path.join(cache_dir, f"{artifact}.pkl"),
+            "meta": os.path.join(cache_dir, f"{artifact}.json")
+        }
+
+    def source_key(self, path: str, sheet: Optional[str]) -> Dict:
+        """캐시 키: 원본 절대 경로 + 시트명 + 수정 시각(ns) + 크기"""
+        stat = os.stat(path)
+        return {"source": os.path.abspath(path), "sheet": sheet, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+    def load_cached(self, airline_dir: str, artifact: str, key: Dict) -> Optional[pd.DataFrame]:
+        paths = self.cache_paths(airline_dir, artifact)
+        try:
+            with open(paths["meta"], 'r', encoding='utf-8') as f:
+                if json.load(f) != key:
+                    return None
+            return pd.read_pickle(paths["data"])
+        except (OSError, ValueError, EOFError):
+            return None
+
+    def store_cached(self, airline_dir: str, artifact: str, key: Dict, df: pd.DataFrame) -> bool:
+        """캐시 기록 (임시 파일에 쓰고 교체하므로 중간에 끊겨도 깨진 캐시가 남지 않음), 성공 여부 반환
+
+        임시 파일은 mkstemp로 만들어 같은 프로세스의 여러 스레드가 동시에 기록해도 겹치지 않는다.
+        """
+        paths = self.cache_paths(airline_dir, artifact)
+        try:
+            os.makedirs(os.path.dirname(paths["data"]), exist_ok=True)
+            self._write_replace(paths["data"], lambda temp: df.to_pickle(temp))
+            # 메타 파일을 마지막에 교체 (데이터만 바뀐 상태에서는 키가 맞지 않아 다시 파싱)
+            self._write_replace(paths["meta"], lambda temp: self._dump_key(temp, key))
+        except OSError as e:
+            print(f"⚠️ 변환 캐시 기록 실패 ({artifact}): {e}")
+            return False
+        return True
+
+    def _write_replace(self, path: str, write):
+        """같은 폴더의 고유 임시 파일에 쓰고 path로 교체 (실패하면 임시 파일 삭제)"""
+        fd, temp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=os.path.basename(path) + ".", suffix=".tmp")
+        os.close(fd)
+        try:
+            write(temp)
+            os.replace(temp, path)
+        except BaseException:
+            if os.path.exists(temp):
+                os.remove(temp)
+            raise
+
+    def _dump_key(self, path: str, key: Dict):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(key, f)
+
+    def read(self, airline_dir: str, artifact: str) -> Optional[pd.DataFrame]:
+        """산출물 DataFrame (캐시가 최신이면 캐시에서, 아니면 원본을 읽고 캐시 갱신), 없으면 None"""
+        located = locate_artifact(airline_dir, artifact)
+        if located is None:
+            self.last_status[artifact] = "missing"
+            return None
+        path, sheet = located
+        if not self.use_cache:
+            self.last_status[artifact] = "parsed"
+            return parse_artifact(path, sheet)
+
+        key = self.source_key(path, sheet)
+        df = self.load_cached(airline_dir, artifact, key)
+        if df is not None:
+            self.last_status[artifact] = "cache"
+            return df
+        df = parse_artifact(path, sheet)
+        self.store_cached(airline_dir, artifact, key, df)
+        self.last_status[artifact] = "parsed"
+        return df
+
+    def clear_cache(self, airline_dir: str) -> int:
+        """항공사 폴더의 변환 캐시 삭제, 삭제한 파일 수 반환"""
+        cache_dir = os.path.join(airline_dir, ARTIFACT_CACHE_DIR)
+        if not os.path.isdir(cache_dir):
+            return 0
+        removed = 0
+        for name in os.listdir(cache_dir):
+            os.remove(os.path.join(cache_dir, name))
+            removed += 1
+        os.rmdir(cache_dir)
+        return removed
+
+
+def main():
+    """메인 함수 (산출물 위치 확인 / 캐시 미리 만들기 / 캐시 삭제)"""
+    import argparse
+    import time
+
+    valid_airlines = [f"airline_{i:02d}" for i in range(1, 16)]
+
+    parser = argparse.ArgumentParser(usage="python artifact_reader.py [항공사ID ...] [옵션]")
+    parser.add_argument("airline_ids", nargs="*", help="항공사 ID (생략 시 airline_01 ~ airline_15 전체)")
+    parser.add_argument("--clear", action="store_true", help="변환 캐시 삭제")
+    args = parser.parse_args()
+
+    airline_ids = args.airline_ids or valid_airlines
+    invalid = [a for a in airline_ids if a not in valid_airlines]
+    if invalid:
+        print(f"❌ 잘못된 항공사 ID: {', '.join(invalid)}")
+        print(f"사용 가능한 항공사: {', '.join(valid_airlines)}")
+        sys.exit(1)
+
+    reader = ArtifactReader()
+    for airline_id in airline_ids:
+        airline_dir = os.path.join("output", airline_id)
+        if args.clear:
+            print(f"🗑️ {airline_id} 변환 캐시 {reader.clear_cache(airline_dir)}개 파일 삭제")
+            continue
+        for artifact in ARTIFACT_LOCATIONS:
+            started = time.time()
+            df = reader.read(airline_dir, artifact)
+            if df is None:
+                print(f"⚠️ {airline_id} {artifact}: 파일 없음")
+                continue
+            print(f"📄 {airline_id} {artifact}: {locate_artifact(airline_dir, artifact)[0]} "
+                  f"({len(df)}행, {reader.last_status[artifact]}, {time.time() - started:.2f}초)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+운항후보 CSV 고속 인코더
+고정 스키마의 운항후보 DataFrame을 DataFrame.to_csv(encoding='utf-8-sig')와
+바이트 단위로 동일한 CSV로 인코딩
+"""
+
+import os
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Iterator, Optional
+
+from candidate_route_day_index import merge_route_day_indexes
+from candidate_zone_maps import CandidateCsvFile, merge_zone_maps
+from output_compression import (
+    normalize_compression, pandas_compression,
+    split_header_stream, has_compressed_data, copy_file_range
+)
+
+BOM = b'\xef\xbb\xbf'
+
+
+class CandidateCsvEncoder:
+    """운항후보 CSV 인코더
+
+    - 문자열 컬럼(공항, 국가, 運航規模, 日付, 出発時刻)은 고유값만 한 번 bytes로 인코딩하여 재사용
+    - 숫자 컬럼은 NumPy로 한꺼번에 포맷 (pandas와 동일한 repr 규칙, 정수는 고유값 단위)
+    - block_rows 행 단위로 인코딩하여 큰 블록으로 기록
+    """
+
+    def __init__(self, columns: List[str], block_rows: int = 65536):
+        self.columns = list(columns)
+        self.block_rows = max(1, block_rows)
+        self._dictionary: Dict[str, bytes] = {}
+
+    def _encode_text(self, text: str) -> bytes:
+        """문자열 필드 인코딩 (csv.QUOTE_MINIMAL 규칙, 결과는 캐시)"""
+        encoded = self._dictionary.get(text)
+        if encoded is None:
+            field = text
+            if any(ch in field for ch in ',"\r\n'):
+                field = '"' + field.replace('"', '""') + '"'
+            encoded = field.encode('utf-8')
+            self._dictionary[text] = encoded
+        return encoded
+
+    def encode_header(self) -> bytes:
+        """BOM + 헤더 줄"""
+        return BOM + b','.join(self._encode_text(c) for c in self.columns) + b'\n'
+
+    def _encode_column(self, series: pd.Series) -> List[bytes]:
+        """컬럼 하나를 필드 bytes 리스트로 변환"""
+        dtype = series.dtype
+        if pd.api.types.is_bool_dtype(dtype):
+            return series.to_numpy().astype('S').tolist()
+        if pd.api.types.is_integer_dtype(dtype):
+            # 정수 컬럼도 대부분 저카디널리티 (飛行時間, 座席数, 需要 등) → 고유값만 포맷
+            codes, uniques = pd.factorize(series.to_numpy())
+            return np.asarray(uniques).astype('S').astype(object)[codes].tolist()
+        if pd.api.types.is_float_dtype(dtype):
+            values = series.to_numpy(dtype=np.float64)
+            encoded = values.astype('S')
+            nan_mask = np.isnan(values)
+            if nan_mask.any():
+                encoded = encoded.astype(object)
+                encoded[nan_mask] = b''
+            return encoded.tolist()
+
+        # 사전 인코딩: 고유값만 bytes로 변환 후 코드로 펼침 (결측값은 빈 필드)
+        codes, uniques = pd.factorize(series, use_na_sentinel=True)
+        table = np.array([self._encode_text(str(u)) for u in uniques] + [b''], dtype=object)
+        return table[codes].tolist()
+
+    def encode_lines(self, df: pd.DataFrame) -> List[bytes]:
+        """행별 CSV 바이트 리스트 (줄바꿈 제외)"""
+        columns = [self._encode_column(df[c]) for c in self.columns]
+        return list(map(b','.join, zip(*columns)))
+
+    def iter_blocks(self, df: pd.DataFrame) -> Iterator[bytes]:
+        """헤더 없는 CSV 바이트 블록 생성"""
+        for start in range(0, len(df), self.block_rows):
+            lines = self.encode_lines(df.iloc[start:start + self.block_rows])
+            yield b'\n'.join(lines) + b'\n'
+
+    def encode_rows(self, df: pd.DataFrame) -> bytes:
+        """헤더 없는 CSV 바이트"""
+        if list(df.columns) != self.columns:
+            return df.to_csv(index=False, header=False).encode('utf-8')
+        return b''.join(self.iter_blocks(df))
+
+    def write_csv(self, df: pd.DataFrame, path: str, compression: Optional[str] = None,
+                  zone_map_rows: Optional[int] = None, route_day_index: bool = False):
+        """DataFrame.to_csv(path, index=False, encoding='utf-8-sig')와 동일한 내용 저장
+
+        compression 지정 시 압축, zone_map_rows 지정 시 청크별 통계 sidecar,
+        route_day_index=True면 노선×날짜 인덱스 sidecar도 기록한다.
+        """
+        if list(df.columns) != self.columns:
+            df.to_csv(path, index=False, encoding='utf-8-sig', compression=pandas_compression(compression))
+            return
+
+        with CandidateCsvFile(path, self.encode_header(), self.columns, compression, zone_map_rows,
+                              route_day_index) as f:
+            for start in range(0, len(df), self.block_rows):
+                block = df.iloc[start:start + self.block_rows]
+                f.write_rows(self.encode_lines(block), block)
+
+
+def concatenate_candidate_csvs(segment_paths: List[str], consolidated_path: str,
+                               compression: Optional[str] = None) -> bool:
+    """데이터셋별 CSV를 바이트 단위로 연결하여 통합 CSV 생성 (재인코딩・재압축 없음)
+
+    각 파일의 BOM + 헤더는 첫 파일의 것만 남긴다. 데이터 행이 없는 파일은 건너뛴다.
+    압축 파일은 CsvOutputFile 형식(헤더 스트림 + 본문 스트림)이어야 한다.
+    """
+    compression = normalize_compression(compression)
+    header = None
+    parts = []
+    for path in segment_paths:
+        if compression is None:
+            with open(path, 'rb') as f:
+                header_raw = f.readline()
+                if not header_raw.strip(BOM + b'\r\n'):
+                    continue  # 빈 데이터셋
+                offset = f.tell()
+                if f.read(1) == b'':
+                    continue  # 헤더만 있는 데이터셋
+        else:
+            content, offset = split_header_stream(path, compression)
+            if not content.strip(BOM + b'\r\n'):
+                continue  # 빈 데이터셋
+            if offset < 0 or content.count(b'\n') != 1:
+                raise ValueError(f"헤더/본문 스트림이 분리되지 않은 압축 파일: {path}")
+            if not has_compressed_data(path, offset, compression):
+                continue  # 헤더만 있는 데이터셋
+            with open(path, 'rb') as f:
+                header_raw = f.read(offset)
+        header = header or header_raw
+        parts.append((path, offset))
+
+    if not parts:
+        return False
+
+    os.makedirs(os.path.dirname(consolidated_path), exist_ok=True)
+    with open(consolidated_path, 'wb') as out:
+        out.write(header)
+        for path, offset in parts:
+            copy_file_range(path, out, offset)
+
+    # 데이터셋별 zone map / 노선×날짜 인덱스가 있으면 오프셋만 옮겨서 통합 파일용으로 병합
+    merge_zone_maps(parts, len(header), consolidated_path)
+    merge_route_day_indexes(parts, len(header), consolidated_path)
+    return True
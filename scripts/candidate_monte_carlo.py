@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+운항후보 수요 불확실성 몬테카를로 집계
+후보마다 시간대별 수요 배수를 S개 표본으로 뽑아 최적가격・운항규모 결정까지 전파한 결과를
+収益/需要 분위수(P10/P50/P90)와 運航可能な最小収益 달성 확률로 요약하여
+candidate/monte_carlo_quantiles.csv sidecar에 기록한다.
+"""
+
+import os
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional
+
+from candidate_csv_encoder import CandidateCsvEncoder
+from candidate_zone_maps import CandidateCsvFile
+from output_compression import normalize_compression, output_path, resolve_input_path
+
+MONTE_CARLO_FILE = "monte_carlo_quantiles.csv"
+
+MC_QUANTILES = [10, 50, 90]
+
+# sidecar 컬럼 (후보 키 + 분위수 + 확률)
+MONTE_CARLO_COLUMNS = (
+    ["日付", "出発空港", "到着空港", "出発時刻"] +
+    [f"収益P{q}(円)" for q in MC_QUANTILES] +
+    [f"需要P{q}(名)" for q in MC_QUANTILES] +
+    ["運航可能確率"]
+)
+
+# 한 번에 처리할 (행 × 표본) 원소 수 상한 (표본 축 배치 크기 결정용)
+DEFAULT_BLOCK_ELEMENTS = 1 << 20
+
+
+def _order_statistics(cumulative: np.ndarray, sorted_values: np.ndarray, samples: int, q: float) -> np.ndarray:
+    """행별 누적 개수에서 q 분위수 (np.percentile 기본 linear 보간과 같은 정의)"""
+    position = (samples - 1) * q / 100.0
+    lower = int(np.floor(position))
+    upper = min(lower + 1, samples - 1)
+    fraction = position - lower
+    a = sorted_values[np.argmax(cumulative > lower, axis=1)].astype(np.float64)
+    b = sorted_values[np.argmax(cumulative > upper, axis=1)].astype(np.float64)
+    return a + (b - a) * fraction
+
+
+def summarize_samples(sampled_bases: np.ndarray, table_revenue: np.ndarray, table_demand: np.ndarray,
+                      table_viable: np.ndarray) -> Dict[str, np.ndarray]:
+    """표본 기본수요 (행수, 표본수)를 행별 収益/需要 분위수・운항가능 확률로 요약
+
+    table_*는 기본수요(0, 1, 2, ...)별 최적 수익・수요・운항가능 여부 조회 테이블이다.
+    표본을 정렬하는 대신 행별 기본수요 개수를 세고, 값 순서대로 누적하여 분위수를 찾는다.
+    """
+    rows, samples = sampled_bases.shape
+    width = len(table_revenue)
+    offsets = (np.arange(rows, dtype=np.int64) * width)[:, None]
+    counts = np.bincount((sampled_bases + offsets).ravel(), minlength=rows * width).reshape(rows, width)
+
+    summary = {}
+    for name, table in [("収益", table_revenue), ("需要", table_demand)]:
+        order = np.argsort(table, kind="stable")
+        cumulative = np.cumsum(counts[:, order], axis=1)
+        unit = "円" if name == "収益" else "名"
+        for q in MC_QUANTILES:
+            summary[f"{name}P{q}({unit})"] = _order_statistics(cumulative, table[order], samples, q)
+    summary["運航可能確率"] = counts @ table_viable.astype(np.float64) / samples
+    return summary
+
+
+class MonteCarloCandidateWriter:
+    """노선 청크별 몬테카를로 요약을 sidecar CSV에 이어서 기록"""
+
+    def __init__(self, candidate_dir: str, samples: int, compression: Optional[str] = None):
+        self.candidate_dir = candidate_dir
+        self.samples = samples
+        self.compression = normalize_compression(compression)
+        self.path = output_path(os.path.join(candidate_dir, MONTE_CARLO_FILE), self.compression)
+        self.encoder = CandidateCsvEncoder(MONTE_CARLO_COLUMNS)
+        self._file: Optional[CandidateCsvFile] = None
+        self.rows = 0
+        self._probability_sum = 0.0
+
+    def write_chunk(self, frame: pd.DataFrame):
+        """MONTE_CARLO_COLUMNS 형식 DataFrame 추가 기록"""
+        if frame.empty:
+            return
+        if self._file is None:
+            os.makedirs(self.candidate_dir, exist_ok=True)
+            self._file = CandidateCsvFile(
+                self.path, self.encoder.encode_header(), MONTE_CARLO_COLUMNS, self.compression
+            )
+        self._file.write_rows(self.encoder.encode_lines(frame), frame)
+        self.rows += len(frame)
+        self._probability_sum += float(frame["運航可能確率"].sum())
+
+    def close(self) -> Optional[str]:
+        """파일을 닫고 경로 반환 (기록한 행이 없으면 None)"""
+        if self._file is None:
+            return None
+        self._file.close()
+        self._file = None
+        return self.path
+
+    def mean_probability(self) -> float:
+        """기록한 후보 전체의 평균 운항가능 확률"""
+        return self._probability_sum / self.rows if self.rows else 0.0
+
+
+def load_monte_carlo_quantiles(candidate_dir: str) -> Optional[pd.DataFrame]:
+    """monte_carlo_quantiles.csv 로드 (압축 파일 포함, 없으면 None)"""
+    path = resolve_input_path(os.path.join(candidate_dir, MONTE_CARLO_FILE))
+    if path is None:
+        return None
+    return pd.read_csv(path)
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+운항후보 데이터 월별 파티션 저장/조회
+여러 달을 한 번에 생성할 때 candidate/month=<월>/ 아래에 월마다 선택한 레이아웃으로 저장하고
+month_index.json으로 관리
+"""
+
+import os
+import json
+import pandas as pd
+from typing import Dict, List, Optional, Tuple
+
+from candidate_partitions import ROUTE_COLUMNS, load_partition_index
+from candidate_star_schema import load_star_index
+
+MONTH_INDEX_FILE = "month_index.json"
+
+# flat 레이아웃 운항후보의 대상 월 기록 (파티션・스타 스키마는 각 인덱스에 month가 있음)
+FLAT_INDEX_FILE = "flat_index.json"
+
+ALL_MONTHS = list(range(1, 13))
+
+
+def parse_month_spec(spec: str) -> List[int]:
+    """월 지정 문자열을 월 목록으로 변환 ("all", "3", "1-6", "1,4,7-9")"""
+    spec = spec.strip().lower()
+    if spec == "all":
+        return list(ALL_MONTHS)
+
+    months: List[int] = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            start, end = (int(v) for v in part.split("-", 1))
+            if start > end:
+                raise ValueError(f"월 범위는 시작 <= 끝이어야 합니다: {part}")
+            values = range(start, end + 1)
+        else:
+            values = [int(part)]
+        for month in values:
+            if month not in ALL_MONTHS:
+                raise ValueError(f"월은 1~12 사이여야 합니다: {month}")
+            if month not in months:
+                months.append(month)
+
+    if not months:
+        raise ValueError(f"월이 지정되지 않았습니다: {spec}")
+    return months
+
+
+def month_partition_dir(month: int) -> str:
+    """월 파티션 폴더명 (candidate_dir 기준 상대 경로)"""
+    return f"month={month:02d}"
+
+
+def write_month_index(candidate_dir: str, layout: str, compression: Optional[str],
+                      months: List[Dict], routes: Dict[str, List[Dict]]) -> Dict:
+    """month_index.json 기록, 인덱스 반환
+
+    months는 {"month", "max_days", "result"} 목록, routes는 데이터셋별로 한 달이라도 후보가 출력된 노선 목록이다.
+    """
+    index = {
+        "layout": "monthly",
+        "partition_layout": layout,
+        "compression": compression,
+        "months": [
+            {
+                "month": entry["month"],
+                "max_days": entry["max_days"],
+                "path": month_partition_dir(entry["month"]),
+                "rows": entry.get("rows")
+            }
+            for entry in months
+        ],
+        "types": {
+            segment_key: {
+                "routes": [
+                    [r["departure"], r["arrival"], r["departure_country"], r["arrival_country"]]
+                    for r in segment_routes
+                ]
+            }
+            for segment_key, segment_routes in routes.items()
+        }
+    }
+    os.makedirs(candidate_dir, exist_ok=True)
+    with open(os.path.join(candidate_dir, MONTH_INDEX_FILE), 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, indent=2)
+    return index
+
+
+def load_month_index(candidate_dir: str) -> Optional[Dict]:
+    """month_index.json 로드 (월별 파티션 레이아웃이 아니면 None)"""
+    index_path = os.path.join(candidate_dir, MONTH_INDEX_FILE)
+    if not os.path.exists(index_path):
+        return None
+    with open(index_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def write_flat_index(candidate_dir: str, month: int, max_days: int, compression: Optional[str]) -> Dict:
+    """flat 레이아웃 운항후보의 대상 월・일수를 flat_index.json으로 기록, 인덱스 반환"""
+    index = {
+        "layout": "flat",
+        "month": month,
+        "max_days": max_days,
+        "compression": compression
+    }
+    os.makedirs(candidate_dir, exist_ok=True)
+    with open(os.path.join(candidate_dir, FLAT_INDEX_FILE), 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, indent=2)
+    return index
+
+
+def load_flat_index(candidate_dir: str) -> Optional[Dict]:
+    """flat_index.json 로드 (없으면 None)"""
+    index_path = os.path.join(candidate_dir, FLAT_INDEX_FILE)
+    if not os.path.exists(index_path):
+        return None
+    with open(index_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def candidate_month(candidate_dir: str) -> Optional[int]:
+    """한 달 분량 운항후보 폴더의 대상 월 (flat / 파티션 / 스타 스키마 인덱스 순, 알 수 없으면 None)"""
+    for index in (load_flat_index(candidate_dir), load_partition_index(candidate_dir), load_star_index(candidate_dir)):
+        if index is not None and index.get("month") is not None:
+            return int(index["month"])
+    return None
+
+
+def candidate_month_sources(candidate_dir: str, month: Optional[int] = None) -> List[Tuple[Optional[int], str]]:
+    """(월, 운항후보 폴더) 목록
+
+    여러 달 레이아웃은 모든 월, 한 달 레이아웃은 인덱스에 기록된 월 (기록이 없으면 month 인자, 그것도 없으면 None).
+    """
+    month_index = load_month_index(candidate_dir)
+    if month_index is not None:
+        return [
+            (entry["month"], os.path.join(candidate_dir, month_partition_dir(entry["month"])))
+            for entry in month_index["months"]
+        ]
+    recorded = candidate_month(candidate_dir)
+    return [(recorded if recorded is not None else month, candidate_dir)]
+
+
+def selected_candidate_month(candidate_dir: str, month: Optional[int] = None) -> Optional[int]:
+    """읽을 운항후보의 대상 월 (여러 달 레이아웃은 month, 없으면 첫 번째 월 / 한 달 레이아웃은 기록된 월)
+
+    한 달 레이아웃에 기록된 월과 다른 month를 지정하면 ValueError.
+    """
+    month_index = load_month_index(candidate_dir)
+    if month_index is not None:
+        months = [entry["month"] for entry in month_index["months"]]
+        if month is None:
+            return months[0] if months else None
+        if month not in months:
+            raise ValueError(f"{candidate_dir}에 {month}월 운항후보가 없습니다 (생성된 월: {months})")
+        return month
+    recorded = candidate_month(candidate_dir)
+    if month is not None and recorded is not None and recorded != month:
+        raise ValueError(f"{candidate_dir}의 운항후보는 {recorded}월 데이터입니다 (지정한 월: {month})")
+    return recorded if recorded is not None else month
+
+
+def common_candidate_month(airline_months: Dict[str, Optional[int]]) -> Optional[int]:
+    """항공사별 운항후보 대상 월이 모두 같으면 그 월 (월 기록이 없는 항공사는 제외, 모두 없으면 None)
+
+    날짜 축을 공유하는 항공사 간 집계에서 서로 다른 달이 섞여 있으면 ValueError.
+    """
+    by_month: Dict[int, List[str]] = {}
+    for airline_id, month in airline_months.items():
+        if month is not None:
+            by_month.setdefault(int(month), []).append(airline_id)
+    if len(by_month) > 1:
+        detail = ", ".join(f"{month}월: {', '.join(airlines)}" for month, airlines in sorted(by_month.items()))
+        raise ValueError(
+            f"항공사별 운항후보 대상 월이 다릅니다 ({detail}). "
+            "같은 달로 생성하거나 (--months) --month로 월을 지정하세요"
+        )
+    return next(iter(by_month), None)
+
+
+def month_route_frame(index: Dict, segment_key: str) -> pd.DataFrame:
+    """인덱스에 기록된 데이터셋별 노선 목록 (전체 월 합집합) 반환"""
+    routes = index["types"].get(segment_key, {}).get("routes", [])
+    return pd.DataFrame(routes, columns=ROUTE_COLUMNS)
+
+
+def month_max_day(index: Dict) -> Optional[int]:
+    """인덱스에 기록된 월 중 가장 긴 달의 일수"""
+    days = [entry["max_days"] for entry in index["months"]]
+    return max(days) if days else None
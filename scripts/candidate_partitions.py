@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+운항후보 데이터 Hive 스타일 파티션 저장/조회
+candidate/type=<데이터셋>/day=<일>/part.csv 형태로 저장하고 partition_index.json으로 관리
+"""
+
+import os
+import json
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Tuple, Optional, Iterable
+
+from candidate_csv_encoder import CandidateCsvEncoder
+from candidate_zone_maps import CandidateCsvFile
+from output_compression import normalize_compression, output_path
+
+PARTITION_INDEX_FILE = "partition_index.json"
+
+# 압축 파티션 파일의 본문을 모아 독립 스트림으로 기록하는 단위
+# 노선 → 날짜 순으로 행이 들어와 (데이터셋 × 날짜) 파티션 파일이 끝까지 모두 열려 있으므로,
+# 파일마다 압축기(xz는 수십 MB)를 열어 두지 않고 파일당 버퍼를 이 크기로 제한한다
+PARTITION_STREAM_BYTES = 1 << 20
+
+# 노선 식별 컬럼 (인덱스에 데이터셋별 노선 목록으로 기록)
+ROUTE_COLUMNS = ["出発空港", "到着空港", "出発国家", "到着国家"]
+
+
+def parse_day_numbers(dates: pd.Series) -> np.ndarray:
+    """"12日" 형식의 日付 컬럼을 정수 배열로 변환"""
+    return dates.astype(str).str.rstrip("日").astype(int).to_numpy()
+
+
+class PartitionedCandidateWriter:
+    """노선 청크를 데이터셋(type) × 날짜(day) 파티션 파일로 나누어 기록"""
+
+    def __init__(self, candidate_dir: str, columns: List[str],
+                 compression: Optional[str] = None, month: Optional[int] = None,
+                 zone_map_rows: Optional[int] = None, route_day_index: bool = False):
+        self.candidate_dir = candidate_dir
+        self.columns = list(columns)
+        self.compression = normalize_compression(compression)
+        self.month = month
+        self.zone_map_rows = zone_map_rows
+        self.route_day_index = route_day_index
+        self.encoder = CandidateCsvEncoder(columns)
+
+        self._files: Dict[Tuple[str, int], CandidateCsvFile] = {}
+        self._row_counts: Dict[Tuple[str, int], int] = {}
+        self._routes: Dict[str, Dict[tuple, None]] = {}
+
+    def partition_path(self, segment_key: str, day: int) -> str:
+        """파티션 파일의 candidate_dir 기준 상대 경로"""
+        return output_path(os.path.join(f"type={segment_key}", f"day={day}", "part.csv"), self.compression)
+
+    def _open(self, segment_key: str, day: int) -> CandidateCsvFile:
+        key = (segment_key, day)
+        if key not in self._files:
+            path = os.path.join(self.candidate_dir, self.partition_path(segment_key, day))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self._files[key] = CandidateCsvFile(
+                path, self.encoder.encode_header(), self.columns, self.compression, self.zone_map_rows,
+                self.route_day_index, stream_bytes=PARTITION_STREAM_BYTES
+            )
+            self._row_counts[key] = 0
+        return self._files[key]
+
+    def write_chunk(self, segment_key: str, chunk: pd.DataFrame):
+        """청크를 날짜 경계로 나누어 파티션별로 추가 기록"""
+        if chunk.empty:
+            return
+
+        lines = self.encoder.encode_lines(chunk)
+        days = parse_day_numbers(chunk["日付"])
+
+        # 청크 안에서 날짜가 바뀌는 위치로 구간 분할 (노선 청크는 날짜순으로 정렬되어 있음)
+        boundaries = np.flatnonzero(np.diff(days)) + 1
+        starts = np.r_[0, boundaries]
+        ends = np.r_[boundaries, len(days)]
+        for start, end in zip(starts, ends):
+            day = int(days[start])
+            self._open(segment_key, day).write_rows(lines[start:end], chunk.iloc[start:end])
+            self._row_counts[(segment_key, day)] += int(end - start)
+
+        routes = self._routes.setdefault(segment_key, {})
+        for route in chunk[ROUTE_COLUMNS].drop_duplicates().itertuples(index=False):
+            routes[tuple(route)] = None
+
+    def close(self) -> Dict:
+        """모든 파티션 파일을 닫고 partition_index.json 기록, 인덱스 반환"""
+        for f in self._files.values():
+            f.close()
+
+        partitions = []
+        for (segment_key, day) in sorted(self._files.keys()):
+            relative_path = self.partition_path(segment_key, day)
+            partitions.append({
+                "type": segment_key,
+                "day": day,
+                "path": relative_path.replace(os.sep, "/"),
+                "rows": self._row_counts[(segment_key, day)],
+                "bytes": os.path.getsize(os.path.join(self.candidate_dir, relative_path))
+            })
+
+        index = {
+            "layout": "hive",
+            "partition_keys": ["type", "day"],
+            "month": self.month,
+            "compression": self.compression,
+            "zone_maps": self.zone_map_rows is not None,
+            "route_day_index": self.route_day_index,
+            "columns": self.columns,
+            "types": {
+                segment_key: {"routes": [list(route) for route in routes.keys()]}
+                for segment_key, routes in self._routes.items()
+            },
+            "partitions": partitions
+        }
+        os.makedirs(self.candidate_dir, exist_ok=True)
+        with open(os.path.join(self.candidate_dir, PARTITION_INDEX_FILE), 'w', encoding='utf-8') as f:
+            json.dump(index, f, ensure_ascii=False, indent=2)
+
+        self._files = {}
+        return index
+
+
+def load_partition_index(candidate_dir: str) -> Optional[Dict]:
+    """partition_index.json 로드 (파티션 레이아웃이 아니면 None)"""
+    index_path = os.path.join(candidate_dir, PARTITION_INDEX_FILE)
+    if not os.path.exists(index_path):
+        return None
+    with open(index_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def select_partitions(index: Dict, types: Optional[Iterable[str]] = None,
+                      day_range: Optional[Tuple[int, int]] = None,
+                      routes: Optional[Iterable[Tuple[str, str]]] = None) -> List[Dict]:
+    """조건에 맞는 파티션만 선택 (day_range는 양끝 포함)
+
+    routes는 (出発空港, 到着空港) 목록이며, 해당 노선을 포함하는 데이터셋의 파티션만 남긴다.
+    """
+    selected_types = set(types) if types is not None else set(index["types"].keys())
+
+    if routes is not None:
+        wanted = {tuple(r) for r in routes}
+        selected_types = {
+            segment_key for segment_key in selected_types
+            if any((r[0], r[1]) in wanted for r in index["types"].get(segment_key, {}).get("routes", []))
+        }
+
+    partitions = []
+    for partition in index["partitions"]:
+        if partition["type"] not in selected_types:
+            continue
+        if day_range is not None and not (day_range[0] <= partition["day"] <= day_range[1]):
+            continue
+        partitions.append(partition)
+    return partitions
+
+
+def read_candidate_partitions(candidate_dir: str, types: Optional[Iterable[str]] = None,
+                              day_range: Optional[Tuple[int, int]] = None,
+                              routes: Optional[Iterable[Tuple[str, str]]] = None) -> pd.DataFrame:
+    """필요한 파티션 파일만 읽어서 DataFrame으로 반환"""
+    routes = [tuple(r) for r in routes] if routes is not None else None
+    index = load_partition_index(candidate_dir)
+    if index is None:
+        raise FileNotFoundError(f"파티션 인덱스가 없습니다: {os.path.join(candidate_dir, PARTITION_INDEX_FILE)}")
+
+    partitions = select_partitions(index, types=types, day_range=day_range, routes=routes)
+    frames = [pd.read_csv(os.path.join(candidate_dir, p["path"])) for p in partitions]
+    if not frames:
+        return pd.DataFrame(columns=index["columns"])
+
+    df = pd.concat(frames, ignore_index=True)
+    if routes is not None:
+        wanted = pd.MultiIndex.from_tuples(routes)
+        mask = pd.MultiIndex.from_frame(df[["出発空港", "到着空港"]]).isin(wanted)
+        df = df[mask].reset_index(drop=True)
+    return df
+
+
+def partition_route_frame(index: Dict, segment_key: str) -> pd.DataFrame:
+    """인덱스에 기록된 데이터셋별 노선 목록을 DataFrame으로 반환 (데이터 파일을 읽지 않음)"""
+    routes = index["types"].get(segment_key, {}).get("routes", [])
+    return pd.DataFrame(routes, columns=ROUTE_COLUMNS)
+
+
+def partition_max_day(index: Dict) -> Optional[int]:
+    """인덱스에 기록된 가장 마지막 날짜"""
+    days = [p["day"] for p in index["partitions"]]
+    return max(days) if days else None
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+운항후보 데이터 파이프라인 저장기
+노선 청크 생성(producer)과 CSV 인코딩/쓰기(consumer 스레드)를 bounded queue로 연결
+"""
+
+import os
+import queue
+import threading
+import pandas as pd
+from typing import Dict, List, Tuple, Iterable, Optional
+
+from candidate_csv_encoder import CandidateCsvEncoder, concatenate_candidate_csvs
+from candidate_zone_maps import CandidateCsvFile
+from output_compression import pandas_compression
+
+# 데이터셋 저장 순서 (통합 파일도 이 순서로 연결)
+SEGMENT_KEYS = ["international_departure", "international_arrival", "domestic"]
+
+_STOP = object()
+
+
+class PipelinedCandidateWriter:
+    """노선 청크를 bounded queue로 받아 consumer 스레드에서 CSV 인코딩/쓰기
+
+    - producer(호출 스레드)는 큐가 가득 차면 대기 → 메모리 사용량이 큐 크기로 제한됨
+    - consumer 스레드는 청크를 병렬로 인코딩하고, 생성 순서대로 파일에 기록
+    """
+
+    def __init__(self, paths: Dict[str, str], columns: List[str],
+                 queue_size: int = 8, writer_threads: int = 2,
+                 compression: Optional[str] = None, zone_map_rows: Optional[int] = None,
+                 route_day_index: bool = False):
+        self.paths = paths
+        self.columns = columns
+        self.compression = compression
+        self.zone_map_rows = zone_map_rows
+        self.route_day_index = route_day_index
+        self.queue_size = max(1, queue_size)
+        self.writer_threads = max(1, writer_threads)
+
+        self.encoder = CandidateCsvEncoder(columns)
+
+        self._queue = None
+        self._files = {}
+        self._row_counts = {}
+        self._next_seq = 0
+        self._commit_cond = threading.Condition()
+        self._error = None
+
+    def encode_chunk(self, chunk: pd.DataFrame) -> List[bytes]:
+        """청크를 행별 CSV 바이트로 인코딩"""
+        return self.encoder.encode_lines(chunk)
+
+    def encode_header(self) -> bytes:
+        """BOM + 헤더 줄 (DataFrame.to_csv(encoding='utf-8-sig')와 동일)"""
+        return self.encoder.encode_header()
+
+    def _open_segment(self, segment_key: str):
+        """데이터셋 파일을 처음 쓸 때 열고 헤더 기록"""
+        if segment_key not in self._files:
+            self._files[segment_key] = CandidateCsvFile(
+                self.paths[segment_key], self.encode_header(), self.columns,
+                self.compression, self.zone_map_rows, self.route_day_index
+            )
+        return self._files[segment_key]
+
+    def _consume(self):
+        """consumer 스레드: 인코딩은 병렬, 쓰기는 seq 순서대로"""
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                self._queue.task_done()
+                return
+
+            seq, segment_key, chunk = item
+            try:
+                lines = self.encode_chunk(chunk) if self._error is None else []
+            except Exception as e:
+                self._error = self._error or e
+                lines = []
+
+            with self._commit_cond:
+                while self._next_seq != seq:
+                    self._commit_cond.wait()
+                try:
+                    if self._error is None:
+                        self._open_segment(segment_key).write_rows(lines, chunk)
+                        self._row_counts[segment_key] += len(chunk)
+                except Exception as e:
+                    self._error = e
+                self._next_seq += 1
+                self._commit_cond.notify_all()
+            self._queue.task_done()
+
+    def run(self, chunks: Iterable[Tuple[str, pd.DataFrame]]) -> Dict[str, int]:
+        """청크 스트림을 소비하여 데이터셋별 CSV + 통합 CSV 저장, 데이터셋별 행 수 반환"""
+        for key in SEGMENT_KEYS + ["consolidated"]:
+            os.makedirs(os.path.dirname(self.paths[key]), exist_ok=True)
+
+        self._queue = queue.Queue(maxsize=self.queue_size)
+        self._files = {}
+        self._row_counts = {key: 0 for key in SEGMENT_KEYS}
+        self._next_seq = 0
+        self._error = None
+
+        workers = [threading.Thread(target=self._consume, daemon=True)
+                   for _ in range(self.writer_threads)]
+        for worker in workers:
+            worker.start()
+
+        try:
+            for seq, (segment_key, chunk) in enumerate(chunks):
+                if self._error is not None:
+                    break
+                self._queue.put((seq, segment_key, chunk))  # 큐가 가득 차면 대기 (back-pressure)
+        finally:
+            for _ in workers:
+                self._queue.put(_STOP)
+            for worker in workers:
+                worker.join()
+            for f in self._files.values():
+                f.close()
+
+        if self._error is not None:
+            raise self._error
+
+        # 청크가 없었던 데이터셋은 기존과 동일하게 빈 CSV로 저장
+        for key in SEGMENT_KEYS:
+            if key not in self._files:
+                pd.DataFrame().to_csv(self.paths[key], index=False, encoding='utf-8-sig',
+                                      compression=pandas_compression(self.compression))
+
+        segment_paths = [self.paths[key] for key in SEGMENT_KEYS]
+        if concatenate_candidate_csvs(segment_paths, self.paths["consolidated"], self.compression):
+            print(f"✅ 통합 데이터 CSV 저장 완료: {self.paths['consolidated']} ({sum(self._row_counts.values())}건)")
+        else:
+            print("⚠️ 통합할 데이터가 없습니다.")
+
+        return dict(self._row_counts)
@@ -0,0 +1,508 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+운항후보 조회 서비스 (로컬 HTTP/JSON, asyncio)
+항공사별 운항후보・최소 운항 기준・공항 시간대 용량을 한 번만 읽어 메모리 인덱스로 들고 있고,
+노선・날짜 범위・출발 시각 범위・최저 우선순위・상위 k건 조건의 조회에 CSV를 다시 읽지 않고 답한다.
+
+- 운항후보는 (노선, 日付, 出発時刻) 순으로 정렬해 두고 노선별 [start, end) 구간과
+  날짜×분 키의 이분 탐색으로 조회 범위를 좁힌다 (나머지 조건은 좁힌 구간에만 적용)
+- 같은 조회의 응답은 LRU 캐시에서 바로 돌려준다 (다시 읽기 후에는 세대 번호가 바뀌어 자동으로 무효)
+- 캐시에 없는 조회는 작업 스레드 풀(최대 max_concurrency개)에서 계산하고, 그동안 이벤트 루프는
+  다른 연결과 캐시 적중 응답을 계속 처리한다 (세마포어로 계산 중인 요청 수 제한)
+- POST /reload 는 원본 파일(경로・수정 시각・크기)이 바뀐 항공사만 백그라운드 스레드에서 다시 읽고
+  완료되면 이벤트 루프 스레드에서 인덱스를 통째로 교체한다 (다시 읽는 동안에도 이전 인덱스로 계속 응답)
+
+엔드포인트 (모두 GET, /reload만 POST):
+    /airlines                                              적재된 항공사 목록
+    /candidates?airline=&route=福岡-成田&day=1-5&time=07:00-09:00&min_priority=50&top_k=10
+    /minimum_operations?airline=&route=
+    /capacity?airline=&airport=羽田&day=1-3
+    /reload?airline=                                       (airline 생략 시 전체)
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from artifact_reader import ArtifactReader, locate_artifact
+from candidate_partitions import parse_day_numbers
+from generate_candidate_data import CANDIDATE_COLUMNS
+from operations_feasibility import OperationsFeasibilityChecker
+from priority_ranking import tie_break_order
+from shared_slot_allocation import load_candidate_frame
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# 응답 행 수 기본값 / 최대값 (top_k・limit)
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 10000
+
+DEFAULT_CACHE_SIZE = 4096
+DEFAULT_MAX_CONCURRENCY = 8
+
+# 하루 분 수 (날짜 × 분 정렬 키)
+DAY_MINUTES = 1440
+
+HTTP_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed"}
+
+
+def parse_minutes(value: str) -> int:
+    """"07:30" → 450 (HH:MM 형식이 아니면 ValueError)"""
+    hours, separator, minutes = value.partition(":")
+    if not separator or not hours.isdigit() or not minutes.isdigit() or int(minutes) >= 60:
+        raise ValueError(f"시각은 HH:MM 형식이어야 합니다: {value}")
+    return int(hours) * 60 + int(minutes)
+
+
+def parse_int(value: str, name: str = "값") -> int:
+    """정수 파라미터 (정수가 아니면 파라미터 이름을 담은 ValueError)"""
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"{name} 는 정수여야 합니다: {value}") from None
+
+
+def parse_range(value: Optional[str], parse) -> Optional[Tuple[int, int]]:
+    """"a-b" 또는 "a" 형식의 닫힌 구간 (생략 시 None)"""
+    if not value:
+        return None
+    low, _, high = value.partition("-")
+    low = parse(low.strip())
+    high = parse(high.strip()) if high else low
+    if high < low:
+        raise ValueError(f"범위의 끝이 시작보다 작습니다: {value}")
+    return low, high
+
+
+def airline_signature(airline_dir: str) -> Tuple:
+    """항공사 입력 파일 서명 (운항후보 폴더 전체 + 최소 운항 기준 + 공항 스케줄의 경로・수정 시각・크기)"""
+    paths = []
+    candidate_dir = os.path.join(airline_dir, "analytics_data", "candidate")
+    for root, _, files in os.walk(candidate_dir):
+        paths.extend(os.path.join(root, name) for name in files)
+    for artifact in ["minimum_operations", "airport_schedule"]:
+        located = locate_artifact(airline_dir, artifact)
+        if located is not None:
+            paths.append(located[0])
+
+    signature = []
+    for path in sorted(paths):
+        stat = os.stat(path)
+        signature.append((path, stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+class AirlineIndex:
+    """항공사 하나의 조회 인덱스 (운항후보 정렬 배열 + 최소 운항 기준 + 공항 시간대 용량)"""
+
+    def __init__(self, airline_id: str, candidates: pd.DataFrame, minimum_operations: Optional[pd.DataFrame],
+                 schedule: Optional[pd.DataFrame], signature: Tuple = ()):
+        self.airline_id = airline_id
+        self.signature = signature
+        self.loaded_at = time.time()
+
+        routes = candidates["出発空港"].astype(str) + "-" + candidates["到着空港"].astype(str)
+        days = parse_day_numbers(candidates["日付"])
+        minutes = candidates["出発時刻"].map(parse_minutes).to_numpy(dtype=np.int64)
+        route_codes, route_names = pd.factorize(routes, sort=True)
+
+        # 노선 → 날짜 → 출발 시각 순 정렬
+        order = np.lexsort((minutes, days, route_codes))
+        self.row_count = len(order)
+        self.day_minutes = days[order] * DAY_MINUTES + minutes[order]
+        # 응답 행은 컬럼별 배열에서 바로 만든다 (DataFrame 행 인덱싱보다 훨씬 빠름)
+        self.columns = list(candidates.columns)
+        self.column_values = [candidates[column].to_numpy()[order] for column in self.columns]
+        self.priority = candidates["優先順位指数"].to_numpy(dtype=np.float64)[order]
+        bounds = np.searchsorted(route_codes[order], np.arange(len(route_names) + 1))
+        self.route_bounds: Dict[str, Tuple[int, int]] = {
+            name: (int(bounds[i]), int(bounds[i + 1])) for i, name in enumerate(route_names)
+        }
+
+        self.minimum_operations = minimum_operations
+        if schedule is not None:
+            airports, self.slot_labels, self.capacity = OperationsFeasibilityChecker().build_capacity_cube(schedule)
+            self.airport_ids = {airport: i for i, airport in enumerate(airports)}
+        else:
+            self.slot_labels, self.capacity, self.airport_ids = [], np.zeros((0, 0, 0), dtype=np.int64), {}
+
+    @classmethod
+    def load(cls, output_dir: str, airline_id: str, month: Optional[int] = None,
+             reader: Optional[ArtifactReader] = None) -> Optional["AirlineIndex"]:
+        """항공사 출력 폴더에서 인덱스 생성 (운항후보가 없으면 None)"""
+        airline_dir = os.path.join(output_dir, airline_id)
+        signature = airline_signature(airline_dir)
+        candidates = load_candidate_frame(
+            os.path.join(airline_dir, "analytics_data", "candidate"), CANDIDATE_COLUMNS, month
+        )
+        if candidates is None:
+            return None
+        reader = reader or ArtifactReader()
+        return cls(
+            airline_id, candidates,
+            reader.read(airline_dir, "minimum_operations"), reader.read(airline_dir, "airport_schedule"),
+            signature
+        )
+
+    def candidate_range(self, route: Optional[str], days: Optional[Tuple[int, int]]) -> Tuple[int, int]:
+        """노선・날짜 조건에 해당하는 정렬 배열 구간 [start, end) (노선을 생략하면 전체, 날짜는 행 단위로 다시 거름)"""
+        if route is None:
+            return 0, self.row_count
+        if route not in self.route_bounds:
+            return 0, 0
+        start, end = self.route_bounds[route]
+        if days is not None:
+            keys = self.day_minutes[start:end]
+            start, end = (
+                start + int(np.searchsorted(keys, days[0] * DAY_MINUTES, side="left")),
+                start + int(np.searchsorted(keys, (days[1] + 1) * DAY_MINUTES, side="left"))
+            )
+        return start, end
+
+    def query_candidates(self, route: Optional[str] = None, days: Optional[Tuple[int, int]] = None,
+                         times: Optional[Tuple[int, int]] = None, min_priority: Optional[float] = None,
+                         top_k: Optional[int] = None, limit: int = DEFAULT_LIMIT) -> Dict:
+        """조건에 맞는 운항후보 (top_k 지정 시 優先順位指数 내림차순 상위 k건, 아니면 노선・날짜・시각 순 limit건)"""
+        start, end = self.candidate_range(route, days)
+        keep = np.ones(end - start, dtype=bool)
+        if route is None and days is not None:
+            day_keys = self.day_minutes[start:end] // DAY_MINUTES
+            keep &= (day_keys >= days[0]) & (day_keys <= days[1])
+        if times is not None:
+            minutes = self.day_minutes[start:end] % DAY_MINUTES
+            keep &= (minutes >= times[0]) & (minutes <= times[1])
+        if min_priority is not None:
+            keep &= self.priority[start:end] >= min_priority
+        rows = start + np.flatnonzero(keep)
+
+        matched = len(rows)
+        if top_k is not None:
+            priority = self.priority[rows]
+            if top_k < matched:
+                # k번째 값 이상인 후보만 남긴 뒤 정렬 (k번째 값과 같은 동점 후보도 모두 포함)
+                kth = np.partition(priority, matched - top_k)[matched - top_k]
+                rows, priority = rows[priority >= kth], priority[priority >= kth]
+            # 동점은 정렬 배열 위치 (노선 → 날짜 → 출발 시각) 순으로 풀어 항상 같은 순서
+            rows = rows[tie_break_order(priority, rows)[:top_k]]
+        else:
+            rows = rows[:limit]
+        values = zip(*(column[rows].tolist() for column in self.column_values))
+        return {
+            "airline": self.airline_id,
+            "matched": matched,
+            "count": len(rows),
+            "rows": [dict(zip(self.columns, row)) for row in values]
+        }
+
+    def query_minimum_operations(self, route: Optional[str] = None) -> Dict:
+        """최저維持月別運航回数 (route 지정 시 해당 노선만)"""
+        df = self.minimum_operations
+        if df is None:
+            return {"airline": self.airline_id, "count": 0, "rows": []}
+        if route is not None:
+            departure, _, arrival = route.partition("-")
+            df = df[(df["出発空港"] == departure) & (df["到着空港"] == arrival)]
+        return {"airline": self.airline_id, "count": len(df), "rows": df.to_dict("records")}
+
+    def query_capacity(self, airport: str, days: Optional[Tuple[int, int]] = None) -> Dict:
+        """공항의 날짜별 시간대 割り当て可能回数"""
+        if airport not in self.airport_ids:
+            raise KeyError(f"{self.airline_id} 공항 스케줄에 없는 공항입니다: {airport}")
+        cube = self.capacity[self.airport_ids[airport]]
+        low, high = days or (1, cube.shape[0])
+        return {
+            "airline": self.airline_id,
+            "airport": airport,
+            "slots": self.slot_labels,
+            "days": {
+                f"{day}日": cube[day - 1].tolist() for day in range(max(low, 1), min(high, cube.shape[0]) + 1)
+            }
+        }
+
+    def summary(self) -> Dict:
+        return {
+            "candidates": self.row_count,
+            "routes": len(self.route_bounds),
+            "minimum_operations": 0 if self.minimum_operations is None else len(self.minimum_operations),
+            "airports": len(self.airport_ids),
+            "loaded_at": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.loaded_at))
+        }
+
+
+class CandidateQueryService:
+    """운항후보 조회 HTTP 서비스"""
+
+    def __init__(self, airline_ids: List[str], month: Optional[int] = None,
+                 cache_size: int = DEFAULT_CACHE_SIZE, max_concurrency: int = DEFAULT_MAX_CONCURRENCY):
+        self.output_dir = "output"
+        self.airline_ids = airline_ids
+        self.month = month  # 여러 달 레이아웃에서 적재할 월 (기본: 첫 번째 월)
+        self.cache_size = cache_size
+        self.max_concurrency = max_concurrency
+        self.indexes: Dict[str, AirlineIndex] = {}
+        self.generation = 0  # 인덱스를 교체할 때마다 증가 (응답 캐시 키의 일부)
+        self.cache: "OrderedDict[Tuple, Tuple[int, bytes]]" = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.artifact_reader = ArtifactReader()
+
+    # ------------------------------------------------------------------
+    # 적재 / 다시 읽기
+    # ------------------------------------------------------------------
+
+    def reload(self, airline_ids: Optional[List[str]] = None) -> Dict[str, List[str]]:
+        """원본 서명이 바뀐 (또는 아직 적재되지 않은) 항공사만 다시 읽어 인덱스 교체"""
+        result, updated = self.load_changed(airline_ids)
+        self.swap_indexes(updated)
+        return result
+
+    def load_changed(self, airline_ids: Optional[List[str]] = None) -> Tuple[Dict[str, List[str]], Dict[str, AirlineIndex]]:
+        """서명이 바뀐 항공사의 새 인덱스 생성 (서비스 상태는 바꾸지 않으므로 다른 스레드에서 실행 가능)"""
+        result = {"reloaded": [], "unchanged": [], "missing": []}
+        updated = {}
+        for airline_id in airline_ids or self.airline_ids:
+            current = self.indexes.get(airline_id)
+            airline_dir = os.path.join(self.output_dir, airline_id)
+            if current is not None and current.signature == airline_signature(airline_dir):
+                result["unchanged"].append(airline_id)
+                continue
+            index = AirlineIndex.load(self.output_dir, airline_id, self.month, self.artifact_reader)
+            if index is None:
+                result["missing"].append(airline_id)
+                continue
+            updated[airline_id] = index
+            result["reloaded"].append(airline_id)
+        return result, updated
+
+    def swap_indexes(self, updated: Dict[str, AirlineIndex]):
+        """새 인덱스로 교체하고 응답 캐시 비우기 (캐시를 쓰는 이벤트 루프 스레드에서 호출)"""
+        if not updated:
+            return
+        # 새 dict로 통째로 교체 (조회 중인 요청은 이전 인덱스를 그대로 사용)
+        self.indexes = {**self.indexes, **updated}
+        self.generation += 1
+        self.cache.clear()
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+
+    def airline_index(self, params: Dict[str, str]) -> AirlineIndex:
+        airline_id = params.get("airline")
+        if airline_id is None:
+            raise ValueError("airline 파라미터가 필요합니다")
+        if airline_id not in self.indexes:
+            raise KeyError(f"적재되지 않은 항공사입니다: {airline_id}")
+        return self.indexes[airline_id]
+
+    def answer(self, path: str, params: Dict[str, str]) -> Dict:
+        """경로・파라미터에 대한 응답 본문 (잘못된 값은 ValueError, 없는 대상은 KeyError)"""
+        if path == "/airlines":
+            return {
+                "generation": self.generation,
+                "airlines": {airline_id: index.summary() for airline_id, index in self.indexes.items()},
+                "cache": {"entries": len(self.cache), "hits": self.cache_hits, "misses": self.cache_misses}
+            }
+        if path == "/candidates":
+            top_k = parse_int(params["top_k"], "top_k") if "top_k" in params else None
+            limit = parse_int(params["limit"], "limit") if "limit" in params else DEFAULT_LIMIT
+            if top_k is not None and not 0 < top_k <= MAX_LIMIT:
+                raise ValueError(f"top_k 는 1 ~ {MAX_LIMIT} 이어야 합니다: {top_k}")
+            if not 0 < limit <= MAX_LIMIT:
+                raise ValueError(f"limit 은 1 ~ {MAX_LIMIT} 이어야 합니다: {limit}")
+            return self.airline_index(params).query_candidates(
+                route=params.get("route"),
+                days=parse_range(params.get("day"), lambda v: parse_int(v, "day")),
+                times=parse_range(params.get("time"), parse_minutes),
+                min_priority=float(params["min_priority"]) if "min_priority" in params else None,
+                top_k=top_k, limit=limit
+            )
+        if path == "/minimum_operations":
+            return self.airline_index(params).query_minimum_operations(params.get("route"))
+        if path == "/capacity":
+            if "airport" not in params:
+                raise ValueError("airport 파라미터가 필요합니다")
+            days = parse_range(params.get("day"), lambda v: parse_int(v, "day"))
+            return self.airline_index(params).query_capacity(params["airport"], days)
+        raise KeyError(f"없는 경로입니다: {path}")
+
+    def cache_key(self, path: str, params: Dict[str, str]) -> Tuple:
+        return (self.generation, path, tuple(sorted(params.items())))
+
+    def cache_lookup(self, key: Tuple) -> Optional[Tuple[int, bytes]]:
+        """캐시된 응답, 없으면 None (적중・미적중 집계)"""
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.cache.move_to_end(key)
+            self.cache_hits += 1
+            return cached
+        self.cache_misses += 1
+        return None
+
+    def cache_store(self, key: Tuple, path: str, response: Tuple[int, bytes]):
+        """성공 응답 캐시 (계산 중에 인덱스가 교체됐으면 저장하지 않음)"""
+        if response[0] == 200 and path != "/airlines" and key[0] == self.generation:
+            self.cache[key] = response
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+
+    def compute_answer(self, path: str, params: Dict[str, str]) -> Tuple[int, bytes]:
+        """(상태 코드, JSON 본문) 계산 (캐시를 건드리지 않으므로 작업 스레드에서 실행 가능)"""
+        try:
+            return 200, self.encode(self.answer(path, params))
+        except KeyError as e:
+            return 404, self.encode({"error": e.args[0]})
+        except ValueError as e:
+            return 400, self.encode({"error": str(e)})
+
+    def cached_answer(self, path: str, params: Dict[str, str]) -> Tuple[int, bytes]:
+        """(상태 코드, JSON 본문), 같은 조회는 LRU 캐시에서 (동기 호출용)"""
+        key = self.cache_key(path, params)
+        cached = self.cache_lookup(key)
+        if cached is not None:
+            return cached
+        response = self.compute_answer(path, params)
+        self.cache_store(key, path, response)
+        return response
+
+    @staticmethod
+    def encode(body: Dict) -> bytes:
+        return json.dumps(body, ensure_ascii=False, default=str).encode("utf-8")
+
+    # ------------------------------------------------------------------
+    # HTTP
+    # ------------------------------------------------------------------
+
+    async def handle_request(self, method: str, target: str) -> Tuple[int, bytes]:
+        url = urlsplit(target)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        if url.path == "/reload":
+            if method != "POST":
+                return 405, self.encode({"error": "/reload 는 POST로 호출해야 합니다"})
+            if "airline" in params and params["airline"] not in self.airline_ids:
+                return 404, self.encode({"error": f"서비스 대상이 아닌 항공사입니다: {params['airline']}"})
+            async with self.reload_lock:
+                airline_ids = [params["airline"]] if "airline" in params else None
+                loop = asyncio.get_running_loop()
+                # 읽기・인덱스 생성만 스레드에서 하고, 교체・캐시 비우기는 루프 스레드에서 (캐시 OrderedDict 동시 변경 방지)
+                result, updated = await loop.run_in_executor(None, self.load_changed, airline_ids)
+                self.swap_indexes(updated)
+            return 200, self.encode(result)
+        if method != "GET":
+            return 405, self.encode({"error": f"{url.path} 는 GET으로 호출해야 합니다"})
+
+        # 캐시 조회・저장은 루프 스레드에서, 캐시에 없는 조회의 계산만 작업 스레드에서
+        key = self.cache_key(url.path, params)
+        cached = self.cache_lookup(key)
+        if cached is not None:
+            return cached
+        async with self.semaphore:
+            loop = asyncio.get_running_loop()
+            response = await loop.run_in_executor(self.executor, self.compute_answer, url.path, params)
+        self.cache_store(key, url.path, response)
+        return response
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """HTTP/1.1 연결 하나 (keep-alive로 여러 요청 처리)"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                if int(headers.get("content-length", 0)):
+                    await reader.readexactly(int(headers["content-length"]))
+
+                parts = request_line.decode("latin-1").split()
+                if len(parts) != 3:
+                    break
+                method, target, version = parts
+                status, body = await self.handle_request(method, target)
+
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                writer.write(
+                    f"HTTP/1.1 {status} {HTTP_REASONS[status]}\r\n"
+                    f"Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(body)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + body
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.executor = ThreadPoolExecutor(max_workers=self.max_concurrency)
+        self.reload_lock = asyncio.Lock()
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        print(f"🌐 운항후보 조회 서비스 시작: http://{host}:{port} (조회 작업 스레드 {self.max_concurrency}개, 캐시 {self.cache_size}건)")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.executor.shutdown(wait=False)
+
+
+def main():
+    """메인 함수"""
+    import argparse
+
+    valid_airlines = [f"airline_{i:02d}" for i in range(1, 16)]
+
+    parser = argparse.ArgumentParser(usage="python candidate_query_service.py [항공사ID ...] [옵션]")
+    parser.add_argument("airline_ids", nargs="*", help="항공사 ID (생략 시 airline_01 ~ airline_15 전체)")
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"바인드 주소 (기본: {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"포트 (기본: {DEFAULT_PORT})")
+    parser.add_argument("--month", type=int, default=None, help="여러 달 레이아웃에서 적재할 월 (기본: 첫 번째 월)")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_SIZE,
+                        help=f"응답 LRU 캐시 항목 수 (기본: {DEFAULT_CACHE_SIZE})")
+    parser.add_argument("--max-concurrency", type=int, default=DEFAULT_MAX_CONCURRENCY,
+                        help=f"캐시에 없는 조회를 동시에 계산하는 작업 스레드 수 (기본: {DEFAULT_MAX_CONCURRENCY})")
+    args = parser.parse_args()
+
+    airline_ids = args.airline_ids or valid_airlines
+    invalid = [a for a in airline_ids if a not in valid_airlines]
+    if invalid:
+        print(f"❌ 잘못된 항공사 ID: {', '.join(invalid)}")
+        print(f"사용 가능한 항공사: {', '.join(valid_airlines)}")
+        sys.exit(1)
+
+    service = CandidateQueryService(airline_ids, args.month, args.cache_size, args.max_concurrency)
+    started = time.time()
+    result = service.reload()
+    for airline_id in result["missing"]:
+        print(f"⚠️ {airline_id} 운항후보 데이터가 없어 적재하지 않았습니다")
+    if not service.indexes:
+        print("❌ 적재된 항공사가 없습니다")
+        sys.exit(1)
+    rows = sum(index.row_count for index in service.indexes.values())
+    print(f"📊 {len(service.indexes)}개 항공사 운항후보 {rows:,}건 적재 ({time.time() - started:.1f}초)")
+
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        print("\n👋 운항후보 조회 서비스 종료")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+운항후보 CSV 노선×날짜 오프셋 인덱스
+운항후보는 노선 → 日付 → 出発時刻 순으로 기록되므로 (노선, 날짜) 블록은 파일 안에서 연속된 행 구간이다.
+기록 시점에 <파일>.routeday.npz sidecar에 블록 목록과 블록별 優先順位指数 내림차순 순열을 남겨,
+임의의 노선×날짜에 대한 상위 k건 / 기준값 이상 후보를 O(log n + 출력 크기)로 찾는다.
+
+- 블록 키 = 노선 ID × ROUTE_DAY_STRIDE + 날짜 (오름차순 배열, 이분 탐색)
+- 순열은 블록 순서대로 이어 붙이고, 블록 안은 優先順位指数 내림차순 (동점은 행 번호 오름차순)
+- 압축하지 않은 파일은 행별 바이트 오프셋도 기록하여 필요한 행만 seek로 읽는다
+"""
+
+import io
+import os
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Tuple
+
+ROUTE_DAY_INDEX_SUFFIX = ".routeday.npz"
+
+# 블록 키의 날짜 자리 (날짜 1~31)
+ROUTE_DAY_STRIDE = 32
+
+
+def route_day_index_path(data_path: str) -> str:
+    """데이터 파일의 노선×날짜 인덱스 sidecar 경로"""
+    return data_path + ROUTE_DAY_INDEX_SUFFIX
+
+
+def route_names(frame: pd.DataFrame) -> np.ndarray:
+    """"出発空港-到着空港" 형식 노선 이름 배열"""
+    return (frame["出発空港"].astype(str) + "-" + frame["到着空港"].astype(str)).to_numpy(dtype=str)
+
+
+class RouteDayIndexBuilder:
+    """기록되는 행의 노선・날짜・優先順位指数(와 바이트 길이)를 모아 인덱스 sidecar 생성"""
+
+    def __init__(self, header_length: Optional[int] = None):
+        self.header_length = header_length  # None이면 행별 바이트 오프셋을 남기지 않음 (압축 파일)
+        self._routes: List[np.ndarray] = []
+        self._days: List[np.ndarray] = []
+        self._priority: List[np.ndarray] = []
+        self._line_lengths: List[np.ndarray] = []
+
+    def add(self, lines: List[bytes], frame: pd.DataFrame):
+        """인코딩된 행(줄바꿈 제외)과 원본 DataFrame (파일에 기록되는 순서대로)"""
+        self._routes.append(route_names(frame))
+        self._days.append(frame["日付"].astype(str).str.rstrip("日").astype(int).to_numpy())
+        self._priority.append(frame["優先順位指数"].to_numpy(dtype=np.float64))
+        if self.header_length is not None:
+            self._line_lengths.append(np.fromiter((len(line) + 1 for line in lines), dtype=np.int64, count=len(lines)))
+
+    def write(self, data_path: str, columns: List[str]):
+        routes = np.concatenate(self._routes) if self._routes else np.zeros(0, dtype=str)
+        days = np.concatenate(self._days) if self._days else np.zeros(0, dtype=np.int64)
+        priority = np.concatenate(self._priority) if self._priority else np.zeros(0, dtype=np.float64)
+        row_offsets = None
+        if self.header_length is not None:
+            lengths = np.concatenate(self._line_lengths) if self._line_lengths else np.zeros(0, dtype=np.int64)
+            row_offsets = self.header_length + np.concatenate(([0], np.cumsum(lengths)))
+        write_route_day_index(data_path, columns, routes, days, priority, row_offsets)
+
+
+def build_route_day_arrays(routes: np.ndarray, days: np.ndarray, priority: np.ndarray) -> Dict[str, np.ndarray]:
+    """행 순서의 노선・날짜・優先順位指数로 블록 키 / 블록 경계 / 블록별 우선순위 순열 생성"""
+    route_list, route_codes = np.unique(routes, return_inverse=True)
+    keys = route_codes.astype(np.int64) * ROUTE_DAY_STRIDE + days
+    rows = np.arange(len(keys))
+    order = np.lexsort((rows, -priority, keys))
+    sorted_keys = keys[order]
+    starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]]) if len(keys) else rows
+    return {
+        "routes": route_list.astype(str),
+        "block_keys": sorted_keys[starts],
+        "block_bounds": np.r_[starts, len(keys)].astype(np.int64),
+        "order": order.astype(np.int64),
+        "negative_priority": -priority[order]  # 블록 안에서 오름차순 (이분 탐색용)
+    }
+
+
+def write_route_day_index(data_path: str, columns: List[str], routes: np.ndarray, days: np.ndarray,
+                          priority: np.ndarray, row_offsets: Optional[np.ndarray] = None):
+    """노선×날짜 인덱스 sidecar 기록"""
+    arrays = build_route_day_arrays(routes, days, priority)
+    with open(route_day_index_path(data_path), 'wb') as f:
+        np.savez(
+            f, columns=np.array(columns, dtype=str),
+            row_offsets=np.zeros(0, dtype=np.int64) if row_offsets is None else row_offsets.astype(np.int64),
+            **arrays
+        )
+
+
+class RouteDayIndex:
+    """노선×날짜 블록 조회 (상위 k건 / 기준값 이상 / 행 읽기)"""
+
+    def __init__(self, data_path: str, arrays: Dict[str, np.ndarray]):
+        self.data_path = data_path
+        self.columns: List[str] = arrays["columns"].tolist()
+        self.route_ids = {route: i for i, route in enumerate(arrays["routes"].tolist())}
+        self.block_keys = arrays["block_keys"]
+        self.block_bounds = arrays["block_bounds"]
+        self.order = arrays["order"]
+        self.negative_priority = arrays["negative_priority"]
+        self.row_offsets = arrays["row_offsets"]
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def block(self, route: str, day: int) -> Tuple[int, int]:
+        """노선×날짜 블록의 순열 구간 [start, end) (후보가 없으면 빈 구간)"""
+        route_id = self.route_ids.get(route)
+        if route_id is None:
+            return 0, 0
+        key = route_id * ROUTE_DAY_STRIDE + day
+        i = int(np.searchsorted(self.block_keys, key))
+        if i == len(self.block_keys) or self.block_keys[i] != key:
+            return 0, 0
+        return int(self.block_bounds[i]), int(self.block_bounds[i + 1])
+
+    def top_k(self, route: str, day: int, k: int) -> np.ndarray:
+        """優先順位指数 상위 k건의 행 번호 (내림차순)"""
+        start, end = self.block(route, day)
+        return self.order[start:min(end, start + k)]
+
+    def above(self, route: str, day: int, threshold: float) -> np.ndarray:
+        """優先順位指数 >= threshold인 행 번호 (내림차순)"""
+        start, end = self.block(route, day)
+        count = int(np.searchsorted(self.negative_priority[start:end], -threshold, side="right"))
+        return self.order[start:start + count]
+
+    def read_rows(self, rows: np.ndarray) -> pd.DataFrame:
+        """행 번호 순서대로 운항후보 행 읽기 (바이트 오프셋이 있으면 해당 행만 seek)"""
+        if len(rows) == 0:
+            return pd.DataFrame(columns=self.columns)
+        if len(self.row_offsets) == 0:
+            # 압축 파일은 행 단위로 건너뛸 수 없으므로 전체를 읽는다
+            return pd.read_csv(self.data_path).iloc[rows].reset_index(drop=True)
+
+        parts = []
+        with open(self.data_path, 'rb') as f:
+            for row in rows.tolist():
+                f.seek(self.row_offsets[row])
+                parts.append(f.read(self.row_offsets[row + 1] - self.row_offsets[row]))
+        return pd.read_csv(io.BytesIO(b''.join(parts)), header=None, names=self.columns)
+
+    def row_arrays(self) -> Dict[str, np.ndarray]:
+        """행 순서의 노선・날짜・優先順位指数 복원 (인덱스 병합용)"""
+        block_of_position = np.repeat(np.arange(len(self.block_keys)), np.diff(self.block_bounds))
+        keys = np.empty(len(self.order), dtype=np.int64)
+        keys[self.order] = self.block_keys[block_of_position]
+        priority = np.empty(len(self.order), dtype=np.float64)
+        priority[self.order] = -self.negative_priority
+        routes = np.array(list(self.route_ids), dtype=str)
+        return {"routes": routes[keys // ROUTE_DAY_STRIDE], "days": keys % ROUTE_DAY_STRIDE, "priority": priority}
+
+
+def load_route_day_index(data_path: str) -> Optional[RouteDayIndex]:
+    """노선×날짜 인덱스 sidecar 로드 (없으면 None)"""
+    path = route_day_index_path(data_path)
+    if not os.path.exists(path):
+        return None
+    with np.load(path) as arrays:
+        return RouteDayIndex(data_path, {name: arrays[name] for name in arrays.files})
+
+
+def merge_route_day_indexes(parts: List[Tuple[str, int]], header_length: int, consolidated_path: str) -> bool:
+    """바이트 연결로 만든 통합 파일의 노선×날짜 인덱스 생성 (행 번호・바이트 오프셋만 이동)
+
+    parts는 (데이터 파일 경로, 본문 시작 오프셋) 목록이며 통합 파일에 연결된 순서와 같아야 한다.
+    """
+    indexes = [load_route_day_index(path) for path, _ in parts]
+    if not indexes or any(index is None for index in indexes):
+        return False
+
+    rows = [index.row_arrays() for index in indexes]
+    merged = {name: np.concatenate([r[name] for r in rows]) for name in ["routes", "days", "priority"]}
+
+    row_offsets = None
+    if all(len(index.row_offsets) for index in indexes):
+        offsets = []
+        position = header_length
+        for (path, body_offset), index in zip(parts, indexes):
+            offsets.append(position + (index.row_offsets[:-1] - body_offset))
+            position += os.path.getsize(path) - body_offset
+        row_offsets = np.concatenate(offsets + [np.array([position], dtype=np.int64)])
+
+    write_route_day_index(
+        consolidated_path, indexes[0].columns, merged["routes"], merged["days"], merged["priority"], row_offsets
+    )
+    return True
@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+항공사 프로필 파라미터 시나리오 일괄 평가 (민감도 분석)
+AIRLINE_PROFILE의 brand_recognition / base_demand / price_elasticity / international_focus 등을
+시나리오 N개로 바꿔 가며 수요・최적수익・운항규모・우선순위 지수를 시나리오 축을 추가한 배열로 한 번에 계산하고,
+시나리오 × 노선별 집계(총수익, 운항규모 구성, 우선순위 분포)를 반환한다.
+
+- 시간대별 수요 배수 난수는 노선마다 한 번만 뽑아 모든 시나리오가 공유한다 (common random numbers)
+- 최적 가격은 (가격 그리드, 시나리오, 기본수요) 조회 테이블로 구해 노선 간에 재사용한다
+- 우선순위 지수의 해시 기반 노이즈 항(노선 시드, 고유성 점수, 미세 조정)은 기대값으로 평가한다
+"""
+
+import os
+import sys
+import itertools
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Tuple, Any, Optional, Iterable
+
+from generate_candidate_data import CandidateDataGenerator
+
+# 시나리오로 바꿀 수 있는 프로필 필드
+SWEEP_PARAMETERS = ["brand_recognition", "base_demand", "price_elasticity", "international_focus", "domestic_focus"]
+
+PRIORITY_PERCENTILES = [10, 50, 90]
+
+
+def _uniqueness_score_samples(samples: int = 200000) -> np.ndarray:
+    """calculate_priority_index 고유성 점수의 표본 (해시값 ~ 부호 있는 64비트 균등분포 가정)
+
+    고유성 점수는 해시값 두 개를 0~56비트씩 밀어서 만든 팩터 16개를 쓰므로,
+    큰 시프트의 팩터는 0 또는 1 근처에 몰린다. 같은 연산을 표본에 그대로 적용한다.
+    """
+    rng = np.random.default_rng(0)  # 전역 난수열에 영향을 주지 않도록 별도 생성기 사용
+    hashes = rng.integers(np.iinfo(np.int64).min, np.iinfo(np.int64).max, size=(2, samples), dtype=np.int64)
+    total = np.zeros(samples)
+    for i in range(16):
+        factor = ((hashes[i // 8] >> (8 * (i % 8))) % 1000000007) / 1000000007.0
+        total += (
+            factor * (i + 1) * 0.123456789 +
+            np.sin(factor * (i + 1) * 7.891234) * 0.456789 +
+            np.cos(factor * (i + 1) * 11.234567) * 0.789012 +
+            np.tan(factor * 0.1 + i * 0.01) * 0.234567 +
+            np.exp(factor * 0.01) * 0.012345 +
+            np.log(factor + 0.001) * 0.567890
+        )
+    return total
+
+
+def _noise_nodes(nodes: int = 16) -> Tuple[np.ndarray, np.ndarray]:
+    """해시 기반 노이즈 (노선 시드, 고유성 점수)의 층화 표본점 (라틴 하이퍼큐브, 고정 순서)
+
+    우선순위 지수는 tanh로 꺾이므로 노이즈를 기대값 하나로 바꾸면 평균이 치우친다.
+    대신 표본점마다 계산한 뒤 평균을 낸다.
+    """
+    levels = (np.arange(nodes) + 0.5) / nodes
+    route_seeds = levels
+    uniqueness = np.quantile(_uniqueness_score_samples(), levels)
+    return route_seeds, uniqueness[np.random.default_rng(1).permutation(nodes)]
+
+
+# 해시 기반 항의 표본점 / 기대값
+NOISE_ROUTE_SEEDS, NOISE_UNIQUENESS_SCORES = _noise_nodes()
+EXPECTED_MICRO_ADJUSTMENT = (1000000007 - 1) / 2 * (1e-11 + 1e-12 + 1e-13 + 1e-14)
+
+# calculate_priority_index의 시간대별 기본 점수
+TIME_BASE_HOUR = {
+    7: 5.2, 8: 18.7, 9: 17.3, 10: 12.8, 11: 14.1, 12: 13.9,
+    13: 11.6, 14: 12.4, 15: 13.7, 16: 15.2, 17: 19.1, 18: 18.9,
+    19: 17.8, 20: 14.3, 21: 12.1, 22: 8.4
+}
+
+PRIORITY_WEIGHTS = [1.618033, 0.577215, 1.414213, 0.693147, 1.732050, 0.367879, 2.302585]
+
+
+def scenario_grid(**axes: Iterable[float]) -> pd.DataFrame:
+    """파라미터별 값 목록의 데카르트 곱으로 시나리오 표 생성 (예: scenario_grid(base_demand=[150, 200], price_elasticity=[-0.2, -0.8]))"""
+    unknown = [name for name in axes if name not in SWEEP_PARAMETERS]
+    if unknown:
+        raise ValueError(f"지원하지 않는 파라미터: {', '.join(unknown)} (사용 가능: {', '.join(SWEEP_PARAMETERS)})")
+    names = list(axes.keys())
+    return pd.DataFrame(list(itertools.product(*[list(axes[name]) for name in names])), columns=names)
+
+
+class ExpectedScoreTable:
+    """노이즈 표본점별 최종 점수(tanh 변환 + 클리핑) 평균의 조회 테이블
+
+    노이즈를 뺀 가중합에 대한 1차원 매끄러운 함수이므로, 노선 시드 가중치(시나리오)마다
+    고정 격자에서 한 번 계산해 두고 선형 보간한다 (원소마다 표본점 수만큼 tanh를 계산하지 않음).
+    격자 밖은 tanh가 포화되는 구간이므로 양끝 값을 쓴다.
+    """
+
+    LOW = -400.0
+    HIGH = 400.0
+    STEP = 0.05
+
+    def __init__(self, seed_weight: np.ndarray, uniqueness_weight: float):
+        seed_weight = np.asarray(seed_weight, dtype=np.float64)
+        # 같은 가중치(예: route_focus를 바꾸지 않는 시나리오들)는 테이블 한 줄을 공유
+        values, inverse = np.unique(seed_weight.ravel(), return_inverse=True)
+        self.rows = inverse.reshape(seed_weight.shape)
+        grid = np.arange(self.LOW, self.HIGH + self.STEP / 2, self.STEP)
+        self.table = np.zeros((len(values), len(grid)))
+        for route_seed, uniqueness in zip(NOISE_ROUTE_SEEDS, NOISE_UNIQUENESS_SCORES):
+            weighted_sum = grid[None, :] + values[:, None] * route_seed + uniqueness * uniqueness_weight
+            self.table += np.clip(np.tanh(weighted_sum / 50.0) * 85.0 + 15.0 + EXPECTED_MICRO_ADJUSTMENT, 0.0, 100.0)
+        self.table /= len(NOISE_ROUTE_SEEDS)
+
+    def lookup(self, fixed_sum: np.ndarray) -> np.ndarray:
+        """가중합 배열 → 기대 최종 점수 (생성 시 seed_weight와 broadcast 가능한 모양)"""
+        shape = np.broadcast(fixed_sum, self.rows).shape
+        position = (np.clip(np.broadcast_to(fixed_sum, shape), self.LOW, self.HIGH) - self.LOW) / self.STEP
+        index = np.minimum(position.astype(np.int64), self.table.shape[1] - 2)
+        fraction = position - index
+        rows = np.broadcast_to(self.rows, shape)
+        return self.table[rows, index] * (1.0 - fraction) + self.table[rows, index + 1] * fraction
+
+
+def expected_priority_index(revenue: np.ndarray, seats: np.ndarray, personnel: np.ndarray,
+                            prepost_minutes: np.ndarray, time_score: np.ndarray, route_type: str,
+                            brand_recognition: np.ndarray, route_focus: np.ndarray,
+                            score_tables: Optional[Dict[str, ExpectedScoreTable]] = None) -> np.ndarray:
+    """calculate_priority_index의 배열 버전 (해시 기반 노이즈 항에 대한 기대값)
+
+    모든 인자는 서로 broadcast 가능한 배열이며, 결과도 broadcast된 모양으로 반환한다.
+    같은 route_focus로 여러 번 호출할 때는 score_tables(노선 타입별 캐시)를 넘겨 테이블을 재사용한다.
+    """
+    revenue = revenue.astype(np.float64)
+
+    # 1. 수익 효율성
+    weighted_resources = seats * 5 + personnel * 3 + prepost_minutes * 2
+    efficiency_score = np.minimum(revenue / weighted_resources * 0.1 + np.log10(revenue / 1000000 + 1) * 8.7642, 35.0)
+
+    # 2. 노선 타입별 점수 (노선 시드 부분은 노이즈로 분리)
+    if route_type == "international":
+        route_base, seed_span = 12.0, 8.0
+        route_multiplier = 1.0 + (route_focus - 0.5) * 0.3
+    else:
+        route_base, seed_span = 8.0, 7.0
+        route_multiplier = 1.0 + (route_focus - 0.5) * 0.2
+
+    # 4. 브랜드 인지도 점수
+    brand_score = (3.2 * brand_recognition ** 3 + 2.1 * brand_recognition ** 2 + 4.7 * brand_recognition +
+                   np.cos(brand_recognition * 17.234) * 0.8765)
+
+    # 5. 수익 규모별 보너스
+    revenue_factor = revenue / 1000000.0
+    revenue_exp = np.power(revenue_factor, 0.7854) * 2.3456
+    revenue_log = np.log(revenue_factor + 0.5) * 1.9876
+    revenue_bonus = np.where(
+        revenue > 5000000, 7.8 + revenue_exp * 0.3 + revenue_log,
+        np.where(revenue > 3000000, 4.2 + revenue_exp * 0.2 + revenue_log * 0.8,
+                 1.5 + revenue_exp * 0.1 + revenue_log * 0.5)
+    )
+
+    # 6. 자원 비율 점수
+    seat_ratio = seats / 300.0
+    personnel_ratio = personnel / 10.0
+    resource_score = (np.sin(seat_ratio * 3.14159) * np.cos(personnel_ratio * 2.718) * 3.456 +
+                      np.abs(seat_ratio - personnel_ratio) * (-2.789) + 8.0)
+
+    w = PRIORITY_WEIGHTS
+    fixed_sum = (efficiency_score * w[0] + route_base * route_multiplier * w[1] + time_score * w[2] +
+                 brand_score * w[3] + revenue_bonus * w[4] + resource_score * w[5])
+    seed_weight = seed_span * route_multiplier * w[1]
+
+    if score_tables is None:
+        score_tables = {}
+    if route_type not in score_tables:
+        score_tables[route_type] = ExpectedScoreTable(seed_weight, w[6])
+    return np.round(score_tables[route_type].lookup(fixed_sum), 7)
+
+
+class ScenarioSweep:
+    """항공사 하나의 노선 × 날짜 × 출발시각 후보를 시나리오 N개에 대해 일괄 평가"""
+
+    def __init__(self, generator: CandidateDataGenerator, airline_context: Dict[str, Any],
+                 max_days: int, scenario_chunk: int = 128):
+        self.generator = generator
+        self.context = airline_context
+        self.max_days = max_days
+        self.scenario_chunk = max(1, scenario_chunk)
+
+        slot_count = len(generator.departure_times)
+        self.days = np.repeat(np.arange(1, max_days + 1), slot_count)
+        self.slots = np.tile(np.arange(slot_count), max_days)
+        hours = np.array([int(t.split(":")[0]) for t in generator.departure_times])
+        minutes = np.array([int(t.split(":")[1]) for t in generator.departure_times])
+        self.hours = hours[self.slots]
+
+        # 시간대 점수는 출발시각에만 의존 (calculate_priority_index 3번 항목)
+        slot_time_score = (
+            np.array([TIME_BASE_HOUR.get(h, 10.0) for h in hours]) * (1.0 + (minutes - 15) * 0.001234) +
+            np.sin(hours * 0.7 + minutes * 0.1) * 2.3456
+        )
+        self.time_score = slot_time_score[self.slots]
+        self._optimal_tables: Dict[Tuple, np.ndarray] = {}
+        self._score_tables: Dict[str, ExpectedScoreTable] = {}
+
+    @classmethod
+    def for_airline(cls, airline_id: str, month: int = 1, output_dir: str = "output",
+                    scenario_chunk: int = 128) -> Optional["ScenarioSweep"]:
+        """항공사 데이터・노선・가격 그리드를 준비하여 생성 (실패 시 None)"""
+        generator = CandidateDataGenerator()
+        generator.output_dir = output_dir
+        sys.modules.pop("profile", None)  # 다른 항공사의 profile 모듈 캐시 제거
+        context = generator.prepare_airline_generation(airline_id)
+        if context is None:
+            return None
+        return cls(generator, context, generator.month_days[month], scenario_chunk=scenario_chunk)
+
+    def build_scenario_parameters(self, scenarios: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """시나리오 표에 없는 파라미터는 기존 프로필 값으로 채워 파라미터별 (시나리오수,) 배열 반환"""
+        unknown = [c for c in scenarios.columns if c not in SWEEP_PARAMETERS]
+        if unknown:
+            raise ValueError(f"지원하지 않는 파라미터: {', '.join(unknown)} (사용 가능: {', '.join(SWEEP_PARAMETERS)})")
+        profile = self.context["airline_profile"]
+        return {
+            name: (scenarios[name].to_numpy(dtype=np.float64) if name in scenarios.columns
+                   else np.full(len(scenarios), float(profile[name])))
+            for name in SWEEP_PARAMETERS
+        }
+
+    def optimal_price_index(self, grid_key: Tuple, prices: np.ndarray, price_factors: np.ndarray,
+                            base_demands: np.ndarray) -> np.ndarray:
+        """(시나리오, 기본수요)별 최적 가격 인덱스 조회 (가격 그리드별 테이블은 필요한 기본수요 범위까지 확장 후 재사용)
+
+        price_factors: (시나리오수, 가격수), base_demands: (시나리오수, 행수)
+        """
+        max_base = int(base_demands.max(initial=0))
+        table = self._optimal_tables.get(grid_key)
+        if table is None or table.shape[1] <= max_base:
+            bases = np.arange(max_base + 1, dtype=np.int64)
+            demand_grid = np.maximum(
+                np.floor(bases[None, :, None] * price_factors[:, None, :]).astype(np.int64), 10
+            )
+            table = np.argmax(prices[None, None, :] * demand_grid, axis=2)
+            self._optimal_tables[grid_key] = table
+        return table[np.arange(len(base_demands))[:, None], base_demands]
+
+    def evaluate_route(self, route: Dict, params: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """노선 하나를 시나리오 축 포함 (시나리오수, 행수) 배열로 평가"""
+        generator = self.generator
+        internal_data = self.context["internal_data"]
+        scale_table = self.context["scale_table"]
+
+        # 수요함수 (시간대별 배수 난수는 모든 시나리오가 공유)
+        focus = params["international_focus"] if route["type"] == "international" else params["domestic_focus"]
+        low, high = generator.get_time_multiplier_bounds(self.hours)
+        time_multipliers = np.random.uniform(low, high)
+        base_demands = np.floor(
+            (params["base_demand"] * params["brand_recognition"] * focus)[:, None] * time_multipliers[None, :]
+        ).astype(np.int64)
+
+        # 최적 가격 (compute_route_batch와 같은 가격 그리드・수요 규칙)
+        flight_time, prices, _ = self.context["price_grids"][(route["departure"], route["arrival"], route["type"])]
+        price_factors = (prices.astype(np.float64)[None, :] / 20000) ** params["price_elasticity"][:, None]
+        optimal_idx = self.optimal_price_index((int(prices[0]), int(prices[-1])), prices, price_factors, base_demands)
+        scenario_rows = np.arange(len(base_demands))[:, None]
+        demands = np.maximum(np.floor(base_demands * price_factors[scenario_rows, optimal_idx]).astype(np.int64), 10)
+        revenues = prices[optimal_idx] * demands
+
+        # 운항규모 (determine_operation_scale과 같은 임계값)
+        operation_scales = internal_data["運航規模種類"]
+        scale_keys = scale_table["keys"]
+        scale_index = np.full(demands.shape, scale_keys.index("小規模運航"))
+        if "中規模運航" in operation_scales:
+            scale_index[demands > 150] = scale_keys.index("中規模運航")
+        if "大規模運航" in operation_scales:
+            scale_index[demands > 300] = scale_keys.index("大規模運航")
+
+        personnel = np.zeros(demands.shape, dtype=np.int64)
+        for k, items in enumerate(scale_table["その他必要人員指数"]):
+            in_scale = scale_index == k
+            values = np.full(in_scale.sum(), items[-1]["必要人員指数"], dtype=np.int64)
+            scale_demands = demands[in_scale]
+            for item in reversed(items):
+                values[scale_demands <= item["最大乗客数"]] = item["必要人員指数"]
+            personnel[in_scale] = values
+
+        seats = scale_table["座席数"][scale_index]
+        prepost = (scale_table["飛行前必要時間"] + scale_table["飛行後必要時間"])[scale_index]
+        priorities = expected_priority_index(
+            revenues, seats, personnel, prepost, self.time_score[None, :], route["type"],
+            params["brand_recognition"][:, None], focus[:, None], score_tables=self._score_tables
+        )
+        return {
+            "revenue": revenues,
+            "scale_index": scale_index,
+            "viable": revenues >= scale_table["運航可能な最小収益(円)"][scale_index],
+            "priority": priorities
+        }
+
+    def run(self, scenarios: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+        """시나리오 전체 평가
+
+        반환값:
+            "routes": 시나리오 × 노선별 총수익・운항가능 후보수・운항규모 구성・우선순위 분포
+            "scenarios": 시나리오별 총수익・운항가능 비율・운항규모 구성・우선순위 평균
+        """
+        scenarios = scenarios.reset_index(drop=True)
+        scale_keys = self.context["scale_table"]["keys"]
+        routes = self.context["routes"]
+        route_frames = []
+
+        for start in range(0, len(scenarios), self.scenario_chunk):
+            chunk = scenarios.iloc[start:start + self.scenario_chunk]
+            params = self.build_scenario_parameters(chunk)
+            # 조회 테이블은 시나리오 묶음 단위 (가격 그리드별・노선 타입별로 노선 간 재사용)
+            self._optimal_tables = {}
+            self._score_tables = {}
+            scenario_ids = np.arange(start, start + len(chunk))
+
+            for route in routes:
+                result = self.evaluate_route(route, params)
+                frame = {
+                    "シナリオ": scenario_ids,
+                    "出発空港": route["departure"],
+                    "到着空港": route["arrival"],
+                    "type": self.generator.get_segment_key(route),
+                    "候補数": result["revenue"].shape[1],
+                    "総収益(円)": result["revenue"].sum(axis=1),
+                    "運航可能候補数": result["viable"].sum(axis=1)
+                }
+                for k, key in enumerate(scale_keys):
+                    frame[key] = (result["scale_index"] == k).sum(axis=1)
+                frame["優先順位指数_平均"] = result["priority"].mean(axis=1)
+                for q, values in zip(PRIORITY_PERCENTILES,
+                                     np.percentile(result["priority"], PRIORITY_PERCENTILES, axis=1)):
+                    frame[f"優先順位指数_P{q}"] = values
+                route_frames.append(pd.DataFrame(frame))
+
+        route_summary = pd.concat(route_frames, ignore_index=True).sort_values(
+            ["シナリオ"], kind="stable"
+        ).reset_index(drop=True)
+
+        grouped = route_summary.groupby("シナリオ", sort=True)
+        candidates = grouped["候補数"].sum()
+        scenario_summary = scenarios.copy()
+        scenario_summary.insert(0, "シナリオ", np.arange(len(scenarios)))
+        scenario_summary["総収益(円)"] = grouped["総収益(円)"].sum().to_numpy()
+        scenario_summary["運航可能比率"] = (grouped["運航可能候補数"].sum() / candidates).to_numpy()
+        for key in scale_keys:
+            scenario_summary[f"{key}比率"] = (grouped[key].sum() / candidates).to_numpy()
+        # 노선별 평균을 후보수로 가중한 전체 평균
+        weighted = (route_summary["優先順位指数_平均"] * route_summary["候補数"]).groupby(route_summary["シナリオ"]).sum()
+        scenario_summary["優先順位指数_平均"] = (weighted / candidates).to_numpy()
+
+        return {"routes": route_summary, "scenarios": scenario_summary}
+
+
+def parse_grid_argument(text: str) -> Tuple[str, List[float]]:
+    """"name=v1,v2,..." 형식의 --grid 인수 해석"""
+    if "=" not in text:
+        raise ValueError(f"name=v1,v2 형식이어야 합니다: {text}")
+    name, values = text.split("=", 1)
+    return name.strip(), [float(v) for v in values.split(",") if v.strip()]
+
+
+def main():
+    """메인 함수"""
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(
+        description="AIRLINE_PROFILE 파라미터 시나리오 일괄 평가",
+        usage="python candidate_scenario_sweep.py <항공사ID> --grid name=v1,v2 [...] [옵션]"
+    )
+    parser.add_argument("airline_id", help="항공사 ID (예: airline_01)")
+    parser.add_argument("--grid", action="append", default=[],
+                        help=f"파라미터 값 목록 (name=v1,v2,..., 여러 번 지정 시 데카르트 곱). 사용 가능: {', '.join(SWEEP_PARAMETERS)}")
+    parser.add_argument("--scenarios", help="시나리오 표 CSV (컬럼 = 파라미터명, --grid 대신 사용)")
+    parser.add_argument("--month", type=int, default=1, help="평가할 월 (일수 결정, 기본: 1)")
+    parser.add_argument("--seed", type=int, help="난수 시드")
+    parser.add_argument("--output-prefix", help="결과 CSV 경로 접두사 (<접두사>_routes.csv, <접두사>_scenarios.csv)")
+    args = parser.parse_args()
+
+    try:
+        if args.scenarios:
+            scenarios = pd.read_csv(args.scenarios)
+        else:
+            if not args.grid:
+                parser.error("--grid 또는 --scenarios를 지정하세요")
+            scenarios = scenario_grid(**dict(parse_grid_argument(g) for g in args.grid))
+    except ValueError as e:
+        parser.error(str(e))
+    if args.month not in range(1, 13):
+        parser.error("--month는 1~12 사이여야 합니다")
+
+    if args.seed is not None:
+        np.random.seed(args.seed)
+
+    sweep = ScenarioSweep.for_airline(args.airline_id, month=args.month)
+    if sweep is None:
+        print(f"❌ {args.airline_id} 데이터 로드 실패")
+        sys.exit(1)
+
+    print(f"🧪 {args.airline_id} 시나리오 {len(scenarios)}개 × 노선 {len(sweep.context['routes'])}개 평가 중...")
+    started = time.time()
+    try:
+        result = sweep.run(scenarios)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    print(f"✅ 평가 완료: {time.time() - started:.1f}초")
+
+    with pd.option_context("display.width", 200, "display.max_columns", 20):
+        print(result["scenarios"].to_string(index=False, max_rows=30))
+
+    if args.output_prefix:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output_prefix)), exist_ok=True)
+        for name, df in result.items():
+            path = f"{args.output_prefix}_{name}.csv"
+            df.to_csv(path, index=False, encoding='utf-8-sig')
+            print(f"✅ {name} 저장 완료: {path}")
+
+
+if __name__ == "__main__":
+    main()
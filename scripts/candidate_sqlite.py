@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+운항후보 SQLite 데이터베이스 적재 (분석용, 서버 없이 인덱스 SQL 조회)
+운항후보・최소 운항 기준・공항 시간대 용량(긴 형식)을 하나의 SQLite 파일에 적재한다.
+
+- 공항 / 노선 / 운항규모 / 출발 시각은 정수 키 차원 테이블, candidate 팩트 테이블은 차원 ID + 행마다 달라지는 값
+  (slot은 0시 기준 분: 07:30 → 450, slot_capacity와 같은 키)
+- 커버링 인덱스: (route_id, day, slot, airline_id, 優先順位指数), (優先順位指数 DESC, airline_id, route_id, day, slot)
+- 항공사마다 한 트랜잭션에서 executemany로 청크 단위 삽입
+- 대량 적재(인덱스가 아직 없는 DB, --rebuild-indexes)는 보조 인덱스를 지우고 적재한 뒤 한 번에 재생성 + ANALYZE,
+  인덱스가 있는 DB에 일부 항공사를 다시 적재할 때는 인덱스를 유지한 채 삽입하고 PRAGMA optimize만 실행
+  (생성기 --sqlite로 항공사를 하나씩 적재해도 DB 전체 인덱스를 매번 다시 만들지 않음)
+- 다시 적재하면 해당 항공사의 기존 행을 지우고 교체한다
+- candidate_view / slot_capacity_view는 원래 CSV 컬럼명으로 조회하는 뷰
+"""
+
+import os
+import sys
+import time
+import sqlite3
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Tuple
+
+from artifact_reader import ArtifactReader
+from candidate_months import candidate_month_sources
+from candidate_partitions import parse_day_numbers
+from candidate_star_schema import SCALE_DIM_COLUMNS
+from generate_candidate_data import CANDIDATE_COLUMNS
+from operations_feasibility import OperationsFeasibilityChecker
+from slot_contention_cube import stream_candidate_chunks
+
+CANDIDATE_SQLITE_FILE = "candidates.sqlite"
+
+DEFAULT_SQLITE_CHUNK_ROWS = 100000
+
+# 대량 적재용 설정 (WAL + synchronous NORMAL: 트랜잭션마다 fsync하지 않아도 DB가 깨지지 않음)
+LOAD_PRAGMAS = [
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -262144",
+    "PRAGMA mmap_size = 268435456"
+]
+
+# 행마다 달라지는 팩트 컬럼 (운항후보 CSV 컬럼명 그대로)
+FACT_VALUE_COLUMNS = [
+    "飛行時間", "推奨最大運航数", "価格(円)", "需要(名)", "収益(円)", "その他必要人員指数", "優先順位指数"
+]
+
+
+def quoted(columns: List[str]) -> str:
+    """SQL 식별자 목록 ("収益(円)"처럼 괄호가 들어간 컬럼명을 그대로 쓰기 위해 큰따옴표로 감쌈)"""
+    return ", ".join(f'"{column}"' for column in columns)
+
+
+def candidate_view_columns() -> str:
+    """candidate_view의 SELECT 목록 (운항후보 CSV와 같은 컬럼 순서)"""
+    expressions = {
+        "日付": "c.day || '日'",
+        "出発国家": "dep.国", "出発空港": "dep.空港",
+        "到着国家": "arr.国", "到着空港": "arr.空港",
+        "出発時刻": "s.出発時刻"
+    }
+    expressions.update({column: f'c."{column}"' for column in FACT_VALUE_COLUMNS})
+    expressions.update({column: f'sc."{column}"' for column in SCALE_DIM_COLUMNS})
+    return ",\n       ".join(f'{expressions[column]} AS "{column}"' for column in CANDIDATE_COLUMNS)
+
+
+SCHEMA_SQL = f"""
+CREATE TABLE IF NOT EXISTS airline (
+    airline_id INTEGER PRIMARY KEY,
+    航空会社 TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS airport (
+    airport_id INTEGER PRIMARY KEY,
+    空港 TEXT NOT NULL UNIQUE,
+    国 TEXT
+);
+CREATE TABLE IF NOT EXISTS route (
+    route_id INTEGER PRIMARY KEY,
+    departure_airport_id INTEGER NOT NULL REFERENCES airport(airport_id),
+    arrival_airport_id INTEGER NOT NULL REFERENCES airport(airport_id),
+    UNIQUE (departure_airport_id, arrival_airport_id)
+);
+CREATE TABLE IF NOT EXISTS slot (
+    slot INTEGER PRIMARY KEY,
+    出発時刻 TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS scale (
+    scale_id INTEGER PRIMARY KEY,
+    {quoted(SCALE_DIM_COLUMNS)},
+    UNIQUE ({quoted(SCALE_DIM_COLUMNS)})
+);
+CREATE TABLE IF NOT EXISTS candidate (
+    airline_id INTEGER NOT NULL REFERENCES airline(airline_id),
+    month INTEGER,
+    route_id INTEGER NOT NULL REFERENCES route(route_id),
+    day INTEGER NOT NULL,
+    slot INTEGER NOT NULL REFERENCES slot(slot),
+    scale_id INTEGER NOT NULL REFERENCES scale(scale_id),
+    {", ".join(f'"{column}" NUMERIC' for column in FACT_VALUE_COLUMNS)}
+);
+CREATE TABLE IF NOT EXISTS minimum_operations (
+    airline_id INTEGER NOT NULL REFERENCES airline(airline_id),
+    route_id INTEGER NOT NULL REFERENCES route(route_id),
+    最低維持月別運航回数 INTEGER NOT NULL,
+    PRIMARY KEY (airline_id, route_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS slot_capacity (
+    airline_id INTEGER NOT NULL REFERENCES airline(airline_id),
+    airport_id INTEGER NOT NULL REFERENCES airport(airport_id),
+    day INTEGER NOT NULL,
+    slot INTEGER NOT NULL REFERENCES slot(slot),
+    割り当て可能回数 INTEGER NOT NULL,
+    PRIMARY KEY (airline_id, airport_id, day, slot)
+) WITHOUT ROWID;
+
+CREATE VIEW IF NOT EXISTS candidate_view AS
+SELECT a.航空会社, c.month AS 月,
+       {candidate_view_columns()},
+       c.airline_id, c.route_id, c.day, c.slot, c.scale_id
+FROM candidate c
+JOIN airline a ON a.airline_id = c.airline_id
+JOIN route r ON r.route_id = c.route_id
+JOIN airport dep ON dep.airport_id = r.departure_airport_id
+JOIN airport arr ON arr.airport_id = r.arrival_airport_id
+JOIN slot s ON s.slot = c.slot
+JOIN scale sc ON sc.scale_id = c.scale_id;
+
+CREATE VIEW IF NOT EXISTS slot_capacity_view AS
+SELECT a.航空会社, p.国, p.空港, c.day || '日' AS 日付, s.出発時刻 AS 時間帯開始, c.割り当て可能回数,
+       c.airline_id, c.airport_id, c.day, c.slot
+FROM slot_capacity c
+JOIN airline a ON a.airline_id = c.airline_id
+JOIN airport p ON p.airport_id = c.airport_id
+JOIN slot s ON s.slot = c.slot;
+"""
+
+# 적재 후 다시 만드는 보조 인덱스 (이름 → 생성 SQL)
+CANDIDATE_INDEXES = {
+    "candidate_route_day_slot":
+        'CREATE INDEX IF NOT EXISTS candidate_route_day_slot ON candidate (route_id, day, slot, airline_id, "優先順位指数")',
+    "candidate_priority":
+        'CREATE INDEX IF NOT EXISTS candidate_priority ON candidate ("優先順位指数" DESC, airline_id, route_id, day, slot)'
+}
+
+
+def time_to_slot(times: pd.Series) -> np.ndarray:
+    """"07:30" → 450 (0시 기준 분), 고유값만 변환"""
+    codes, uniques = pd.factorize(times)
+    minutes = np.array([int(t[:2]) * 60 + int(t[3:5]) for t in uniques.astype(str)], dtype=np.int64)
+    return minutes[codes]
+
+
+def time_to_day(days: pd.Series) -> np.ndarray:
+    """"5日" → 5, 고유값만 변환"""
+    codes, uniques = pd.factorize(days)
+    return parse_day_numbers(pd.Series(uniques))[codes]
+
+
+def factorize_rows(frame: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """여러 컬럼 조합의 (행별 코드, 조합별 첫 행 위치), 컬럼별 코드를 정수로 합쳐서 한 번에 np.unique"""
+    combined = np.zeros(len(frame), dtype=np.int64)
+    for column in frame.columns:
+        codes, uniques = pd.factorize(frame[column])
+        combined = combined * (len(uniques) + 1) + codes
+    _, first_rows, inverse = np.unique(combined, return_index=True, return_inverse=True)
+    return inverse.reshape(-1), first_rows
+
+
+class CandidateSqliteLoader:
+    """운항후보・최소 운항 기준・공항 시간대 용량 SQLite 적재기"""
+
+    def __init__(self, db_path: str, chunk_rows: int = DEFAULT_SQLITE_CHUNK_ROWS):
+        self.output_dir = "output"
+        self.db_path = db_path
+        self.chunk_rows = chunk_rows
+        self.artifact_reader = ArtifactReader()
+        self.schedule_reader = OperationsFeasibilityChecker()
+        self._ids: Dict[str, Dict[tuple, int]] = {}
+
+    # ------------------------------------------------------------------
+    # 연결 / 차원 테이블
+    # ------------------------------------------------------------------
+
+    def connect(self) -> sqlite3.Connection:
+        """DB 연결 (스키마가 없으면 생성, 대량 적재용 PRAGMA 적용)"""
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.db_path)
+        for pragma in LOAD_PRAGMAS:
+            conn.execute(pragma)
+        conn.executescript(SCHEMA_SQL)
+        self._ids = {
+            "airline": {(name,): i for i, name in conn.execute("SELECT airline_id, 航空会社 FROM airline")},
+            "airport": {(name,): i for i, name in conn.execute("SELECT airport_id, 空港 FROM airport")},
+            "route": {(d, a): i for i, d, a in conn.execute(
+                "SELECT route_id, departure_airport_id, arrival_airport_id FROM route")},
+            "scale": {tuple(row[1:]): row[0] for row in conn.execute(
+                f"SELECT scale_id, {quoted(SCALE_DIM_COLUMNS)} FROM scale")}
+        }
+        return conn
+
+    def dimension_ids(self, conn: sqlite3.Connection, table: str, keys: List[tuple],
+                      insert_sql: str, extra: Optional[List[tuple]] = None) -> np.ndarray:
+        """차원 키 목록의 정수 ID (없는 키는 새 ID로 추가, extra는 키 뒤에 붙여 저장할 속성)"""
+        ids = self._ids[table]
+        new_rows = []
+        for i, key in enumerate(keys):
+            if key not in ids:
+                ids[key] = len(ids) + 1
+                new_rows.append((ids[key],) + key + (extra[i] if extra else ()))
+        if new_rows:
+            conn.executemany(insert_sql, new_rows)
+        return np.array([ids[key] for key in keys], dtype=np.int64)
+
+    def airport_ids(self, conn: sqlite3.Connection, airports: pd.Series, countries: pd.Series) -> np.ndarray:
+        """공항 이름 배열 → airport_id 배열"""
+        codes, uniques = pd.factorize(airports)
+        first = pd.Series(countries.to_numpy()).groupby(codes).first().reindex(range(len(uniques)))
+        ids = self.dimension_ids(
+            conn, "airport", [(name,) for name in uniques.tolist()],
+            "INSERT INTO airport (airport_id, 空港, 国) VALUES (?, ?, ?)", [(c,) for c in first.tolist()]
+        )
+        return ids[codes]
+
+    def route_ids(self, conn: sqlite3.Connection, departure: np.ndarray, arrival: np.ndarray) -> np.ndarray:
+        codes, first_rows = factorize_rows(pd.DataFrame({"departure": departure, "arrival": arrival}))
+        ids = self.dimension_ids(
+            conn, "route", list(zip(departure[first_rows].tolist(), arrival[first_rows].tolist())),
+            "INSERT INTO route (route_id, departure_airport_id, arrival_airport_id) VALUES (?, ?, ?)"
+        )
+        return ids[codes]
+
+    def add_slots(self, conn: sqlite3.Connection, slots: np.ndarray):
+        conn.executemany(
+            "INSERT OR IGNORE INTO slot (slot, 出発時刻) VALUES (?, ?)",
+            [(int(s), f"{s // 60:02d}:{s % 60:02d}") for s in np.unique(slots).tolist()]
+        )
+
+    # ------------------------------------------------------------------
+    # 적재
+    # ------------------------------------------------------------------
+
+    def insert_candidates(self, conn: sqlite3.Connection, airline_key: int, month: Optional[int],
+                          chunk: pd.DataFrame) -> int:
+        """운항후보 청크 하나를 차원 ID로 바꿔 삽입"""
+        departure = self.airport_ids(conn, chunk["出発空港"], chunk["出発国家"])
+        arrival = self.airport_ids(conn, chunk["到着空港"], chunk["到着国家"])
+        routes = self.route_ids(conn, departure, arrival)
+        slots = time_to_slot(chunk["出発時刻"])
+        self.add_slots(conn, slots)
+
+        codes, first_rows = factorize_rows(chunk[SCALE_DIM_COLUMNS])
+        scale_keys = list(chunk[SCALE_DIM_COLUMNS].iloc[first_rows].itertuples(index=False, name=None))
+        placeholders = ", ".join("?" * (len(SCALE_DIM_COLUMNS) + 1))
+        scales = self.dimension_ids(
+            conn, "scale", scale_keys,
+            f"INSERT INTO scale (scale_id, {quoted(SCALE_DIM_COLUMNS)}) "
+            f"VALUES ({placeholders})"
+        )[codes]
+
+        columns = [
+            [airline_key] * len(chunk), [month] * len(chunk), routes.tolist(),
+            time_to_day(chunk["日付"]).tolist(), slots.tolist(), scales.tolist()
+        ] + [chunk[column].tolist() for column in FACT_VALUE_COLUMNS]
+        conn.executemany(
+            f"INSERT INTO candidate VALUES ({', '.join('?' * len(columns))})", zip(*columns)
+        )
+        return len(chunk)
+
+    def insert_minimum_operations(self, conn: sqlite3.Connection, airline_key: int, df: pd.DataFrame) -> int:
+        departure = self.airport_ids(conn, df["出発空港"], df["出発国家"])
+        arrival = self.airport_ids(conn, df["到着空港"], df["到着国家"])
+        routes = self.route_ids(conn, departure, arrival)
+        conn.executemany(
+            "INSERT OR REPLACE INTO minimum_operations VALUES (?, ?, ?)",
+            zip([airline_key] * len(df), routes.tolist(), df["最低維持月別運航回数"].astype(int).tolist())
+        )
+        return len(df)
+
+    def insert_slot_capacity(self, conn: sqlite3.Connection, airline_key: int, schedule: pd.DataFrame) -> int:
+        """airport_schedule_data를 (공항, 날짜, 시간대) 긴 형식으로 삽입"""
+        airports, labels, cube = self.schedule_reader.build_capacity_cube(schedule)
+        if cube.size == 0:
+            return 0
+        countries = schedule.drop_duplicates("空港").set_index("空港")["国"].reindex(airports)
+        airport_keys = self.airport_ids(conn, pd.Series(airports), countries.reset_index(drop=True))
+        slots = time_to_slot(pd.Series([label.split(" ~ ")[0] for label in labels]))
+        self.add_slots(conn, slots)
+
+        airport_index, day_index, slot_index = np.indices(cube.shape).reshape(3, -1)
+        conn.executemany(
+            "INSERT OR REPLACE INTO slot_capacity VALUES (?, ?, ?, ?, ?)",
+            zip([airline_key] * cube.size, airport_keys[airport_index].tolist(), (day_index + 1).tolist(),
+                slots[slot_index].tolist(), cube.ravel().tolist())
+        )
+        return int(cube.size)
+
+    def load_airline(self, conn: sqlite3.Connection, airline_id: str, month: Optional[int] = None) -> Optional[Dict]:
+        """항공사 하나를 한 트랜잭션으로 교체 적재, 테이블별 행 수 반환 (운항후보가 없으면 None)"""
+        airline_dir = os.path.join(self.output_dir, airline_id)
+        candidate_dir = os.path.join(airline_dir, "analytics_data", "candidate")
+        if not os.path.isdir(candidate_dir):
+            print(f"❌ {airline_id} 운항후보 데이터가 없습니다: {candidate_dir}")
+            return None
+
+        counts = {"candidate": 0, "minimum_operations": 0, "slot_capacity": 0}
+        with conn:
+            airline_key = int(self.dimension_ids(
+                conn, "airline", [(airline_id,)], "INSERT INTO airline (airline_id, 航空会社) VALUES (?, ?)"
+            )[0])
+            for table in counts:
+                conn.execute(f"DELETE FROM {table} WHERE airline_id = ?", (airline_key,))
+
+            for source_month, source_dir in candidate_month_sources(candidate_dir, month):
+                for chunk in stream_candidate_chunks(source_dir, self.chunk_rows, columns=CANDIDATE_COLUMNS):
+                    counts["candidate"] += self.insert_candidates(conn, airline_key, source_month, chunk)
+
+            minimum_operations = self.artifact_reader.read(airline_dir, "minimum_operations")
+            if minimum_operations is not None:
+                counts["minimum_operations"] = self.insert_minimum_operations(conn, airline_key, minimum_operations)
+            schedule = self.artifact_reader.read(airline_dir, "airport_schedule")
+            if schedule is not None:
+                counts["slot_capacity"] = self.insert_slot_capacity(conn, airline_key, schedule)
+        return counts
+
+    def existing_indexes(self, conn: sqlite3.Connection) -> List[str]:
+        """DB에 있는 보조 인덱스 이름"""
+        rows = conn.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'candidate'")
+        return [name for (name,) in rows if name in CANDIDATE_INDEXES]
+
+    def load(self, airline_ids: List[str], month: Optional[int] = None,
+             rebuild_indexes: Optional[bool] = None) -> Dict[str, Dict]:
+        """항공사 목록 적재
+
+        rebuild_indexes가 True면 보조 인덱스를 적재 전에 지우고 끝난 뒤 한 번에 재생성 + ANALYZE,
+        False면 인덱스를 유지한 채 삽입 (없는 인덱스만 생성) 후 PRAGMA optimize.
+        None이면 인덱스가 하나라도 없을 때만 재생성한다.
+        """
+        conn = self.connect()
+        try:
+            existing = self.existing_indexes(conn)
+            if rebuild_indexes is None:
+                rebuild_indexes = len(existing) < len(CANDIDATE_INDEXES)
+            if rebuild_indexes:
+                for name in existing:
+                    conn.execute(f"DROP INDEX IF EXISTS {name}")
+
+            results = {}
+            for airline_id in airline_ids:
+                started = time.time()
+                counts = self.load_airline(conn, airline_id, month)
+                if counts is None:
+                    continue
+                results[airline_id] = counts
+                print(f"✅ {airline_id} SQLite 적재 완료: 운항후보 {counts['candidate']:,}건, "
+                      f"최소 운항 기준 {counts['minimum_operations']}건, "
+                      f"시간대 용량 {counts['slot_capacity']:,}건 ({time.time() - started:.1f}초)")
+
+            started = time.time()
+            if rebuild_indexes:
+                with conn:
+                    for sql in CANDIDATE_INDEXES.values():
+                        conn.execute(sql)
+                conn.execute("ANALYZE")
+                print(f"📇 인덱스 생성 완료 ({time.time() - started:.1f}초)")
+            else:
+                conn.execute("PRAGMA optimize")
+            return results
+        finally:
+            conn.close()
+
+
+def main():
+    """메인 함수"""
+    import argparse
+
+    valid_airlines = [f"airline_{i:02d}" for i in range(1, 16)]
+
+    parser = argparse.ArgumentParser(usage="python candidate_sqlite.py [항공사ID ...] [옵션]")
+    parser.add_argument("airline_ids", nargs="*", help="항공사 ID (생략 시 airline_01 ~ airline_15 전체)")
+    parser.add_argument("--db", default=os.path.join("output", CANDIDATE_SQLITE_FILE),
+                        help=f"SQLite DB 경로 (기본: output/{CANDIDATE_SQLITE_FILE})")
+    parser.add_argument("--month", type=int, default=None,
+                        help="월 정보가 없는 flat 레이아웃의 month 컬럼 값 (여러 달 레이아웃은 모든 월을 적재)")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_SQLITE_CHUNK_ROWS,
+                        help=f"executemany 청크 행 수 (기본: {DEFAULT_SQLITE_CHUNK_ROWS})")
+    parser.add_argument("--rebuild-indexes", action="store_true",
+                        help="보조 인덱스를 지우고 적재한 뒤 다시 생성 (많은 항공사를 다시 적재할 때 빠름, "
+                             "기본: 인덱스가 없을 때만)")
+    args = parser.parse_args()
+
+    airline_ids = args.airline_ids or valid_airlines
+    invalid = [a for a in airline_ids if a not in valid_airlines]
+    if invalid:
+        print(f"❌ 잘못된 항공사 ID: {', '.join(invalid)}")
+        print(f"사용 가능한 항공사: {', '.join(valid_airlines)}")
+        sys.exit(1)
+
+    started = time.time()
+    results = CandidateSqliteLoader(args.db, args.chunk_rows).load(
+        airline_ids, args.month, rebuild_indexes=True if args.rebuild_indexes else None
+    )
+    if not results:
+        print("❌ 적재된 항공사가 없습니다")
+        sys.exit(1)
+    rows = sum(counts["candidate"] for counts in results.values())
+    print(f"\n🎉 {len(results)}개 항공사 운항후보 {rows:,}건 SQLite 적재 완료: {args.db} ({time.time() - started:.1f}초)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+운항후보 데이터 스타 스키마 저장/조회
+노선 차원(route_dim) / 운항규모 차원(scale_dim) / 출발시각 차원(slot_dim)과
+정수 ID만 담은 팩트 테이블(fact_candidate)로 나누어 저장하고, 조회 시 필요한 차원만 결합
+"""
+
+import os
+import json
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Tuple, Optional, Iterable
+
+from candidate_csv_encoder import CandidateCsvEncoder
+from candidate_partitions import parse_day_numbers
+from candidate_zone_maps import CandidateCsvFile
+from output_compression import normalize_compression, output_path, pandas_compression
+
+STAR_INDEX_FILE = "star_index.json"
+
+# 노선 단위로 정해지는 컬럼
+ROUTE_DIM_COLUMNS = ["出発国家", "出発空港", "到着国家", "到着空港", "飛行時間", "推奨最大運航数"]
+
+# 운항규모 단위로 정해지는 컬럼
+SCALE_DIM_COLUMNS = [
+    "運航規模", "座席数", "運航可能な最小収益(円)", "必要機長数", "必要副操縦士数",
+    "飛行前必要時間", "飛行後必要時間"
+]
+
+# 팩트 테이블 컬럼 (행마다 달라지는 값 + 차원 ID)
+FACT_COLUMNS = [
+    "route_id", "day", "slot", "価格(円)", "需要(名)", "収益(円)",
+    "scale_id", "その他必要人員指数", "優先順位指数"
+]
+
+STAR_FILES = {
+    "route_dim": "route_dim.csv",
+    "scale_dim": "scale_dim.csv",
+    "slot_dim": "slot_dim.csv",
+    "fact": "fact_candidate.csv"
+}
+
+
+class StarSchemaCandidateWriter:
+    """노선 청크를 차원 테이블 + 팩트 테이블로 분해하여 기록"""
+
+    def __init__(self, candidate_dir: str, candidate_columns: List[str], departure_times: List[str],
+                 compression: Optional[str] = None, month: Optional[int] = None,
+                 zone_map_rows: Optional[int] = None):
+        self.candidate_dir = candidate_dir
+        self.candidate_columns = list(candidate_columns)
+        self.departure_times = list(departure_times)
+        self.compression = normalize_compression(compression)
+        self.month = month
+        self.zone_map_rows = zone_map_rows
+        self.encoder = CandidateCsvEncoder(FACT_COLUMNS)
+
+        self._slot_ids = {t: i for i, t in enumerate(self.departure_times)}
+        self._route_ids: Dict[tuple, int] = {}
+        self._route_rows: List[Dict] = []
+        self._scale_ids: Dict[tuple, int] = {}
+        self._fact_file: Optional[CandidateCsvFile] = None
+        self._fact_rows = 0
+        self._max_day = 0
+
+    def path(self, name: str) -> str:
+        """스타 스키마 파일 경로 (압축 시 확장자 추가)"""
+        return output_path(os.path.join(self.candidate_dir, STAR_FILES[name]), self.compression)
+
+    def _assign_ids(self, frame: pd.DataFrame, table: Dict[tuple, int]) -> np.ndarray:
+        """컬럼 조합별 ID 부여 (처음 나온 순서대로 0, 1, 2, ...)"""
+        codes, uniques = pd.MultiIndex.from_frame(frame).factorize()
+        global_ids = np.empty(len(uniques), dtype=np.int64)
+        for i, key in enumerate(uniques):
+            key = tuple(v.item() if isinstance(v, np.generic) else v for v in key)
+            global_ids[i] = table.setdefault(key, len(table))
+        return global_ids[codes]
+
+    def write_chunk(self, segment_key: str, chunk: pd.DataFrame):
+        """청크를 차원 ID로 치환하여 팩트 테이블에 추가 기록"""
+        if chunk.empty:
+            return
+
+        # 새로 나온 노선은 노선 차원에 추가 (route_id == _route_rows 인덱스)
+        known_routes = len(self._route_ids)
+        route_ids = self._assign_ids(chunk[ROUTE_DIM_COLUMNS], self._route_ids)
+        for key, route_id in list(self._route_ids.items())[known_routes:]:
+            row = {"route_id": route_id, "segment": segment_key}
+            row.update(zip(ROUTE_DIM_COLUMNS, key))
+            row["rows"] = 0
+            self._route_rows.append(row)
+        for route_id, rows in pd.Series(route_ids).value_counts().items():
+            self._route_rows[route_id]["rows"] += int(rows)
+
+        scale_ids = self._assign_ids(chunk[SCALE_DIM_COLUMNS], self._scale_ids)
+        days = parse_day_numbers(chunk["日付"])
+        slots = chunk["出発時刻"].map(self._slot_ids).to_numpy()
+        if np.isnan(slots.astype(np.float64)).any():
+            raise ValueError("출발시각 템플릿에 없는 出発時刻가 포함되어 있습니다")
+
+        fact = pd.DataFrame({
+            "route_id": route_ids,
+            "day": days,
+            "slot": slots.astype(np.int64),
+            "価格(円)": chunk["価格(円)"].to_numpy(),
+            "需要(名)": chunk["需要(名)"].to_numpy(),
+            "収益(円)": chunk["収益(円)"].to_numpy(),
+            "scale_id": scale_ids,
+            "その他必要人員指数": chunk["その他必要人員指数"].to_numpy(),
+            "優先順位指数": chunk["優先順位指数"].to_numpy()
+        }, columns=FACT_COLUMNS)
+
+        if self._fact_file is None:
+            os.makedirs(self.candidate_dir, exist_ok=True)
+            self._fact_file = CandidateCsvFile(
+                self.path("fact"), self.encoder.encode_header(), FACT_COLUMNS,
+                self.compression, self.zone_map_rows
+            )
+        self._fact_file.write_rows(self.encoder.encode_lines(fact), fact)
+        self._fact_rows += len(fact)
+        self._max_day = max(self._max_day, int(days.max()))
+
+    def close(self) -> Dict:
+        """팩트 테이블을 닫고 차원 테이블 + star_index.json 기록, 인덱스 반환"""
+        os.makedirs(self.candidate_dir, exist_ok=True)
+        if self._fact_file is None:
+            pd.DataFrame(columns=FACT_COLUMNS).to_csv(
+                self.path("fact"), index=False, encoding='utf-8-sig', compression=pandas_compression(self.compression)
+            )
+        else:
+            self._fact_file.close()
+            self._fact_file = None
+
+        dimensions = {
+            "route_dim": pd.DataFrame(self._route_rows, columns=["route_id", "segment"] + ROUTE_DIM_COLUMNS + ["rows"]),
+            "scale_dim": pd.DataFrame(
+                [[scale_id] + list(key) for key, scale_id in self._scale_ids.items()],
+                columns=["scale_id"] + SCALE_DIM_COLUMNS
+            ),
+            "slot_dim": pd.DataFrame({"slot": range(len(self.departure_times)), "出発時刻": self.departure_times})
+        }
+        for name, df in dimensions.items():
+            df.to_csv(self.path(name), index=False, encoding='utf-8-sig',
+                      compression=pandas_compression(self.compression))
+
+        index = {
+            "layout": "star",
+            "month": self.month,
+            "max_day": self._max_day or None,
+            "compression": self.compression,
+            "zone_maps": self.zone_map_rows is not None,
+            "candidate_columns": self.candidate_columns,
+            "fact_rows": self._fact_rows,
+            "files": {name: os.path.basename(self.path(name)) for name in STAR_FILES},
+            "sizes": {name: os.path.getsize(self.path(name)) for name in STAR_FILES}
+        }
+        with open(os.path.join(self.candidate_dir, STAR_INDEX_FILE), 'w', encoding='utf-8') as f:
+            json.dump(index, f, ensure_ascii=False, indent=2)
+        return index
+
+
+def load_star_index(candidate_dir: str) -> Optional[Dict]:
+    """star_index.json 로드 (스타 스키마 레이아웃이 아니면 None)"""
+    index_path = os.path.join(candidate_dir, STAR_INDEX_FILE)
+    if not os.path.exists(index_path):
+        return None
+    with open(index_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def read_star_table(candidate_dir: str, name: str, index: Optional[Dict] = None,
+                    usecols: Optional[List[str]] = None) -> pd.DataFrame:
+    """스타 스키마 테이블 하나 읽기 (route_dim / scale_dim / slot_dim / fact)"""
+    index = index or load_star_index(candidate_dir)
+    if index is None:
+        raise FileNotFoundError(f"스타 스키마 인덱스가 없습니다: {os.path.join(candidate_dir, STAR_INDEX_FILE)}")
+    return pd.read_csv(os.path.join(candidate_dir, index["files"][name]), usecols=usecols)
+
+
+def star_route_frame(index: Dict, candidate_dir: str, segment_key: str) -> pd.DataFrame:
+    """노선 차원에서 데이터셋별 노선 목록 반환 (팩트 테이블을 읽지 않음)"""
+    routes = read_star_table(candidate_dir, "route_dim", index)
+    return routes[routes["segment"] == segment_key][["出発空港", "到着空港", "出発国家", "到着国家"]].reset_index(drop=True)
+
+
+def read_candidate_star(candidate_dir: str, columns: Optional[Iterable[str]] = None,
+                        types: Optional[Iterable[str]] = None,
+                        routes: Optional[Iterable[Tuple[str, str]]] = None) -> pd.DataFrame:
+    """팩트 테이블에 필요한 차원만 결합하여 운항후보 형식 DataFrame으로 반환
+
+    columns를 지정하면 해당 컬럼을 만드는 데 필요한 팩트 컬럼・차원만 읽는다.
+    types(데이터셋) / routes((出発空港, 到着空港) 목록)는 노선 차원으로 먼저 걸러낸다.
+    """
+    index = load_star_index(candidate_dir)
+    if index is None:
+        raise FileNotFoundError(f"스타 스키마 인덱스가 없습니다: {os.path.join(candidate_dir, STAR_INDEX_FILE)}")
+    columns = list(columns) if columns is not None else list(index["candidate_columns"])
+
+    need_route = types is not None or routes is not None or any(c in ROUTE_DIM_COLUMNS for c in columns)
+    need_scale = any(c in SCALE_DIM_COLUMNS for c in columns)
+    fact_columns = [c for c in FACT_COLUMNS if c in columns]
+    fact_columns += [c for c, needed in [
+        ("route_id", need_route), ("scale_id", need_scale),
+        ("day", "日付" in columns), ("slot", "出発時刻" in columns)
+    ] if needed and c not in fact_columns]
+
+    fact = read_star_table(candidate_dir, "fact", index, usecols=fact_columns)
+    fact = fact[[c for c in FACT_COLUMNS if c in fact_columns]]
+
+    if need_route:
+        route_dim = read_star_table(candidate_dir, "route_dim", index)
+        if types is not None:
+            route_dim = route_dim[route_dim["segment"].isin(list(types))]
+        if routes is not None:
+            wanted = pd.MultiIndex.from_tuples([tuple(r) for r in routes])
+            route_dim = route_dim[pd.MultiIndex.from_frame(route_dim[["出発空港", "到着空港"]]).isin(wanted)]
+        fact = fact[fact["route_id"].isin(route_dim["route_id"])]
+        route_values = route_dim.set_index("route_id")
+        for c in ROUTE_DIM_COLUMNS:
+            if c in columns:
+                fact[c] = fact["route_id"].map(route_values[c]).to_numpy()
+
+    if need_scale:
+        scale_values = read_star_table(candidate_dir, "scale_dim", index).set_index("scale_id")
+        for c in SCALE_DIM_COLUMNS:
+            if c in columns:
+                fact[c] = fact["scale_id"].map(scale_values[c]).to_numpy()
+
+    if "日付" in columns:
+        fact["日付"] = fact["day"].astype(str) + "日"
+    if "出発時刻" in columns:
+        slot_values = read_star_table(candidate_dir, "slot_dim", index).set_index("slot")["出発時刻"]
+        fact["出発時刻"] = fact["slot"].map(slot_values).to_numpy()
+
+    return fact[columns].reset_index(drop=True)
+
+
+def star_max_day(index: Dict) -> Optional[int]:
+    """인덱스에 기록된 가장 마지막 날짜"""
+    return index.get("max_day")
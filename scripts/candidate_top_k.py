@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+운항후보 상위 k건 유지 (노선×날짜 또는 노선×월 단위 bounded heap)
+생성 중인 후보를 순서대로 흘려보내며 그룹별로 점수 상위 k건만 남기고,
+버려지는 행까지 포함한 전체 모집단 통계는 따로 집계한다.
+"""
+
+import os
+import json
+import heapq
+import numpy as np
+from typing import Dict, List, Optional
+
+# 순위 기준 (CLI 값 → 컬럼명)
+RANK_COLUMNS = {
+    "priority": "優先順位指数",
+    "revenue": "収益(円)"
+}
+
+TOP_K_SCOPES = ["day", "month"]
+
+POPULATION_STATS_FILE = "population_stats.json"
+
+
+class TopKCandidateSelector:
+    """그룹(노선×날짜 또는 노선 전체)별 점수 상위 k건 선택
+
+    그룹마다 크기 k의 최소 힙을 유지하므로 메모리는 그룹 수 × k로 제한된다.
+    점수가 같으면 먼저 생성된 행(이른 날짜・출발시각)을 남긴다.
+    """
+
+    def __init__(self, k: int, rank_by: str = "優先順位指数", scope: str = "day"):
+        if k < 1:
+            raise ValueError(f"k는 1 이상이어야 합니다: {k}")
+        if scope not in TOP_K_SCOPES:
+            raise ValueError(f"지원하지 않는 범위: {scope} (사용 가능: {', '.join(TOP_K_SCOPES)})")
+        self.k = k
+        self.rank_by = rank_by
+        self.scope = scope
+
+    def select(self, days: np.ndarray, scores: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        """rows(행 번호) 중 그룹별 상위 k건의 행 번호를 생성 순서대로 반환"""
+        heaps: Dict[int, List] = {}
+        groups = days.tolist() if self.scope == "day" else [0] * len(rows)
+        for group, score, row in zip(groups, scores.tolist(), rows.tolist()):
+            heap = heaps.setdefault(group, [])
+            item = (score, -row)  # 동점이면 행 번호가 작은 쪽이 큰 항목
+            if len(heap) < self.k:
+                heapq.heappush(heap, item)
+            elif item > heap[0]:
+                heapq.heapreplace(heap, item)
+
+        selected = [-neg_row for heap in heaps.values() for _, neg_row in heap]
+        return np.array(sorted(selected), dtype=np.int64)
+
+
+class CandidatePopulationStats:
+    """상위 k건 선택 전 전체 후보 모집단 통계 (데이터셋별 + 전체)
+
+    columns는 모집단 통계이고, 출력 행(상위 k건)에 대해서만 계산한 값은 retained_columns에 따로 집계한다
+    (수익 기준 순위에서는 優先順位指数를 남길 행만 계산하므로 모집단 통계가 아님).
+    """
+
+    COLUMNS = ["収益(円)", "需要(名)", "価格(円)", "優先順位指数"]
+
+    # 優先順位指数 통계 범위
+    PRIORITY_SCOPES = ["population", "retained"]
+
+    def __init__(self):
+        self._segments: Dict[str, Dict] = {}
+
+    def _new_entry(self) -> Dict:
+        return {
+            "routes": 0,
+            "candidates": 0,
+            "viable": 0,
+            "retained": 0,
+            "columns": {},
+            "retained_columns": {}
+        }
+
+    def _update_column(self, entry: Dict, column: str, values: np.ndarray, group: str = "columns"):
+        if len(values) == 0:
+            return
+        stats = entry[group].setdefault(column, {"count": 0, "sum": 0.0, "min": None, "max": None})
+        stats["count"] += int(len(values))
+        stats["sum"] += float(values.sum())
+        low, high = float(values.min()), float(values.max())
+        stats["min"] = low if stats["min"] is None else min(stats["min"], low)
+        stats["max"] = high if stats["max"] is None else max(stats["max"], high)
+
+    def update(self, segment_key: str, batch: Dict[str, np.ndarray], retained: int,
+               priorities: Optional[np.ndarray] = None, priority_scope: str = "population"):
+        """노선 하나의 배치 계산 결과 반영
+
+        priorities는 계산된 행의 값만 (없으면 생략). priority_scope가 "retained"이면
+        출력 행에 대해서만 계산한 값이므로 retained_columns에 집계한다.
+        """
+        if priority_scope not in self.PRIORITY_SCOPES:
+            raise ValueError(f"지원하지 않는 범위: {priority_scope} (사용 가능: {', '.join(self.PRIORITY_SCOPES)})")
+        entry = self._segments.setdefault(segment_key, self._new_entry())
+        entry["routes"] += 1
+        entry["candidates"] += int(len(batch["revenue"]))
+        entry["viable"] += int(batch["viable"].sum())
+        entry["retained"] += int(retained)
+        self._update_column(entry, "収益(円)", batch["revenue"])
+        self._update_column(entry, "需要(名)", batch["demand"])
+        self._update_column(entry, "価格(円)", batch["price"])
+        if priorities is not None:
+            group = "retained_columns" if priority_scope == "retained" else "columns"
+            self._update_column(entry, "優先順位指数", priorities, group)
+
+    def summary(self) -> Dict:
+        """데이터셋별 + 전체(total) 통계 (평균 포함)"""
+        total = self._new_entry()
+        for entry in self._segments.values():
+            for key in ["routes", "candidates", "viable", "retained"]:
+                total[key] += entry[key]
+            for group in ["columns", "retained_columns"]:
+                for column, stats in entry[group].items():
+                    merged = total[group].setdefault(column, {"count": 0, "sum": 0.0, "min": None, "max": None})
+                    merged["count"] += stats["count"]
+                    merged["sum"] += stats["sum"]
+                    merged["min"] = stats["min"] if merged["min"] is None else min(merged["min"], stats["min"])
+                    merged["max"] = stats["max"] if merged["max"] is None else max(merged["max"], stats["max"])
+
+        result = {}
+        for segment_key, entry in list(self._segments.items()) + [("total", total)]:
+            result[segment_key] = {
+                "routes": entry["routes"],
+                "candidates": entry["candidates"],
+                "viable": entry["viable"],
+                "retained": entry["retained"],
+                "columns": self._summarize(entry["columns"])
+            }
+            if entry["retained_columns"]:
+                result[segment_key]["retained_columns"] = self._summarize(entry["retained_columns"])
+        return result
+
+    def _summarize(self, group: Dict[str, Dict]) -> Dict[str, Dict]:
+        """컬럼별 count / mean / min / max"""
+        return {
+            column: {
+                "count": group[column]["count"],
+                "mean": group[column]["sum"] / group[column]["count"],
+                "min": group[column]["min"],
+                "max": group[column]["max"]
+            }
+            for column in self.COLUMNS if column in group
+        }
+
+    def save(self, candidate_dir: str, settings: Dict) -> str:
+        """population_stats.json 기록, 경로 반환"""
+        os.makedirs(candidate_dir, exist_ok=True)
+        path = os.path.join(candidate_dir, POPULATION_STATS_FILE)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"settings": settings, "segments": self.summary()}, f, ensure_ascii=False, indent=2)
+        return path
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+운항후보 CSV zone map (청크별 min/max 통계) 기록 및 조건 푸시다운 조회
+<파일>.zonemap.json sidecar에 청크별 (오프셋, 길이, 행 수, 통계)를 기록하고,
+조회 시 통계상 조건을 만족할 수 없는 청크는 읽지 않는다.
+"""
+
+import io
+import os
+import json
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Optional, Tuple, Iterable, NamedTuple
+
+from candidate_route_day_index import RouteDayIndexBuilder
+from output_compression import CsvOutputFile, decompress_bytes
+
+ZONE_MAP_SUFFIX = ".zonemap.json"
+
+# 통계를 기록하는 컬럼 (運航可能な最小収益은 収益과의 컬럼 간 비교용)
+ZONE_MAP_COLUMNS = ["収益(円)", "優先順位指数", "需要(名)", "出発時刻", "飛行時間", "運航可能な最小収益(円)"]
+
+DEFAULT_ZONE_MAP_ROWS = 2048
+
+# 지원 비교 연산자
+OPERATORS = {
+    ">": np.greater,
+    ">=": np.greater_equal,
+    "<": np.less,
+    "<=": np.less_equal,
+    "==": np.equal
+}
+
+
+class ColumnRef(NamedTuple):
+    """조건식 우변에 다른 컬럼을 지정할 때 사용 (예: ("収益(円)", ">=", ColumnRef("運航可能な最小収益(円)")))"""
+    name: str
+
+
+def zone_map_path(data_path: str) -> str:
+    """데이터 파일의 zone map sidecar 경로"""
+    return data_path + ZONE_MAP_SUFFIX
+
+
+def _to_python(value):
+    """JSON 기록용 스칼라 변환"""
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, np.floating):
+        return float(value)
+    return value
+
+
+class CandidateCsvFile:
+    """운항후보 CSV 출력 파일 (zone_map_rows 지정 시 청크별 통계, route_day_index=True면 노선×날짜 인덱스 sidecar도 기록)
+
+    stream_bytes는 CsvOutputFile에 그대로 전달 (압축 본문을 모아 독립 스트림으로 기록)
+    """
+
+    def __init__(self, path: str, header: bytes, columns: List[str],
+                 compression: Optional[str] = None, zone_map_rows: Optional[int] = None,
+                 route_day_index: bool = False, stream_bytes: Optional[int] = None):
+        self.path = path
+        self.columns = list(columns)
+        self.zone_map_rows = zone_map_rows or None
+        self._file = CsvOutputFile(
+            path, header, compression, block_streams=self.zone_map_rows is not None, stream_bytes=stream_bytes
+        )
+        self._stat_columns = [c for c in ZONE_MAP_COLUMNS if c in self.columns]
+        self._pending_lines: List[bytes] = []
+        self._pending_stats: List[Dict[str, np.ndarray]] = []
+        self._chunks: List[Dict] = []
+        self._route_day = None
+        if route_day_index:
+            self._route_day = RouteDayIndexBuilder(len(header) if self._file.compression is None else None)
+
+    def write_rows(self, lines: List[bytes], frame: pd.DataFrame):
+        """인코딩된 행(줄바꿈 제외)과 원본 DataFrame을 받아 기록"""
+        if not lines:
+            return
+        if self._route_day is not None:
+            self._route_day.add(lines, frame)
+        if self.zone_map_rows is None:
+            self._file.write(b'\n'.join(lines) + b'\n')
+            return
+
+        self._pending_lines.extend(lines)
+        self._pending_stats.append({c: frame[c].to_numpy() for c in self._stat_columns})
+        while len(self._pending_lines) >= self.zone_map_rows:
+            self._flush(self.zone_map_rows)
+
+    def _flush(self, rows: int):
+        """대기 중인 앞쪽 rows행을 독립 블록으로 기록하고 통계 저장"""
+        lines = self._pending_lines[:rows]
+        self._pending_lines = self._pending_lines[rows:]
+
+        merged = {c: np.concatenate([s[c] for s in self._pending_stats]) for c in self._stat_columns}
+        self._pending_stats = [{c: values[rows:] for c, values in merged.items()}] if self._pending_lines else []
+
+        offset, length = self._file.write_block(b'\n'.join(lines) + b'\n')
+        stats = {}
+        for c, values in merged.items():
+            block = values[:rows]
+            stats[c] = [_to_python(block.min()), _to_python(block.max())]
+        self._chunks.append({"offset": offset, "length": length, "rows": rows, "stats": stats})
+
+    def close(self):
+        if self.zone_map_rows is not None and self._pending_lines:
+            self._flush(len(self._pending_lines))
+        self._file.close()
+        if self.zone_map_rows is not None:
+            write_zone_map(self.path, self.columns, self._file.compression, self._chunks)
+        if self._route_day is not None:
+            self._route_day.write(self.path, self.columns)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_zone_map(data_path: str, columns: List[str], compression: Optional[str], chunks: List[Dict]):
+    """zone map sidecar 기록"""
+    zone_map = {
+        "file": os.path.basename(data_path),
+        "compression": compression,
+        "columns": list(columns),
+        "stat_columns": [c for c in ZONE_MAP_COLUMNS if c in columns],
+        "chunks": chunks
+    }
+    with open(zone_map_path(data_path), 'w', encoding='utf-8') as f:
+        json.dump(zone_map, f, ensure_ascii=False)
+
+
+def load_zone_map(data_path: str) -> Optional[Dict]:
+    """zone map sidecar 로드 (없으면 None)"""
+    path = zone_map_path(data_path)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def merge_zone_maps(parts: List[Tuple[str, int]], header_length: int, consolidated_path: str) -> bool:
+    """바이트 연결로 만든 통합 파일의 zone map 생성 (각 파일 본문 오프셋만 이동)
+
+    parts는 (데이터 파일 경로, 본문 시작 오프셋) 목록이며 통합 파일에 연결된 순서와 같아야 한다.
+    """
+    zone_maps = [load_zone_map(path) for path, _ in parts]
+    if not zone_maps or any(z is None for z in zone_maps):
+        return False
+
+    chunks = []
+    position = header_length
+    for (path, body_offset), zone_map in zip(parts, zone_maps):
+        for chunk in zone_map["chunks"]:
+            merged = dict(chunk)
+            merged["offset"] = position + (chunk["offset"] - body_offset)
+            chunks.append(merged)
+        position += os.path.getsize(path) - body_offset
+
+    write_zone_map(consolidated_path, zone_maps[0]["columns"], zone_maps[0]["compression"], chunks)
+    return True
+
+
+def _bound(stats: Dict, column: str, side: int):
+    """통계 [min, max] 중 side(0=min, 1=max) 값, 통계가 없으면 None"""
+    if column not in stats:
+        return None
+    return stats[column][side]
+
+
+def chunk_may_match(stats: Dict[str, List], predicates: Iterable[Tuple[str, str, Any]]) -> bool:
+    """청크 통계로 판단했을 때 조건(AND)을 만족하는 행이 있을 수 있으면 True"""
+    for column, op, value in predicates:
+        low, high = _bound(stats, column, 0), _bound(stats, column, 1)
+        if low is None:
+            continue
+
+        if isinstance(value, ColumnRef):
+            other_low, other_high = _bound(stats, value.name, 0), _bound(stats, value.name, 1)
+            if other_low is None:
+                continue
+        else:
+            other_low = other_high = value
+
+        if op == ">" and not high > other_low:
+            return False
+        if op == ">=" and not high >= other_low:
+            return False
+        if op == "<" and not low < other_high:
+            return False
+        if op == "<=" and not low <= other_high:
+            return False
+        if op == "==" and (high < other_low or low > other_high):
+            return False
+    return True
+
+
+def evaluate_predicates(df: pd.DataFrame, predicates: Iterable[Tuple[str, str, Any]]) -> np.ndarray:
+    """조건(AND)을 행 단위로 평가한 불리언 마스크"""
+    mask = np.ones(len(df), dtype=bool)
+    for column, op, value in predicates:
+        if op not in OPERATORS:
+            raise ValueError(f"지원하지 않는 연산자: {op} (사용 가능: {', '.join(OPERATORS)})")
+        right = df[value.name].to_numpy() if isinstance(value, ColumnRef) else value
+        mask &= OPERATORS[op](df[column].to_numpy(), right)
+    return mask
+
+
+def plan_zone_map_scan(zone_map: Dict, predicates: Iterable[Tuple[str, str, Any]]) -> List[Dict]:
+    """읽어야 하는 청크 목록 (통계상 제외 가능한 청크는 빠짐)"""
+    predicates = list(predicates)
+    return [chunk for chunk in zone_map["chunks"] if chunk_may_match(chunk["stats"], predicates)]
+
+
+def read_zone_map_chunk(data_path: str, zone_map: Dict, chunk: Dict) -> pd.DataFrame:
+    """청크 하나만 읽어서 DataFrame으로 변환"""
+    with open(data_path, 'rb') as f:
+        f.seek(chunk["offset"])
+        raw = f.read(chunk["length"])
+    data = decompress_bytes(raw, zone_map["compression"])
+    return pd.read_csv(io.BytesIO(data), header=None, names=zone_map["columns"])
+
+
+def scan_candidates(data_path: str, predicates: Iterable[Tuple[str, str, Any]],
+                    stats: Optional[Dict[str, int]] = None) -> pd.DataFrame:
+    """조건을 만족하는 운항후보 행 조회 (zone map이 있으면 청크 건너뛰기)
+
+    stats에 dict를 넘기면 chunks_total / chunks_read / rows_read를 누적 기록한다.
+    """
+    predicates = list(predicates)
+    zone_map = load_zone_map(data_path)
+
+    if zone_map is None:
+        df = pd.read_csv(data_path)
+        frames = [df]
+        chunk_counts = (1, 1)
+    else:
+        chunks = plan_zone_map_scan(zone_map, predicates)
+        frames = [read_zone_map_chunk(data_path, zone_map, chunk) for chunk in chunks]
+        chunk_counts = (len(zone_map["chunks"]), len(chunks))
+
+    if stats is not None:
+        stats["chunks_total"] = stats.get("chunks_total", 0) + chunk_counts[0]
+        stats["chunks_read"] = stats.get("chunks_read", 0) + chunk_counts[1]
+        stats["rows_read"] = stats.get("rows_read", 0) + sum(len(f) for f in frames)
+
+    frames = [f[evaluate_predicates(f, predicates)] for f in frames]
+    frames = [f for f in frames if not f.empty]
+    if not frames:
+        columns = zone_map["columns"] if zone_map is not None else None
+        return pd.DataFrame(columns=columns)
+    return pd.concat(frames, ignore_index=True)
+
+
+def scan_candidate_partitions(candidate_dir: str, predicates: Iterable[Tuple[str, str, Any]],
+                              types: Optional[Iterable[str]] = None,
+                              day_range: Optional[Tuple[int, int]] = None,
+                              stats: Optional[Dict[str, int]] = None) -> pd.DataFrame:
+    """파티션 레이아웃에서 파티션 선택 + zone map 청크 건너뛰기를 함께 적용"""
+    from candidate_partitions import load_partition_index, select_partitions
+
+    predicates = list(predicates)
+    index = load_partition_index(candidate_dir)
+    if index is None:
+        raise FileNotFoundError(f"파티션 인덱스가 없습니다: {candidate_dir}")
+
+    frames = []
+    for partition in select_partitions(index, types=types, day_range=day_range):
+        df = scan_candidates(os.path.join(candidate_dir, partition["path"]), predicates, stats=stats)
+        if not df.empty:
+            frames.append(df)
+    if not frames:
+        return pd.DataFrame(columns=index["columns"])
+    return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Excel(.xlsx) 스트리밍 입출력
+openpyxl의 write-only / read-only 모드로 행을 청크 단위로 흘려 쓰고 읽어서,
+한 달 분량의 운항후보 시트도 워크북 전체를 메모리에 만들지 않고 내보내거나 읽어 들인다.
+
+시트 하나의 최대 행 수(1,048,576)를 넘는 데이터는 <시트명>_2, <시트명>_3 … 이어지는 시트로 나누어 쓰고,
+읽을 때는 이어지는 시트까지 하나의 표로 합친다.
+"""
+
+import os
+import re
+import zipfile
+import pandas as pd
+import xml.etree.ElementTree as ET
+from typing import Dict, Iterator, List, Optional
+
+from openpyxl import Workbook, load_workbook
+
+from output_compression import resolve_input_path
+
+# Excel 시트 하나에 쓸 수 있는 데이터 행 수 (헤더 1행 제외)
+EXCEL_MAX_DATA_ROWS = 1048575
+
+# 읽기/쓰기 청크 행 수
+DEFAULT_EXCEL_CHUNK_ROWS = 50000
+
+# 산출물별 시트명 (기존 Excel 산출물과 같은 이름)
+EXCEL_SHEET_NAMES = {
+    "airport_schedule_data": "連携空港運航日程",
+    "monthly_minimum_operations_standard": "運航最小配分基準"
+}
+
+# 운항후보 데이터셋별 시트명
+CANDIDATE_EXCEL_SHEETS = {
+    "international_departure": "国際線出発",
+    "international_arrival": "国際線到着",
+    "domestic": "国内線"
+}
+
+CANDIDATE_EXCEL_FILE = "candidate_data.xlsx"
+
+
+class ExcelStreamWriter:
+    """write-only 워크북에 시트별로 DataFrame 청크를 이어 쓰는 Excel 출력 파일"""
+
+    def __init__(self, path: str, max_rows: int = EXCEL_MAX_DATA_ROWS):
+        self.path = path
+        self.max_rows = max_rows
+        self._workbook = Workbook(write_only=True)
+        self._sheet = None
+        self._title = None
+        self._columns: List[str] = []
+        self._part = 0
+        self._rows = 0
+        self.rows_written: Dict[str, int] = {}
+
+    def add_sheet(self, title: str, columns: List[str]):
+        """새 시트 시작 (이후 write_chunk는 이 시트에 기록)"""
+        self._title = title
+        self._columns = list(columns)
+        self._part = 0
+        self.rows_written[title] = 0
+        self._open_part()
+
+    def _open_part(self):
+        self._part += 1
+        title = self._title if self._part == 1 else f"{self._title}_{self._part}"
+        self._sheet = self._workbook.create_sheet(title=title)
+        self._sheet.append(self._columns)
+        self._rows = 0
+
+    def write_chunk(self, df: pd.DataFrame):
+        """현재 시트에 DataFrame 행 추가 (시트가 가득 차면 이어지는 시트로 넘어감)"""
+        if self._sheet is None:
+            raise ValueError("write_chunk() 전에 add_sheet()를 호출해야 합니다")
+        df = df[self._columns]
+        if df.isna().to_numpy().any():
+            df = df.astype(object).where(df.notna(), None)  # NaN은 빈 셀로
+        rows = df.to_numpy(dtype=object).tolist()
+
+        start = 0
+        while start < len(rows):
+            if self._rows >= self.max_rows:
+                self._open_part()
+            end = min(len(rows), start + self.max_rows - self._rows)
+            append = self._sheet.append
+            for row in rows[start:end]:
+                append(row)
+            self._rows += end - start
+            start = end
+        self.rows_written[self._title] += len(rows)
+
+    def close(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._workbook.save(self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if exc[0] is None:
+            self.close()
+
+
+def write_excel_frames(path: str, sheets: Dict[str, pd.DataFrame], chunk_rows: int = DEFAULT_EXCEL_CHUNK_ROWS) -> str:
+    """{시트명: DataFrame}을 청크 단위로 Excel 파일에 기록"""
+    with ExcelStreamWriter(path) as writer:
+        for title, df in sheets.items():
+            writer.add_sheet(title, list(df.columns))
+            for start in range(0, len(df), chunk_rows):
+                writer.write_chunk(df.iloc[start:start + chunk_rows])
+    return path
+
+
+def export_csv_to_excel(path: str, sheets: Dict[str, str], chunk_rows: int = DEFAULT_EXCEL_CHUNK_ROWS) -> Dict[str, int]:
+    """{시트명: CSV 경로(압축 포함)}를 CSV 청크 단위로 읽어 Excel 파일에 기록, 시트별 행 수 반환"""
+    with ExcelStreamWriter(path) as writer:
+        for title, csv_path in sheets.items():
+            resolved = resolve_input_path(csv_path)
+            if resolved is None:
+                continue
+            reader = pd.read_csv(resolved, chunksize=chunk_rows)
+            first = True
+            for chunk in reader:
+                if first:
+                    writer.add_sheet(title, list(chunk.columns))
+                    first = False
+                writer.write_chunk(chunk)
+            if first:
+                # 헤더만 있는 CSV도 빈 시트로 남긴다
+                writer.add_sheet(title, list(pd.read_csv(resolved, nrows=0).columns))
+        return dict(writer.rows_written)
+
+
+def excel_sheet_parts(sheet_names: List[str], title: str) -> List[str]:
+    """title 시트와 이어지는 시트(title_2, title_3 …)를 순서대로 반환"""
+    pattern = re.compile(rf"^{re.escape(title)}_(\d+)$")
+    parts = [(1, title)] if title in sheet_names else []
+    parts += [(int(m.group(1)), name) for name in sheet_names for m in [pattern.match(name)] if m]
+    return [name for _, name in sorted(parts)]
+
+
+def iter_excel_chunks(path: str, sheet: Optional[str] = None,
+                      chunk_rows: int = DEFAULT_EXCEL_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """read-only 모드로 시트(이어지는 시트 포함, 생략 시 첫 시트)를 chunk_rows 행씩 DataFrame으로 읽기"""
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        title = sheet or workbook.sheetnames[0]
+        parts = excel_sheet_parts(workbook.sheetnames, title)
+        if not parts:
+            raise KeyError(f"시트가 없습니다: {title} ({path})")
+
+        columns = None
+        for name in parts:
+            rows = workbook[name].iter_rows(values_only=True)
+            header = next(rows, None)
+            if header is None:
+                continue
+            columns = columns or list(header)
+            buffer = []
+            for row in rows:
+                buffer.append(row)
+                if len(buffer) >= chunk_rows:
+                    yield pd.DataFrame(buffer, columns=columns)
+                    buffer = []
+            if buffer:
+                yield pd.DataFrame(buffer, columns=columns)
+    finally:
+        workbook.close()
+
+
+def read_excel_table(path: str, sheet: Optional[str] = None,
+                     chunk_rows: int = DEFAULT_EXCEL_CHUNK_ROWS) -> pd.DataFrame:
+    """시트 전체를 DataFrame으로 읽기 (읽기는 청크 단위, 결과만 하나로 합침)"""
+    chunks = list(iter_excel_chunks(path, sheet, chunk_rows))
+    if not chunks:
+        return pd.DataFrame()
+    return pd.concat(chunks, ignore_index=True)
+
+
+def workbook_sheet_names(path: str) -> List[str]:
+    """시트 이름 목록 (xl/workbook.xml만 읽으므로 큰 워크북도 즉시 반환)"""
+    with zipfile.ZipFile(path) as archive:
+        root = ET.fromstring(archive.read("xl/workbook.xml"))
+    return [element.get("name") for element in root.iter() if element.tag.endswith("}sheet")]
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+최대유량 계산기 (Dinic)
+간선 배열을 NumPy CSR 인접 구조로 보관하고, 레벨 그래프 BFS는 배열 연산으로,
+blocking flow는 현재 간선(current arc) 포인터를 쓰는 반복 DFS로 계산한다.
+외부 솔버 없이 노선 × 날짜 × 시간대 규모(수십만 간선)의 네트워크를 수 초 안에 푼다.
+"""
+
+import numpy as np
+from typing import List, Optional
+
+
+class FlowNetwork:
+    """정수 용량 유향 그래프의 최대유량 / 최소 컷
+
+    간선 e의 역방향 간선은 e ^ 1 (정방향 = 짝수, 역방향 = 홀수)이다.
+    """
+
+    def __init__(self, node_count: int):
+        self.node_count = node_count
+        self._tails: List[np.ndarray] = []
+        self._heads: List[np.ndarray] = []
+        self._capacities: List[np.ndarray] = []
+        self._edge_count = 0
+
+        self.head: Optional[np.ndarray] = None      # 간선 → 도착 노드
+        self.residual: Optional[np.ndarray] = None  # 간선 → 잔여 용량
+        self.capacity: Optional[np.ndarray] = None  # 정방향 간선 원래 용량
+        self.adjacency: Optional[np.ndarray] = None  # 노드별로 묶은 간선 ID
+        self.offsets: Optional[np.ndarray] = None    # 노드별 adjacency 시작 위치 (길이 node_count + 1)
+
+    def add_edges(self, tails, heads, capacities) -> np.ndarray:
+        """간선 여러 개 추가, 정방향 간선 ID 배열 반환 (max_flow 전에만 호출)"""
+        tails = np.asarray(tails, dtype=np.int64).ravel()
+        heads = np.asarray(heads, dtype=np.int64).ravel()
+        capacities = np.broadcast_to(np.asarray(capacities, dtype=np.int64), tails.shape)
+        if len(tails) and (min(tails.min(), heads.min()) < 0 or max(tails.max(), heads.max()) >= self.node_count):
+            raise ValueError("노드 번호가 네트워크 범위를 벗어났습니다")
+
+        edge_ids = 2 * (self._edge_count + np.arange(len(tails), dtype=np.int64))
+        self._tails.append(tails)
+        self._heads.append(heads)
+        self._capacities.append(capacities.copy())
+        self._edge_count += len(tails)
+        self.head = None
+        return edge_ids
+
+    def build(self):
+        """추가된 간선으로 CSR 인접 구조 생성 (정방향/역방향 간선 교차 배치)"""
+        tails = np.concatenate(self._tails) if self._tails else np.zeros(0, dtype=np.int64)
+        heads = np.concatenate(self._heads) if self._heads else np.zeros(0, dtype=np.int64)
+        capacities = np.concatenate(self._capacities) if self._capacities else np.zeros(0, dtype=np.int64)
+
+        edge_tails = np.empty(2 * len(tails), dtype=np.int64)
+        edge_tails[0::2] = tails
+        edge_tails[1::2] = heads
+        self.head = np.empty(2 * len(tails), dtype=np.int64)
+        self.head[0::2] = heads
+        self.head[1::2] = tails
+        self.residual = np.zeros(2 * len(tails), dtype=np.int64)
+        self.residual[0::2] = capacities
+        self.capacity = capacities
+
+        self.adjacency = np.argsort(edge_tails, kind="stable")
+        self.offsets = np.zeros(self.node_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(edge_tails, minlength=self.node_count), out=self.offsets[1:])
+
+    def _out_edges(self, nodes: np.ndarray) -> np.ndarray:
+        """노드 배열의 나가는 간선 ID 전체 (CSR 구간을 한 번에 펼침)"""
+        begins = self.offsets[nodes]
+        lengths = self.offsets[nodes + 1] - begins
+        total = int(lengths.sum())
+        if total == 0:
+            return np.zeros(0, dtype=np.int64)
+        starts = np.repeat(begins - np.cumsum(lengths) + lengths, lengths)
+        return self.adjacency[starts + np.arange(total, dtype=np.int64)]
+
+    def levels(self, source: int, sink: Optional[int] = None) -> np.ndarray:
+        """잔여 그래프에서 source 기준 BFS 레벨 (도달 불가 -1, sink에 도달한 층에서 중단)"""
+        level = np.full(self.node_count, -1, dtype=np.int64)
+        level[source] = 0
+        frontier = np.array([source], dtype=np.int64)
+        depth = 0
+        while len(frontier) and (sink is None or level[sink] < 0):
+            edges = self._out_edges(frontier)
+            edges = edges[self.residual[edges] > 0]
+            targets = self.head[edges]
+            targets = np.unique(targets[level[targets] < 0])
+            depth += 1
+            level[targets] = depth
+            frontier = targets
+        return level
+
+    def _blocking_flow(self, source: int, sink: int, level: List[int], residual: List[int],
+                       head: List[int], adjacency: List[int], offsets: List[int]) -> int:
+        """레벨 그래프의 blocking flow (잔여 용량 리스트를 직접 갱신)"""
+        current = offsets[:-1]
+        total = 0
+        while True:
+            path: List[int] = []
+            node = source
+            while node != sink:
+                end = offsets[node + 1]
+                position = current[node]
+                next_level = level[node] + 1
+                while position < end:
+                    edge = adjacency[position]
+                    if residual[edge] > 0 and level[head[edge]] == next_level:
+                        break
+                    position += 1
+                current[node] = position
+                if position < end:
+                    path.append(edge)
+                    node = head[edge]
+                    continue
+                # 막다른 노드: 레벨 그래프에서 제거하고 한 단계 후퇴
+                if node == source:
+                    return total
+                level[node] = -1
+                edge = path.pop()
+                node = head[edge ^ 1]
+                current[node] += 1
+
+            pushed = min(residual[edge] for edge in path)
+            for edge in path:
+                residual[edge] -= pushed
+                residual[edge ^ 1] += pushed
+            total += pushed
+
+    def max_flow(self, source: int, sink: int) -> int:
+        """source → sink 최대유량 (잔여 용량은 residual에 남음)"""
+        if self.head is None:
+            self.build()
+        if source == sink:
+            return 0
+
+        head = self.head.tolist()
+        adjacency = self.adjacency.tolist()
+        offsets = self.offsets.tolist()
+        total = 0
+        while True:
+            level = self.levels(source, sink)
+            if level[sink] < 0:
+                return total
+            residual = self.residual.tolist()
+            total += self._blocking_flow(source, sink, level.tolist(), residual, head, adjacency, offsets)
+            self.residual = np.array(residual, dtype=np.int64)
+
+    def flows(self, edge_ids: np.ndarray) -> np.ndarray:
+        """정방향 간선의 현재 유량"""
+        edge_ids = np.asarray(edge_ids, dtype=np.int64)
+        return self.capacity[edge_ids // 2] - self.residual[edge_ids]
+
+    def source_side(self, source: int) -> np.ndarray:
+        """최대유량 후 최소 컷의 source 쪽 노드 마스크 (잔여 그래프에서 도달 가능한 노드)"""
+        return self.levels(source) >= 0
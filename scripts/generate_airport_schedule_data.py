@@ -10,12 +10,28 @@ import sys
 import json
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple
+from typing import Dict, List, Tuple, Optional
+
+from candidate_months import load_flat_index, load_month_index, month_max_day
+from candidate_partitions import load_partition_index, partition_max_day
+from candidate_star_schema import load_star_index, star_max_day
+from artifact_reader import ArtifactReader
+from excel_io import EXCEL_SHEET_NAMES, write_excel_frames
+from output_compression import (
+    COMPRESSION_CHOICES, normalize_compression, output_path, pandas_compression, resolve_input_path
+)
 from datetime import datetime, timedelta
 
+# 피크 시간대 (시작 시각 기준 9-11시, 17-19시)
+PEAK_HOURS = [(9, 11), (17, 19)]
+
 class AirportScheduleDataGenerator:
     def __init__(self):
         self.output_dir = "output"
+        self.compression = None  # 출력 압축 방식 (None/"gzip"/"xz"/"bz2")
+        self.excel = False  # True면 CSV와 같은 내용의 .xlsx도 기록 (write-only 스트리밍)
+        self.artifact_reader = ArtifactReader()
+        self._slot_template = None  # (시간대 라벨, 피크 마스크), build_slot_template 결과 (한 번만 생성)
         
         # 공항 규모별 할당 가능 횟수 설정
         self.airport_capacity = {
@@ -96,18 +112,22 @@ class AirportScheduleDataGenerator:
         
         airports = set()
         
-        # minimum_operations 엑셀 파일 경로
-        minimum_path = os.path.join(
-            self.output_dir, airline_id, 
-            "monthly_minimum_operations_standard.csv"
-        )
+        # minimum_operations 파일 (CSV・압축 CSV・Excel, analytics_data/ 아래 예전 배치 포함)
+        df = self.artifact_reader.read(os.path.join(self.output_dir, airline_id), "minimum_operations")
+        if df is not None:
+            return self.connected_airports_from_frame(airline_id, df)
         
-        if os.path.exists(minimum_path):
-            df = pd.read_csv(minimum_path)
-            
-            # 출발공항과 도착공항 모두 추가
-            airports.update(df['出発空港'].unique())
-            airports.update(df['到着空港'].unique())
+        print(f"✅ {airline_id} 연계공항 추출 완료: {len(airports)}개 공항")
+        return list(airports)
+    
+    def connected_airports_from_frame(self, airline_id: str, minimum_operations: pd.DataFrame) -> List[str]:
+        """월별 최소 운항 기준 DataFrame에서 연계공항 추출 (파일 읽기 없음)"""
+        airports = set()
+        
+        # 출발공항과 도착공항 모두 추가
+        if not minimum_operations.empty:
+            airports.update(minimum_operations['出発空港'].unique())
+            airports.update(minimum_operations['到着空港'].unique())
         
         print(f"✅ {airline_id} 연계공항 추출 완료: {len(airports)}개 공항")
         return list(airports)
@@ -116,26 +136,49 @@ class AirportScheduleDataGenerator:
         """candidate 엑셀에서 해당 월의 일수 확인"""
         print(f"📅 {airline_id} 월별 일수 확인 중...")
         
-        # candidate CSV 파일들 확인
-        candidate_paths = [
-            os.path.join(self.output_dir, airline_id, "analytics_data", "candidate", "international_departure.csv"),
-            os.path.join(self.output_dir, airline_id, "analytics_data", "candidate", "domestic.csv")
-        ]
-        
         max_day = 28  # 기본값
+        candidate_dir = os.path.join(self.output_dir, airline_id, "analytics_data", "candidate")
+        
+        # 레이아웃별 인덱스에 기록된 일수 사용 (데이터 파일을 읽지 않음)
+        index_days = []
+        # flat 레이아웃은 flat_index.json의 일수
+        flat_index = load_flat_index(candidate_dir)
+        if flat_index is not None and flat_index.get("max_days"):
+            index_days.append(int(flat_index["max_days"]))
+        # 파티션 레이아웃은 인덱스의 날짜 파티션으로 확인
+        index = load_partition_index(candidate_dir)
+        if index is not None and partition_max_day(index):
+            index_days.append(partition_max_day(index))
+        # 스타 스키마 레이아웃도 인덱스에 기록된 마지막 날짜 사용
+        star_index = load_star_index(candidate_dir)
+        if star_index is not None and star_max_day(star_index):
+            index_days.append(star_max_day(star_index))
+        # 여러 달 레이아웃은 생성한 달 중 가장 긴 달의 일수 사용
+        month_index = load_month_index(candidate_dir)
+        if month_index is not None and month_max_day(month_index):
+            index_days.append(month_max_day(month_index))
         
-        for path in candidate_paths:
-            if os.path.exists(path):
-                df = pd.read_csv(path)
-                if '日付' in df.columns:
-                    # 마지막 row의 일수 확인
-                    last_date = df['日付'].iloc[-1]
-                    if isinstance(last_date, str) and '日' in last_date:
-                        try:
-                            day = int(last_date.replace('日', ''))
-                            max_day = max(max_day, day)
-                        except:
-                            pass
+        if index_days:
+            max_day = max(max_day, *index_days)
+        else:
+            # 인덱스가 없는 예전 출력만 candidate CSV의 마지막 row 날짜로 확인
+            candidate_paths = [
+                os.path.join(candidate_dir, "international_departure.csv"),
+                os.path.join(candidate_dir, "domestic.csv")
+            ]
+            for path in candidate_paths:
+                path = resolve_input_path(path)
+                if path is not None:
+                    df = pd.read_csv(path)
+                    if '日付' in df.columns:
+                        # 마지막 row의 일수 확인
+                        last_date = df['日付'].iloc[-1]
+                        if isinstance(last_date, str) and '日' in last_date:
+                            try:
+                                day = int(last_date.replace('日', ''))
+                                max_day = max(max_day, day)
+                            except:
+                                pass
         
         print(f"✅ {airline_id} 월별 일수: {max_day}일")
         return max_day
@@ -160,6 +203,70 @@ class AirportScheduleDataGenerator:
         
         return time_slots
     
+    def build_slot_template(self) -> Tuple[List[str], np.ndarray]:
+        """시간대 라벨 목록과 피크 시간대 마스크 (generate_time_slots와 같은 30분 간격, 한 번만 생성)"""
+        if self._slot_template is None:
+            labels = [slot["時間帯"] for slot in self.generate_time_slots()]
+            hours = np.array([int(label.split(":")[0]) for label in labels])
+            peak_mask = np.zeros(len(labels), dtype=bool)
+            for start, end in PEAK_HOURS:
+                peak_mask |= (hours >= start) & (hours <= end)
+            self._slot_template = (labels, peak_mask)
+        return self._slot_template
+    
+    def generate_capacity_cube(self, airports: List[str], month_days: int) -> np.ndarray:
+        """공항 × 날짜 × 시간대 할당 가능 횟수를 한 번에 생성 (shape: 공항수, 일수, 시간대수)
+        
+        공항 → 날짜 → 시간대 순서로 np.random.randint를 호출한 것과 같은 값이 나온다.
+        """
+        labels, peak_mask = self.build_slot_template()
+        capacities = np.array([self.get_airport_capacity(airport) for airport in airports], dtype=np.int64)
+        capacities = capacities.reshape(-1, 2)
+        min_capacity = capacities[:, 0][:, None, None]
+        max_capacity = capacities[:, 1][:, None, None]
+        
+        # 기본 할당 가능 횟수 (공항 규모 기반, 한 번의 호출로 전체 추출)
+        shape = (len(airports), month_days, len(labels))
+        base_capacity = np.random.randint(
+            np.broadcast_to(min_capacity, shape), np.broadcast_to(max_capacity + 1, shape)
+        )
+        
+        # 시간대별 변동 (피크 시간대는 조금 더 높게)
+        return np.where(
+            peak_mask[None, None, :],
+            np.minimum(base_capacity + 1, max_capacity + 2),
+            np.maximum(base_capacity - 1, 1)
+        )
+    
+    def format_time_slots_json(self, capacity_rows: np.ndarray) -> List[str]:
+        """(행수, 시간대수) 할당 가능 횟수를 json.dumps(time_slots, ensure_ascii=False)와 같은 문자열로 변환"""
+        labels, _ = self.build_slot_template()
+        
+        # 시간대 × 할당 가능 횟수별 JSON 조각을 미리 만들어 두고 조회만 수행
+        max_count = int(capacity_rows.max(initial=0))
+        pieces = np.array([
+            [json.dumps({"時間帯": label, "割り当て可能回数": count}, ensure_ascii=False) for count in range(max_count + 1)]
+            for label in labels
+        ], dtype=object).reshape(len(labels), max_count + 1)
+        slot_index = np.arange(len(labels))[None, :]
+        rows = pieces[slot_index, capacity_rows].tolist()
+        return ["[" + joined + "]" for joined in map(", ".join, rows)]
+    
+    def build_schedule_frame(self, airports: List[str], month_days: int) -> pd.DataFrame:
+        """연계공항 × 날짜별 운항일정 DataFrame 생성 (배열 연산 버전)"""
+        cube = self.generate_capacity_cube(airports, month_days)
+        countries = [self.get_country_by_airport(airport) for airport in airports]
+        day_labels = [f"{day}日" for day in range(1, month_days + 1)]
+        
+        return pd.DataFrame({
+            "国": np.repeat(np.array(countries, dtype=object), month_days),
+            "空港": np.repeat(np.array(airports, dtype=object), month_days),
+            "日付": np.tile(np.array(day_labels, dtype=object), len(airports)),
+            "割り当て可能時間帯（割り当て可能回数）": self.format_time_slots_json(
+                cube.reshape(len(airports) * month_days, -1)
+            )
+        }, columns=['国', '空港', '日付', '割り当て可能時間帯（割り当て可能回数）'])
+    
     def get_airport_capacity(self, airport_name: str) -> Tuple[int, int]:
         """공항별 할당 가능 횟수 범위 반환"""
         # 공항명 매칭 (일본어/한국어/영어)
@@ -170,8 +277,12 @@ class AirportScheduleDataGenerator:
         # 기본값 (중형 공항)
         return 5, 8
     
-    def generate_airport_schedule_data(self, airline_id: str) -> pd.DataFrame:
-        """항공사별 연계공항 운항일정 데이터 생성"""
+    def generate_airport_schedule_data(self, airline_id: str, minimum_operations: Optional[pd.DataFrame] = None,
+                                       month_days: Optional[int] = None) -> pd.DataFrame:
+        """항공사별 연계공항 운항일정 데이터 생성
+        
+        같은 프로세스에서 만든 월별 최소 운항 기준 DataFrame과 월 일수를 넘기면 이전 단계 파일을 다시 읽지 않는다.
+        """
         print(f"🚀 {airline_id} 연계공항 운항일정 데이터 생성 시작...")
         
         # 항공사 데이터 로드
@@ -180,52 +291,19 @@ class AirportScheduleDataGenerator:
             return None
         
         # 연계공항 추출
-        connected_airports = self.extract_connected_airports(airline_id)
+        if minimum_operations is not None:
+            connected_airports = self.connected_airports_from_frame(airline_id, minimum_operations)
+        else:
+            connected_airports = self.extract_connected_airports(airline_id)
         
         # 월별 일수 확인
-        month_days = self.get_month_days(airline_id)
-        
-        # 데이터 생성
-        data = []
-        
-        for airport in connected_airports:
-            # 공항별 할당 가능 횟수 범위
-            min_capacity, max_capacity = self.get_airport_capacity(airport)
-            
-            # 공항이 속한 국가 판단
-            country = self.get_country_by_airport(airport)
-            
-            for day in range(1, month_days + 1):
-                # 시간대별 할당 가능 횟수 생성
-                time_slots = self.generate_time_slots()
-                
-                # 각 시간대별로 할당 가능 횟수 설정 (공항 규모에 따라)
-                for time_slot in time_slots:
-                    # 기본 할당 가능 횟수 (공항 규모 기반)
-                    base_capacity = np.random.randint(min_capacity, max_capacity + 1)
-                    
-                    # 시간대별 변동 (피크 시간대는 조금 더 높게)
-                    hour = int(time_slot["時間帯"].split(":")[0])
-                    if 9 <= hour <= 11 or 17 <= hour <= 19:  # 피크 시간대
-                        time_slot["割り当て可能回数"] = min(base_capacity + 1, max_capacity + 2)
-                    else:
-                        time_slot["割り当て可能回数"] = max(base_capacity - 1, 1)
-                
-                # JSON 형태로 변환
-                time_slots_json = json.dumps(time_slots, ensure_ascii=False)
-                
-                row = {
-                    "国": country,
-                    "空港": airport,
-                    "日付": f"{day}日",
-                    "割り当て可能時間帯（割り当て可能回数）": time_slots_json
-                }
-                data.append(row)
+        if month_days is None:
+            month_days = self.get_month_days(airline_id)
+        else:
+            print(f"📅 {airline_id} 월별 일수: {month_days}일 (전달받은 값)")
         
-        # 데이터프레임 생성
-        df = pd.DataFrame(data, columns=[
-            '国', '空港', '日付', '割り当て可能時間帯（割り当て可能回数）'
-        ])
+        # 데이터 생성 (공항 × 날짜 × 시간대 할당 가능 횟수를 한 번에 생성)
+        df = self.build_schedule_frame(connected_airports, month_days)
         
         print(f"✅ {airline_id} 데이터 생성 완료: {len(df)}개 행")
         return df
@@ -254,9 +332,17 @@ class AirportScheduleDataGenerator:
         print(f"💾 {airline_id} 데이터 저장 시작...")
         
         # CSV 파일로 저장
-        output_path = os.path.join(self.output_dir, airline_id, "airport_schedule_data.csv")
-        df.to_csv(output_path, index=False, encoding='utf-8-sig')
-        print(f"✅ {airline_id} 공항 스케줄 데이터 CSV 저장 완료: {output_path}")
+        csv_path = output_path(
+            os.path.join(self.output_dir, airline_id, "airport_schedule_data.csv"),
+            self.compression
+        )
+        df.to_csv(csv_path, index=False, encoding='utf-8-sig', compression=pandas_compression(self.compression))
+        print(f"✅ {airline_id} 공항 스케줄 데이터 CSV 저장 완료: {csv_path}")
+        
+        if self.excel:
+            excel_path = os.path.join(self.output_dir, airline_id, "airport_schedule_data.xlsx")
+            write_excel_frames(excel_path, {EXCEL_SHEET_NAMES["airport_schedule_data"]: df})
+            print(f"✅ {airline_id} 공항 스케줄 데이터 Excel 저장 완료: {excel_path}")
     
     def generate_all_airlines(self):
         """모든 항공사의 연계공항 운항일정 데이터 생성"""
@@ -290,18 +376,21 @@ class AirportScheduleDataGenerator:
 
 def main():
     """메인 함수"""
-    import sys
+    import argparse
     
     generator = AirportScheduleDataGenerator()
     
     # 명령행 인수 확인
-    if len(sys.argv) != 2:
-        print("❌ 사용법: python generate_airport_schedule_data.py <항공사ID>")
-        print("사용 가능한 항공사: airline_01 ~ airline_15")
-        print("예시: python generate_airport_schedule_data.py airline_01")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(usage="python generate_airport_schedule_data.py <항공사ID> [옵션]")
+    parser.add_argument("airline_id", help="항공사 ID (airline_01 ~ airline_15)")
+    parser.add_argument("--compression", choices=COMPRESSION_CHOICES, default="none",
+                        help="출력 CSV 압축 방식 (기본: none)")
+    parser.add_argument("--excel", action="store_true", help="CSV와 함께 .xlsx 파일도 저장")
+    args = parser.parse_args()
+    generator.compression = normalize_compression(args.compression)
+    generator.excel = args.excel
     
-    airline_id = sys.argv[1]
+    airline_id = args.airline_id
     
     # 항공사 ID 유효성 검사
     valid_airlines = [f"airline_{i:02d}" for i in range(1, 16)]
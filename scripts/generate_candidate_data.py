@@ -15,17 +15,51 @@ import sys
 import os
 import shutil
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Tuple, Any, Iterator, Optional
 
 # 프로젝트 루트 경로 추가
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from candidate_csv_encoder import CandidateCsvEncoder, concatenate_candidate_csvs
+from candidate_monte_carlo import (
+    MONTE_CARLO_COLUMNS, DEFAULT_BLOCK_ELEMENTS, MonteCarloCandidateWriter, summarize_samples
+)
+from candidate_months import parse_month_spec, month_partition_dir, write_flat_index, write_month_index
+from candidate_pipeline import PipelinedCandidateWriter
+from candidate_partitions import PartitionedCandidateWriter
+from candidate_star_schema import StarSchemaCandidateWriter
+from candidate_top_k import RANK_COLUMNS, TOP_K_SCOPES, TopKCandidateSelector, CandidatePopulationStats
+from candidate_zone_maps import DEFAULT_ZONE_MAP_ROWS
+from excel_io import CANDIDATE_EXCEL_FILE, CANDIDATE_EXCEL_SHEETS, export_csv_to_excel
+from output_compression import COMPRESSION_CHOICES, normalize_compression, output_path
+
+# 운항후보 CSV 컬럼 (고정 스키마)
+CANDIDATE_COLUMNS = [
+    "日付", "出発国家", "出発空港", "到着国家", "到着空港", "出発時刻", "飛行時間",
+    "推奨最大運航数", "収益(円)", "価格(円)", "需要(名)", "運航規模", "座席数",
+    "運航可能な最小収益(円)", "必要機長数", "必要副操縦士数", "その他必要人員指数",
+    "飛行前必要時間", "飛行後必要時間", "優先順位指数"
+]
+
 class CandidateDataGenerator:
     """운항후보별 최적수익・우선순위 데이터 생성기"""
     
     def __init__(self):
         self.output_dir = "output"
         self.airlines = [f"airline_{i:02d}" for i in range(1, 16)]
+        self.compression = None  # 출력 압축 방식 (None/"gzip"/"xz"/"bz2")
+        self.excel = False  # True면 flat 레이아웃 데이터셋별 CSV를 candidate_data.xlsx(데이터셋별 시트)로도 내보냄
+        self.zone_map_rows = None  # 지정 시 해당 행 수 단위 청크로 zone map 통계 sidecar 기록
+        self.route_day_index = False  # True면 노선×날짜 오프셋 인덱스 sidecar(<파일>.routeday.npz) 기록 (flat / 파티션)
+        self.revenue_floor_mode = None  # None / "drop" / "flag" (収益 < 運航可能な最小収益 후보 처리)
+        self.top_k = None  # 지정 시 그룹별 상위 k건만 출력
+        self.top_k_scope = "day"  # "day": 노선×날짜별, "month": 노선별 (월 전체)
+        self.top_k_by = "優先順位指数"  # 순위 기준 컬럼 (優先順位指数 / 収益(円))
+        self.priority_hashing = True  # False면 우선순위 지수의 해시 고유성 점수・미세 조정 레이어 생략
+        self.mc_samples = None  # 지정 시 후보마다 수요 배수 표본 S개로 분위수・운항가능 확률 sidecar 기록
+        self.sqlite_path = None  # 지정 시 저장 후 운항후보・최소 운항 기준・공항 시간대 용량을 해당 SQLite DB에 적재
+        self.last_context = None  # 마지막 생성 컨텍스트 (후속 단계에 노선・월을 넘겨주기 위해 보관)
+        self.generated_contexts = []  # 이번 실행에서 생성한 월별 컨텍스트 (여러 달 모드는 월마다 하나)
         
         # 주요 공항 정보 (일본, 한국, 중국, 대만, 홍콩, 동남아시아)
         self.airports = {
@@ -509,38 +543,42 @@ class CandidateDataGenerator:
         resource_score = resource_harmony + resource_balance + 8.0
         
         # 7. 극도로 복잡한 고유성 점수 (거의 100% 고유값 보장)
-        # 더 많은 변수들을 조합하여 해시 생성
-        airport_from = route_info.get("departure", "")
-        airport_to = route_info.get("arrival", "")
-        unique_string = f"{revenue}_{seats}_{personnel_index}_{flight_time}_{departure_time}_{route_type}_{airport_from}_{airport_to}_{airline_profile['brand_recognition']}_{efficiency_score}"
-        
-        # 여러 개의 다른 해시 값 생성
-        hash_value1 = hash(unique_string)
-        hash_value2 = hash(unique_string + "_secondary")
-        hash_value3 = hash(unique_string + "_tertiary")
-        hash_value4 = hash(str(revenue * seats * personnel_index))
-        
-        # 극도로 정밀한 해시 팩터들
-        hash_factors = []
-        for i, hash_val in enumerate([hash_value1, hash_value2, hash_value3, hash_value4]):
-            for shift in [0, 8, 16, 24, 32, 40, 48, 56]:
-                factor = ((hash_val >> shift) % 1000000007) / 1000000007.0
-                hash_factors.append(factor)
-        
-        # 복잡한 삼각함수와 지수 조합
-        uniqueness_components = []
-        for i, factor in enumerate(hash_factors[:16]):  # 첫 16개 팩터 사용
-            component = (
-                factor * (i + 1) * 0.123456789 +
-                np.sin(factor * (i + 1) * 7.891234) * 0.456789 +
-                np.cos(factor * (i + 1) * 11.234567) * 0.789012 +
-                np.tan(factor * 0.1 + i * 0.01) * 0.234567 +
-                np.exp(factor * 0.01) * 0.012345 +
-                np.log(factor + 0.001) * 0.567890
-            )
-            uniqueness_components.append(component)
-        
-        uniqueness_score = sum(uniqueness_components)
+        # priority_hashing이 False면 생략 (동점은 priority_ranking.py의 결정적 순위로 해소)
+        if self.priority_hashing:
+            # 더 많은 변수들을 조합하여 해시 생성
+            airport_from = route_info.get("departure", "")
+            airport_to = route_info.get("arrival", "")
+            unique_string = f"{revenue}_{seats}_{personnel_index}_{flight_time}_{departure_time}_{route_type}_{airport_from}_{airport_to}_{airline_profile['brand_recognition']}_{efficiency_score}"
+        
+            # 여러 개의 다른 해시 값 생성
+            hash_value1 = hash(unique_string)
+            hash_value2 = hash(unique_string + "_secondary")
+            hash_value3 = hash(unique_string + "_tertiary")
+            hash_value4 = hash(str(revenue * seats * personnel_index))
+        
+            # 극도로 정밀한 해시 팩터들
+            hash_factors = []
+            for i, hash_val in enumerate([hash_value1, hash_value2, hash_value3, hash_value4]):
+                for shift in [0, 8, 16, 24, 32, 40, 48, 56]:
+                    factor = ((hash_val >> shift) % 1000000007) / 1000000007.0
+                    hash_factors.append(factor)
+        
+            # 복잡한 삼각함수와 지수 조합
+            uniqueness_components = []
+            for i, factor in enumerate(hash_factors[:16]):  # 첫 16개 팩터 사용
+                component = (
+                    factor * (i + 1) * 0.123456789 +
+                    np.sin(factor * (i + 1) * 7.891234) * 0.456789 +
+                    np.cos(factor * (i + 1) * 11.234567) * 0.789012 +
+                    np.tan(factor * 0.1 + i * 0.01) * 0.234567 +
+                    np.exp(factor * 0.01) * 0.012345 +
+                    np.log(factor + 0.001) * 0.567890
+                )
+                uniqueness_components.append(component)
+        
+            uniqueness_score = sum(uniqueness_components)
+        else:
+            uniqueness_score = 0.0
         
         # 8. 최종 가중 조합 (비선형 결합)
         components = [efficiency_score, route_score, time_score, brand_score, 
@@ -555,18 +593,21 @@ class CandidateDataGenerator:
         nonlinear_factor = np.tanh(weighted_sum / 50.0) * 85.0 + 15.0
         
         # 미세 조정 (극도로 정밀한 소수점 - 여러 레이어)
-        micro_hash1 = hash_value1 % 1000000007
-        micro_hash2 = hash_value2 % 1000000007  
-        micro_hash3 = hash_value3 % 1000000007
-        micro_hash4 = hash_value4 % 1000000007
-        
-        # 다층 미세 조정
-        micro_adjustment1 = micro_hash1 / 100000000000.0  # 10^-11 단위
-        micro_adjustment2 = micro_hash2 / 1000000000000.0  # 10^-12 단위  
-        micro_adjustment3 = micro_hash3 / 10000000000000.0  # 10^-13 단위
-        micro_adjustment4 = micro_hash4 / 100000000000000.0  # 10^-14 단위
-        
-        total_micro_adjustment = micro_adjustment1 + micro_adjustment2 + micro_adjustment3 + micro_adjustment4
+        if self.priority_hashing:
+            micro_hash1 = hash_value1 % 1000000007
+            micro_hash2 = hash_value2 % 1000000007  
+            micro_hash3 = hash_value3 % 1000000007
+            micro_hash4 = hash_value4 % 1000000007
+        
+            # 다층 미세 조정
+            micro_adjustment1 = micro_hash1 / 100000000000.0  # 10^-11 단위
+            micro_adjustment2 = micro_hash2 / 1000000000000.0  # 10^-12 단위  
+            micro_adjustment3 = micro_hash3 / 10000000000000.0  # 10^-13 단위
+            micro_adjustment4 = micro_hash4 / 100000000000000.0  # 10^-14 단위
+        
+            total_micro_adjustment = micro_adjustment1 + micro_adjustment2 + micro_adjustment3 + micro_adjustment4
+        else:
+            total_micro_adjustment = 0.0
         
         # 최종 점수
         final_score = nonlinear_factor + total_micro_adjustment
@@ -576,10 +617,8 @@ class CandidateDataGenerator:
 
         return round(normalized_score, 7)  # 소수점 7째자리까지
     
-    def generate_candidate_data(self, airline_id: str) -> Dict[str, pd.DataFrame]:
-        """항공사별 운항후보 데이터 생성 (국제선/국내선 분리)"""
-        print(f"🚀 {airline_id} 운항후보 데이터 생성 시작...")
-        
+    def prepare_airline_generation(self, airline_id: str) -> Dict[str, Any]:
+        """월과 관계없이 한 번만 준비하면 되는 항공사 데이터・노선・운항규모 테이블・노선별 가격 그리드"""
         # 항공사 데이터 로드
         internal_data, airline_profile = self.load_airline_data(airline_id)
         if not internal_data or not airline_profile:
@@ -588,10 +627,520 @@ class CandidateDataGenerator:
         # 노선 생성
         routes = self.generate_routes(airline_profile)
         
+        return {
+            "airline_id": airline_id,
+            "internal_data": internal_data,
+            "airline_profile": airline_profile,
+            "routes": routes,
+            "scale_table": self.build_scale_table(internal_data),
+            "price_grids": self.build_price_grids(routes, airline_profile)
+        }
+    
+    def build_month_context(self, base: Dict[str, Any], month: int, max_days: int,
+                            month_partition: Optional[int] = None, batched: bool = False) -> Dict[str, Any]:
+        """공통 준비 결과에 대상 월과 월별 집계 상태를 더한 생성 컨텍스트"""
+        context = dict(base)
+        context.update({
+            "month": month,
+            "max_days": max_days,
+            "month_partition": month_partition,
+            "candidate_dir": self.get_candidate_dir(base["airline_id"], month_partition),
+            "batched": batched,
+            "pruning_summary": {},
+            "top_k_selector": TopKCandidateSelector(self.top_k, self.top_k_by, self.top_k_scope) if self.top_k else None,
+            "population_stats": CandidatePopulationStats(),
+            "emitted_routes": [],
+            "row_counts": {},
+            "monte_carlo_writer": MonteCarloCandidateWriter(
+                self.get_candidate_dir(base["airline_id"], month_partition), self.mc_samples, self.compression
+            ) if self.mc_samples else None
+        })
+        self.last_context = context
+        self.generated_contexts.append(context)
+        return context
+    
+    def prepare_candidate_generation(self, airline_id: str) -> Dict[str, Any]:
+        """운항후보 데이터 생성에 필요한 항공사 데이터・노선・대상 월 준비"""
+        base = self.prepare_airline_generation(airline_id)
+        if base is None:
+            return None
+        
         # 랜덤한 월과 날짜 범위 선택
         month, max_days = self.get_random_month_and_days()
         print(f"📅 {month}월 1일~{max_days}일 데이터 생성")
         
+        self.generated_contexts = []
+        return self.build_month_context(base, month, max_days)
+    
+    def get_segment_key(self, route: Dict) -> str:
+        """노선 타입과 방향에 따른 데이터셋 키 반환"""
+        if route["type"] == "international":
+            if route["direction"] == "departure":
+                return "international_departure"
+            return "international_arrival"
+        return "domestic"
+    
+    def generate_route_rows(self, route: Dict, max_days: int, airline_profile: Dict,
+                            internal_data: Dict) -> List[Dict]:
+        """한 노선의 전체 날짜 × 출발시각 운항후보 행 생성"""
+        rows = []
+        
+        # 推奨最大運航数 설정 (노선별 인기도에 따라)
+        if route["type"] == "international":
+            max_operations = np.random.randint(3, 8)  # 국제선: 3-7회
+        else:
+            max_operations = np.random.randint(5, 12)  # 국내선: 5-11회
+        
+        # 모든 날짜에 대해 데이터 생성
+        for day in range(1, max_days + 1):
+            date = f"{day}日"
+            
+            for departure_time in self.departure_times:
+                # 수요함수 생성
+                demand_data = self.generate_demand_function(
+                    airline_profile, route["type"], departure_time
+                )
+                
+                # 비행시간 계산 (기본값 또는 저장된 값)
+                flight_time = self.calculate_flight_time(route["departure"], route["arrival"])
+                flight_time_str = f"{flight_time}分"
+                
+                # 최적수익 계산
+                optimal_data = self.calculate_optimal_revenue(
+                    demand_data, route["type"], internal_data, flight_time_str
+                )
+                
+                # 우선순위 지수 계산 (개선된 버전)
+                priority_index = self.calculate_priority_index(
+                    optimal_data["収益(円)"], 
+                    optimal_data["運航規模データ"], 
+                    route["type"], 
+                    departure_time, 
+                    airline_profile,
+                    route
+                )
+                
+                # 디버깅: 우선순위 지수 계산 과정 확인
+                if np.random.random() < 0.01:  # 1% 확률로 로그 출력
+                    print(f"🔍 우선순위 지수 계산 디버깅:")
+                    print(f"   수익: {optimal_data['収益(円)']:,}円")
+                    print(f"   좌석수: {optimal_data['運航規模データ']['座席数']}")
+                    print(f"   인력지수: {optimal_data['運航規模データ']['必要人員データ']['その他必要人員指数']}")
+                    print(f"   비행시간: {optimal_data['運航規模データ']['飛行前後に必要な時間']['前'] + optimal_data['運航規模データ']['飛行前後に必要な時間']['後']}분")
+                    print(f"   최종 우선순위 지수: {priority_index}")
+                
+                # 행 데이터 생성
+                row = {
+                    "日付": date,
+                    "出発国家": route["departure_country"],
+                    "出発空港": route["departure"],
+                    "到着国家": route["arrival_country"],
+                    "到着空港": route["arrival"],
+                    "出発時刻": departure_time,
+                    "飛行時間": flight_time,  # 비행시간 추가 (분 단위)
+                    "推奨最大運航数": max_operations,
+                    "収益(円)": optimal_data["収益(円)"],
+                    "価格(円)": optimal_data["価格(円)"],
+                    "需要(名)": optimal_data["需要(名)"],
+                    "運航規模": optimal_data["運航規模データ"]["運航規模"],
+                    "座席数": optimal_data["運航規模データ"]["座席数"],
+                    "運航可能な最小収益(円)": optimal_data["運航規模データ"]["運航可能な最小収益(円)"],
+                    "必要機長数": optimal_data["運航規模データ"]["必要人員データ"]["機長・副操縦士の人数"][0],
+                    "必要副操縦士数": optimal_data["運航規模データ"]["必要人員データ"]["機長・副操縦士の人数"][1],
+                    "その他必要人員指数": optimal_data["運航規模データ"]["必要人員データ"]["その他必要人員指数"],
+                    "飛行前必要時間": optimal_data["運航規模データ"]["飛行前後に必要な時間"]["前"],
+                    "飛行後必要時間": optimal_data["運航規模データ"]["飛行前後に必要な時間"]["後"],
+                    "優先順位指数": priority_index
+                }
+                rows.append(row)
+        
+        return rows
+    
+    def build_scale_table(self, internal_data: Dict) -> Dict[str, Any]:
+        """운항규모별 데이터를 배열 테이블로 변환 (배치 계산용)"""
+        scale_keys = list(internal_data["運航規模別データ"].keys())
+        scale_data = [internal_data["運航規模別データ"][key] for key in scale_keys]
+        return {
+            "keys": scale_keys,
+            "座席数": np.array([int(d["座席数"]) for d in scale_data]),
+            "運航可能な最小収益(円)": np.array([int(d["運航可能最小収益"]) for d in scale_data]),
+            "必要機長数": np.array([int(d["必要人員データ"]["必要機長数"]) for d in scale_data]),
+            "必要副操縦士数": np.array([int(d["必要人員データ"]["必要副操縦士数"]) for d in scale_data]),
+            "飛行前必要時間": np.array([int(d["飛行前後必要時間"]["前"]) for d in scale_data]),
+            "飛行後必要時間": np.array([int(d["飛行前後必要時間"]["後"]) for d in scale_data]),
+            "その他必要人員指数": [d["必要人員データ"]["その他必要人員指数"] for d in scale_data],
+            "飛行前後に必要な時間": [d["飛行前後必要時間"] for d in scale_data]
+        }
+    
+    def get_time_multiplier_bounds(self, hours: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """시간대별 수요 배수 구간 (get_time_multiplier와 동일한 구간)"""
+        low = np.full(len(hours), 0.9)
+        high = np.full(len(hours), 1.1)
+        peak = np.isin(hours, [8, 9, 17, 18, 19])
+        off_peak = np.isin(hours, [7, 22])
+        low[peak], high[peak] = 1.1, 1.3
+        low[off_peak], high[off_peak] = 0.7, 0.9
+        return low, high
+    
+    def build_price_grid(self, route: Dict, airline_profile: Dict) -> Tuple[int, np.ndarray, np.ndarray]:
+        """노선의 비행시간, 가격 그리드, 가격별 수요 배수 (날짜・시간대와 무관)"""
+        flight_time = self.calculate_flight_time(route["departure"], route["arrival"])
+        min_price, max_price = self.get_price_range(f"{flight_time}分", route["type"])
+        prices = np.arange(min_price, max_price + 1000, 1000)
+        price_factors = np.array([(float(p) / 20000) ** airline_profile["price_elasticity"] for p in prices])
+        return flight_time, prices, price_factors
+    
+    def build_price_grids(self, routes: List[Dict], airline_profile: Dict) -> Dict[tuple, Tuple]:
+        """전체 노선의 가격 그리드를 미리 계산 ((出発空港, 到着空港, type) → build_price_grid 결과)"""
+        grids = {}
+        for route in routes:
+            key = (route["departure"], route["arrival"], route["type"])
+            if key not in grids:
+                grids[key] = self.build_price_grid(route, airline_profile)
+        return grids
+    
+    def compute_route_batch(self, route: Dict, max_days: int, airline_profile: Dict,
+                            internal_data: Dict, scale_table: Dict[str, Any],
+                            price_grid: Optional[Tuple] = None) -> Dict[str, np.ndarray]:
+        """한 노선의 전체 날짜 × 출발시각에 대해 수요・최적수익・운항규모를 배열로 일괄 계산
+        
+        generate_demand_function / calculate_optimal_revenue / determine_operation_scale과
+        같은 계산을 행 단위 루프 없이 수행한다 (우선순위 지수는 포함하지 않음).
+        price_grid(build_price_grid 결과)를 넘기면 노선별 가격 그리드를 다시 계산하지 않는다.
+        """
+        slot_count = len(self.departure_times)
+        days = np.repeat(np.arange(1, max_days + 1), slot_count)
+        slots = np.tile(np.arange(slot_count), max_days)
+        hours = np.array([int(t.split(":")[0]) for t in self.departure_times])[slots]
+        
+        # 수요함수 (시간대별 배수는 한 번에 추출)
+        if route["type"] == "international":
+            route_multiplier = airline_profile["international_focus"]
+        else:
+            route_multiplier = airline_profile["domestic_focus"]
+        low, high = self.get_time_multiplier_bounds(hours)
+        time_multipliers = np.random.uniform(low, high)
+        base_demands = np.floor(
+            airline_profile["base_demand"] * airline_profile["brand_recognition"] * route_multiplier * time_multipliers
+        ).astype(np.int64)
+        
+        # 가격 그리드 × 수요 → 최적 가격 (첫 번째 최대값)
+        flight_time, prices, price_factors = price_grid or self.build_price_grid(route, airline_profile)
+        demand_grid = np.maximum(np.floor(base_demands[:, None] * price_factors[None, :]).astype(np.int64), 10)
+        revenue_grid = prices[None, :] * demand_grid
+        optimal_idx = np.argmax(revenue_grid, axis=1)
+        rows = np.arange(len(days))
+        revenues = revenue_grid[rows, optimal_idx]
+        demands = demand_grid[rows, optimal_idx]
+        
+        # 운항규모 결정
+        scale_index = self.select_scale_index(demands, internal_data, scale_table)
+        
+        # 필요인력지수: 최대승객수 이하인 첫 구간 (없으면 마지막 구간)
+        personnel = np.zeros(len(days), dtype=np.int64)
+        for k, items in enumerate(scale_table["その他必要人員指数"]):
+            in_scale = scale_index == k
+            values = np.full(in_scale.sum(), items[-1]["必要人員指数"], dtype=np.int64)
+            scale_demands = demands[in_scale]
+            for item in reversed(items):
+                values[scale_demands <= item["最大乗客数"]] = item["必要人員指数"]
+            personnel[in_scale] = values
+        
+        min_revenues = scale_table["運航可能な最小収益(円)"][scale_index]
+        return {
+            "day": days,
+            "slot": slots,
+            "flight_time": flight_time,
+            "revenue": revenues,
+            "price": prices[optimal_idx],
+            "demand": demands,
+            "scale_index": scale_index,
+            "personnel": personnel,
+            "min_revenue": min_revenues,
+            "viable": revenues >= min_revenues
+        }
+    
+    def select_scale_index(self, demands: np.ndarray, internal_data: Dict, scale_table: Dict[str, Any]) -> np.ndarray:
+        """수요 배열에 대한 운항규모 인덱스 (determine_operation_scale과 동일한 임계값)"""
+        operation_scales = internal_data["運航規模種類"]
+        scale_keys = scale_table["keys"]
+        scale_index = np.full(demands.shape, scale_keys.index("小規模運航"))
+        if "中規模運航" in operation_scales:
+            scale_index[demands > 150] = scale_keys.index("中規模運航")
+        if "大規模運航" in operation_scales:
+            scale_index[demands > 300] = scale_keys.index("大規模運航")
+        return scale_index
+    
+    def compute_route_monte_carlo(self, route: Dict, batch: Dict[str, np.ndarray], rows: np.ndarray,
+                                  context: Dict[str, Any]) -> pd.DataFrame:
+        """출력 후보 행마다 수요 배수를 mc_samples개 뽑아 収益/需要 분위수와 운항가능 확률 계산
+        
+        기본수요가 정해지면 최적가격・수요・수익・운항규모가 모두 결정되므로 노선마다 기본수요 → 결과
+        조회 테이블을 한 번 만들고, 표본은 (행 블록 × 표본수) 배열로 뽑아 기본수요 개수만 집계한다.
+        """
+        airline_profile = context["airline_profile"]
+        scale_table = context["scale_table"]
+        samples = self.mc_samples
+        
+        if route["type"] == "international":
+            route_multiplier = airline_profile["international_focus"]
+        else:
+            route_multiplier = airline_profile["domestic_focus"]
+        demand_scale = airline_profile["base_demand"] * airline_profile["brand_recognition"] * route_multiplier
+        
+        slots = batch["slot"][rows]
+        hours = np.array([int(t.split(":")[0]) for t in self.departure_times])[slots]
+        low, high = self.get_time_multiplier_bounds(hours)
+        
+        # 기본수요 → 최적 수요・수익・최소수익 조회 테이블 (compute_route_batch와 같은 가격 그리드)
+        _, prices, price_factors = context["price_grids"][(route["departure"], route["arrival"], route["type"])]
+        bases = np.arange(int(np.floor(demand_scale * high.max(initial=0.0))) + 1, dtype=np.int64)
+        demand_grid = np.maximum(np.floor(bases[:, None] * price_factors[None, :]).astype(np.int64), 10)
+        optimal_idx = np.argmax(prices[None, :] * demand_grid, axis=1)
+        table_demand = demand_grid[bases, optimal_idx]
+        table_revenue = prices[optimal_idx] * table_demand
+        table_viable = table_revenue >= scale_table["運航可能な最小収益(円)"][
+            self.select_scale_index(table_demand, context["internal_data"], scale_table)
+        ]
+        
+        # 표본 축 배치: (행 블록, 표본수) 단위로 난수 추출 후 테이블 조회
+        block_rows = max(1, DEFAULT_BLOCK_ELEMENTS // samples)
+        summaries = []
+        for start in range(0, len(rows), block_rows):
+            block = slice(start, start + block_rows)
+            time_multipliers = np.random.uniform(low[block, None], high[block, None], size=(len(hours[block]), samples))
+            sampled_bases = np.floor(demand_scale * time_multipliers).astype(np.int64)
+            summaries.append(summarize_samples(sampled_bases, table_revenue, table_demand, table_viable))
+        
+        n = len(rows)
+        frame = {
+            "日付": [f"{day}日" for day in batch["day"][rows]],
+            "出発空港": [route["departure"]] * n,
+            "到着空港": [route["arrival"]] * n,
+            "出発時刻": np.array(self.departure_times, dtype=object)[slots]
+        }
+        for column in MONTE_CARLO_COLUMNS[4:]:
+            frame[column] = np.concatenate([s[column] for s in summaries]) if summaries else np.zeros(0)
+        return pd.DataFrame(frame, columns=MONTE_CARLO_COLUMNS)
+    
+    def calculate_batch_priorities(self, route: Dict, batch: Dict[str, np.ndarray], rows: np.ndarray,
+                                   airline_profile: Dict, scale_table: Dict[str, Any]) -> np.ndarray:
+        """배치 중 지정한 행만 우선순위 지수 계산"""
+        priorities = np.zeros(len(rows), dtype=np.float64)
+        operation_cache = {}
+        for i, row in enumerate(rows):
+            scale_idx = int(batch["scale_index"][row])
+            personnel_index = int(batch["personnel"][row])
+            key = (scale_idx, personnel_index)
+            if key not in operation_cache:
+                operation_cache[key] = {
+                    "座席数": int(scale_table["座席数"][scale_idx]),
+                    "必要人員データ": {"その他必要人員指数": personnel_index},
+                    "飛行前後に必要な時間": scale_table["飛行前後に必要な時間"][scale_idx]
+                }
+            priorities[i] = self.calculate_priority_index(
+                int(batch["revenue"][row]),
+                operation_cache[key],
+                route["type"],
+                self.departure_times[batch["slot"][row]],
+                airline_profile,
+                route
+            )
+        return priorities
+    
+    def build_route_chunk(self, route: Dict, batch: Dict[str, np.ndarray], rows: np.ndarray,
+                          priorities: np.ndarray, max_operations: int,
+                          scale_table: Dict[str, Any]) -> pd.DataFrame:
+        """배치 계산 결과 중 지정한 행으로 운항후보 DataFrame 생성"""
+        n = len(rows)
+        scale_index = batch["scale_index"][rows]
+        date_labels = np.array([f"{day}日" for day in range(1, int(batch["day"].max(initial=0)) + 1)], dtype=object)
+        return pd.DataFrame({
+            "日付": date_labels[batch["day"][rows] - 1],
+            "出発国家": [route["departure_country"]] * n,
+            "出発空港": [route["departure"]] * n,
+            "到着国家": [route["arrival_country"]] * n,
+            "到着空港": [route["arrival"]] * n,
+            "出発時刻": np.array(self.departure_times, dtype=object)[batch["slot"][rows]],
+            "飛行時間": np.full(n, batch["flight_time"], dtype=np.int64),
+            "推奨最大運航数": np.full(n, max_operations, dtype=np.int64),
+            "収益(円)": batch["revenue"][rows],
+            "価格(円)": batch["price"][rows],
+            "需要(名)": batch["demand"][rows],
+            "運航規模": np.array(scale_table["keys"], dtype=object)[scale_index],
+            "座席数": scale_table["座席数"][scale_index],
+            "運航可能な最小収益(円)": scale_table["運航可能な最小収益(円)"][scale_index],
+            "必要機長数": scale_table["必要機長数"][scale_index],
+            "必要副操縦士数": scale_table["必要副操縦士数"][scale_index],
+            "その他必要人員指数": batch["personnel"][rows],
+            "飛行前必要時間": scale_table["飛行前必要時間"][scale_index],
+            "飛行後必要時間": scale_table["飛行後必要時間"][scale_index],
+            "優先順位指数": priorities
+        }, columns=CANDIDATE_COLUMNS)
+    
+    def generate_route_chunk_batched(self, route: Dict, context: Dict[str, Any]) -> pd.DataFrame:
+        """배치 계산으로 한 노선의 운항후보 청크 생성 (수익 하한 필터・상위 k건 유지 적용)
+        
+        revenue_floor_mode가 "drop"이면 収益(円) < 運航可能な最小収益(円)인 후보를 행 생성 전에 제외하고,
+        "flag"이면 남겨두되 優先順位指数를 0.0으로 둔다. 어느 쪽이든 해당 행의 우선순위 지수는 계산하지 않는다.
+        top_k가 지정되면 노선×날짜(또는 노선 전체)별로 top_k_by 기준 상위 k건만 남긴다.
+        """
+        airline_profile = context["airline_profile"]
+        scale_table = context["scale_table"]
+        
+        # 推奨最大運航数 설정 (노선별 인기도에 따라)
+        if route["type"] == "international":
+            max_operations = np.random.randint(3, 8)  # 국제선: 3-7회
+        else:
+            max_operations = np.random.randint(5, 12)  # 국내선: 5-11회
+        
+        batch = self.compute_route_batch(
+            route, context["max_days"], airline_profile, context["internal_data"], scale_table,
+            price_grid=context["price_grids"].get((route["departure"], route["arrival"], route["type"]))
+        )
+        total = len(batch["viable"])
+        all_rows = np.arange(total)
+        priorities = np.zeros(total, dtype=np.float64)
+        
+        # 수익 하한 필터: 우선순위를 계산할 행(scored)과 출력 후보 행(rows) 결정
+        if self.revenue_floor_mode:
+            scored_rows = np.flatnonzero(batch["viable"])
+            rows = all_rows if self.revenue_floor_mode == "flag" else scored_rows
+            pruned = int(total - len(scored_rows))
+            route_key = f"{route['departure']}-{route['arrival']}"
+            context["pruning_summary"][route_key] = {"total": int(total), "pruned": pruned}
+            action = "플래그" if self.revenue_floor_mode == "flag" else "제외"
+            print(f"   ✂️ 운항 불가 후보 (収益 < 運航可能な最小収益) {action}: {pruned}/{total}건")
+        else:
+            scored_rows = rows = all_rows
+        
+        # 상위 k건 유지: 우선순위 기준이면 점수 대상 행 전체를, 수익 기준이면 남길 행만 계산
+        computed_rows = scored_rows
+        if self.top_k:
+            selector = context["top_k_selector"]
+            if selector.rank_by == "優先順位指数":
+                priorities[scored_rows] = self.calculate_batch_priorities(
+                    route, batch, scored_rows, airline_profile, scale_table
+                )
+                scores = priorities[rows]
+            else:
+                scores = batch["revenue"][rows]
+            rows = selector.select(batch["day"][rows], scores, rows)
+            if selector.rank_by != "優先順位指数":
+                computed_rows = np.intersect1d(rows, scored_rows)
+                priorities[computed_rows] = self.calculate_batch_priorities(
+                    route, batch, computed_rows, airline_profile, scale_table
+                )
+            # 수익 기준 순위에서는 優先順位指数를 남길 행만 계산하므로 출력 행 통계로 따로 기록
+            context["population_stats"].update(
+                self.get_segment_key(route), batch, len(rows), priorities[computed_rows],
+                priority_scope="population" if selector.rank_by == "優先順位指数" else "retained"
+            )
+        else:
+            priorities[scored_rows] = self.calculate_batch_priorities(
+                route, batch, scored_rows, airline_profile, scale_table
+            )
+        
+        if self.mc_samples:
+            context["monte_carlo_writer"].write_chunk(self.compute_route_monte_carlo(route, batch, rows, context))
+        
+        return self.build_route_chunk(route, batch, rows, priorities[rows], max_operations, scale_table)
+    
+    def iter_candidate_chunks(self, context: Dict[str, Any]) -> Iterator[Tuple[str, pd.DataFrame]]:
+        """노선 단위 운항후보 청크 생성 (데이터셋 키, DataFrame)"""
+        for route in context["routes"]:
+            print(f"🛫 {route['departure']} → {route['arrival']} 노선 처리 중...")
+            if self.revenue_floor_mode or self.top_k or self.mc_samples or context["batched"]:
+                chunk = self.generate_route_chunk_batched(route, context)
+            else:
+                rows = self.generate_route_rows(
+                    route, context["max_days"], context["airline_profile"], context["internal_data"]
+                )
+                chunk = pd.DataFrame(rows, columns=CANDIDATE_COLUMNS)
+            segment_key = self.get_segment_key(route)
+            if not chunk.empty:
+                context["emitted_routes"].append(route)
+            context["row_counts"][segment_key] = context["row_counts"].get(segment_key, 0) + len(chunk)
+            yield segment_key, chunk
+        
+        if self.revenue_floor_mode:
+            self.print_pruning_summary(context)
+        if self.top_k:
+            self.report_population_stats(context)
+        if self.mc_samples:
+            self.report_monte_carlo(context)
+    
+    def get_stage_handoff(self) -> Dict[str, Any]:
+        """후속 단계(최소 운항 기준・연계공항 일정)에 넘겨줄 노선 목록과 대상 월
+        
+        routes는 실제로 후보 행이 출력된 노선만 generate_routes 순서대로 담으므로
+        candidate 파일에서 노선을 다시 읽어 만든 목록과 같다.
+        """
+        if not self.generated_contexts:
+            return None
+        # 여러 달 모드는 한 달이라도 후보가 출력된 노선을 모두 넘기고, 일수는 가장 긴 달 기준
+        emitted = {id(route) for context in self.generated_contexts for route in context["emitted_routes"]}
+        context = self.generated_contexts[0]
+        return {
+            "routes": [route for route in context["routes"] if id(route) in emitted],
+            "month": int(context["month"]),
+            "months": [int(c["month"]) for c in self.generated_contexts],
+            "max_days": max(int(c["max_days"]) for c in self.generated_contexts)
+        }
+    
+    def print_pruning_summary(self, context: Dict[str, Any]):
+        """노선별 수익 하한 필터 결과 요약 출력"""
+        summary = context["pruning_summary"]
+        total = sum(v["total"] for v in summary.values())
+        pruned = sum(v["pruned"] for v in summary.values())
+        affected = [route_key for route_key, counts in summary.items() if counts["pruned"] > 0]
+        print(f"✂️ 수익 하한 필터 요약: {pruned}/{total}건 운항 불가 ({len(affected)}/{len(summary)}개 노선)")
+    
+    def report_monte_carlo(self, context: Dict[str, Any]):
+        """몬테카를로 sidecar를 닫고 요약 출력"""
+        writer = context["monte_carlo_writer"]
+        path = writer.close()
+        if path is None:
+            print("⚠️ 몬테카를로 집계 대상 후보가 없습니다.")
+            return
+        print(f"🎲 몬테카를로 수요 불확실성 ({self.mc_samples}개 표본/후보): {writer.rows}건, "
+              f"평균 운항가능 확률 {writer.mean_probability():.3f}")
+        print(f"✅ 몬테카를로 분위수 저장 완료: {path}")
+    
+    def report_population_stats(self, context: Dict[str, Any]):
+        """상위 k건 유지 모드의 전체 모집단 통계 출력 및 population_stats.json 저장"""
+        summary = context["population_stats"].summary()
+        total = summary["total"]
+        print(f"🏆 상위 {self.top_k}건 유지 ({self.top_k_scope} 단위, 기준: {self.top_k_by}): "
+              f"{total['retained']}/{total['candidates']}건 출력")
+        for column, stats in total["columns"].items():
+            print(f"   - {column}: 평균 {stats['mean']:,.2f} / 최소 {stats['min']:,.2f} / 최대 {stats['max']:,.2f} "
+                  f"({stats['count']}건)")
+        for column, stats in total.get("retained_columns", {}).items():
+            print(f"   - {column} (출력 행만): 평균 {stats['mean']:,.2f} / 최소 {stats['min']:,.2f} / "
+                  f"최대 {stats['max']:,.2f} ({stats['count']}건)")
+        
+        settings = {
+            "top_k": self.top_k,
+            "scope": self.top_k_scope,
+            "rank_by": self.top_k_by,
+            # 優先順位指数 통계 범위: population(모집단, segments.*.columns) / retained(출력 행만, segments.*.retained_columns)
+            "priority_stats_scope": "population" if self.top_k_by == "優先順位指数" else "retained",
+            "revenue_floor": self.revenue_floor_mode,
+            "month": int(context["month"]),
+            "max_days": int(context["max_days"])
+        }
+        path = context["population_stats"].save(context["candidate_dir"], settings)
+        print(f"✅ 모집단 통계 저장 완료: {path}")
+    
+    def generate_candidate_data(self, airline_id: str, context: Optional[Dict[str, Any]] = None) -> Dict[str, pd.DataFrame]:
+        """항공사별 운항후보 데이터 생성 (국제선/국내선 분리)"""
+        print(f"🚀 {airline_id} 운항후보 데이터 생성 시작...")
+        
+        context = context or self.prepare_candidate_generation(airline_id)
+        if context is None:
+            return None
+        
         # 데이터 분리용 딕셔너리
         data_sets = {
             "international_departure": [],    # 국제선: 일본 출발
@@ -600,110 +1149,53 @@ class CandidateDataGenerator:
         }
         
         # 각 노선별로 데이터 생성
-        for route in routes:
-            print(f"🛫 {route['departure']} → {route['arrival']} 노선 처리 중...")
-            
-            # 推奨最大運航数 설정 (노선별 인기도에 따라)
-            if route["type"] == "international":
-                max_operations = np.random.randint(3, 8)  # 국제선: 3-7회
-            else:
-                max_operations = np.random.randint(5, 12)  # 국내선: 5-11회
-            
-            # 모든 날짜에 대해 데이터 생성
-            for day in range(1, max_days + 1):
-                date = f"{day}日"
-                
-                for departure_time in self.departure_times:
-                    # 수요함수 생성
-                    demand_data = self.generate_demand_function(
-                        airline_profile, route["type"], departure_time
-                    )
-                    
-                    # 비행시간 계산 (기본값 또는 저장된 값)
-                    flight_time = self.calculate_flight_time(route["departure"], route["arrival"])
-                    flight_time_str = f"{flight_time}分"
-                    
-                    # 최적수익 계산
-                    optimal_data = self.calculate_optimal_revenue(
-                        demand_data, route["type"], internal_data, flight_time_str
-                    )
-                    
-                    # 우선순위 지수 계산 (개선된 버전)
-                    priority_index = self.calculate_priority_index(
-                        optimal_data["収益(円)"], 
-                        optimal_data["運航規模データ"], 
-                        route["type"], 
-                        departure_time, 
-                        airline_profile,
-                        route
-                    )
-                    
-                    # 디버깅: 우선순위 지수 계산 과정 확인
-                    if np.random.random() < 0.01:  # 1% 확률로 로그 출력
-                        print(f"🔍 우선순위 지수 계산 디버깅:")
-                        print(f"   수익: {optimal_data['収益(円)']:,}円")
-                        print(f"   좌석수: {optimal_data['運航規模データ']['座席数']}")
-                        print(f"   인력지수: {optimal_data['運航規模データ']['必要人員データ']['その他必要人員指数']}")
-                        print(f"   비행시간: {optimal_data['運航規模データ']['飛行前後に必要な時間']['前'] + optimal_data['運航規模データ']['飛行前後に必要な時間']['後']}분")
-                        print(f"   최종 우선순위 지수: {priority_index}")
-                    
-                    # 행 데이터 생성
-                    row = {
-                        "日付": date,
-                        "出発国家": route["departure_country"],
-                        "出発空港": route["departure"],
-                        "到着国家": route["arrival_country"],
-                        "到着空港": route["arrival"],
-                        "出発時刻": departure_time,
-                        "飛行時間": flight_time,  # 비행시간 추가 (분 단위)
-                        "推奨最大運航数": max_operations,
-                        "収益(円)": optimal_data["収益(円)"],
-                        "価格(円)": optimal_data["価格(円)"],
-                        "需要(名)": optimal_data["需要(名)"],
-                        "運航規模": optimal_data["運航規模データ"]["運航規模"],
-                        "座席数": optimal_data["運航規模データ"]["座席数"],
-                        "運航可能な最小収益(円)": optimal_data["運航規模データ"]["運航可能な最小収益(円)"],
-                        "必要機長数": optimal_data["運航規模データ"]["必要人員データ"]["機長・副操縦士の人数"][0],
-                        "必要副操縦士数": optimal_data["運航規模データ"]["必要人員データ"]["機長・副操縦士の人数"][1],
-                        "その他必要人員指数": optimal_data["運航規模データ"]["必要人員データ"]["その他必要人員指数"],
-                        "飛行前必要時間": optimal_data["運航規模データ"]["飛行前後に必要な時間"]["前"],
-                        "飛行後必要時間": optimal_data["運航規模データ"]["飛行前後に必要な時間"]["後"],
-                        "優先順位指数": priority_index
-                    }
-                    
-                    # 노선 타입과 방향에 따라 적절한 데이터셋에 추가
-                    if route["type"] == "international":
-                        if route["direction"] == "departure":
-                            data_sets["international_departure"].append(row)
-                        else:  # arrival
-                            data_sets["international_arrival"].append(row)
-                    else:  # domestic
-                        data_sets["domestic"].append(row)
+        for segment_key, chunk in self.iter_candidate_chunks(context):
+            data_sets[segment_key].append(chunk)
         
         print(f"✅ 데이터 생성 완료:")
-        print(f"   - 국제선 출발: {len(data_sets['international_departure'])}건")
-        print(f"   - 국제선 도착: {len(data_sets['international_arrival'])}건")
-        print(f"   - 국내선: {len(data_sets['domestic'])}건")
+        print(f"   - 국제선 출발: {sum(len(c) for c in data_sets['international_departure'])}건")
+        print(f"   - 국제선 도착: {sum(len(c) for c in data_sets['international_arrival'])}건")
+        print(f"   - 국내선: {sum(len(c) for c in data_sets['domestic'])}건")
         
         # DataFrame으로 변환
         result = {}
-        for key, data_list in data_sets.items():
-            if data_list:  # 빈 리스트가 아닌 경우만
-                result[key] = pd.DataFrame(data_list)
+        for key, chunks in data_sets.items():
+            if chunks:  # 빈 리스트가 아닌 경우만
+                result[key] = pd.concat(chunks, ignore_index=True)
             else:
                 result[key] = pd.DataFrame()
         
         return result
     
-    def save_candidate_data(self, airline_id: str, data_sets: Dict[str, pd.DataFrame]):
+    def get_candidate_dir(self, airline_id: str, month_partition: Optional[int] = None) -> str:
+        """운항후보 출력 폴더 (여러 달 모드는 candidate/month=<월>)"""
+        candidate_dir = os.path.join(self.output_dir, airline_id, "analytics_data", "candidate")
+        if month_partition is not None:
+            return os.path.join(candidate_dir, month_partition_dir(month_partition))
+        return candidate_dir
+    
+    def get_candidate_paths(self, airline_id: str, month_partition: Optional[int] = None) -> Dict[str, str]:
+        """운항후보 CSV 출력 경로 (데이터셋별 + 통합, 압축 시 확장자 추가)"""
+        candidate_dir = self.get_candidate_dir(airline_id, month_partition)
+        paths = {
+            "international_departure": os.path.join(candidate_dir, "international_departure.csv"),
+            "international_arrival": os.path.join(candidate_dir, "international_arrival.csv"),
+            "domestic": os.path.join(candidate_dir, "domestic.csv"),
+            "consolidated": os.path.join(candidate_dir, "consolidated", "consolidated_candidate_data.csv")
+        }
+        return {key: output_path(path, self.compression) for key, path in paths.items()}
+    
+    def save_candidate_data(self, airline_id: str, data_sets: Dict[str, pd.DataFrame],
+                            month_partition: Optional[int] = None):
         """운항후보 데이터를 Excel로 저장 (국제선/국내선 분리 + 통합)"""
         print(f"💾 {airline_id} 데이터 저장 시작...")
         
         # CSV 파일로 저장
-        departure_path = os.path.join(self.output_dir, airline_id, "analytics_data", "candidate", "international_departure.csv")
-        arrival_path = os.path.join(self.output_dir, airline_id, "analytics_data", "candidate", "international_arrival.csv")
-        domestic_path = os.path.join(self.output_dir, airline_id, "analytics_data", "candidate", "domestic.csv")
-        consolidated_path = os.path.join(self.output_dir, airline_id, "analytics_data", "candidate", "consolidated", "consolidated_candidate_data.csv")
+        paths = self.get_candidate_paths(airline_id, month_partition)
+        departure_path = paths["international_departure"]
+        arrival_path = paths["international_arrival"]
+        domestic_path = paths["domestic"]
+        consolidated_path = paths["consolidated"]
         
         # analytics_data/candidate 폴더가 없으면 생성
         os.makedirs(os.path.dirname(departure_path), exist_ok=True)
@@ -711,50 +1203,289 @@ class CandidateDataGenerator:
         os.makedirs(os.path.dirname(domestic_path), exist_ok=True)
         os.makedirs(os.path.dirname(consolidated_path), exist_ok=True)
         
+        encoder = CandidateCsvEncoder(CANDIDATE_COLUMNS)
+        
         # 국제 출발 데이터 저장
-        data_sets["international_departure"].to_csv(departure_path, index=False, encoding='utf-8-sig')
+        encoder.write_csv(data_sets["international_departure"], departure_path, self.compression, self.zone_map_rows,
+                          self.route_day_index)
         print(f"✅ 국제 출발 데이터 CSV 저장 완료: {departure_path}")
         
         # 국제 도착 데이터 저장
-        data_sets["international_arrival"].to_csv(arrival_path, index=False, encoding='utf-8-sig')
+        encoder.write_csv(data_sets["international_arrival"], arrival_path, self.compression, self.zone_map_rows,
+                          self.route_day_index)
         print(f"✅ 국제 도착 데이터 CSV 저장 완료: {arrival_path}")
         
         # 국내 데이터 저장
-        data_sets["domestic"].to_csv(domestic_path, index=False, encoding='utf-8-sig')
+        encoder.write_csv(data_sets["domestic"], domestic_path, self.compression, self.zone_map_rows,
+                          self.route_day_index)
         print(f"✅ 국내 데이터 CSV 저장 완료: {domestic_path}")
         
-        # 통합 데이터 생성 및 저장 (실제 데이터가 있는 것만)
-        all_data = []
-        if not data_sets["international_departure"].empty:
-            all_data.append(data_sets["international_departure"])
-        if not data_sets["international_arrival"].empty:
-            all_data.append(data_sets["international_arrival"])
-        if not data_sets["domestic"].empty:
-            all_data.append(data_sets["domestic"])
-        
-        if all_data:
-            consolidated_df = pd.concat(all_data, ignore_index=True)
-            consolidated_df.to_csv(consolidated_path, index=False, encoding='utf-8-sig')
-            print(f"✅ 통합 데이터 CSV 저장 완료: {consolidated_path} ({len(consolidated_df)}건)")
+        # 통합 데이터 저장 (데이터셋별 CSV를 재인코딩 없이 바이트 연결, 실제 데이터가 있는 것만)
+        total_rows = sum(len(df) for df in data_sets.values())
+        segment_paths = [departure_path, arrival_path, domestic_path]
+        if concatenate_candidate_csvs(segment_paths, consolidated_path, self.compression):
+            print(f"✅ 통합 데이터 CSV 저장 완료: {consolidated_path} ({total_rows}건)")
         else:
             print("⚠️ 통합할 데이터가 없습니다.")
         
         print(f"🎉 {airline_id} 모든 데이터 저장 완료!")
+    
+    def save_candidate_data_pipelined(self, airline_id: str, queue_size: int = 8, writer_threads: int = 2,
+                                      context: Optional[Dict[str, Any]] = None) -> Dict[str, int]:
+        """노선 청크 생성과 CSV 인코딩/쓰기를 겹쳐서 실행 (bounded queue 파이프라인)"""
+        print(f"🚀 {airline_id} 운항후보 데이터 파이프라인 생성 시작...")
+        
+        context = context or self.prepare_candidate_generation(airline_id)
+        if context is None:
+            return None
+        
+        paths = self.get_candidate_paths(airline_id, context["month_partition"])
+        writer = PipelinedCandidateWriter(
+            paths, CANDIDATE_COLUMNS, queue_size=queue_size, writer_threads=writer_threads,
+            compression=self.compression, zone_map_rows=self.zone_map_rows,
+            route_day_index=self.route_day_index
+        )
+        row_counts = writer.run(self.iter_candidate_chunks(context))
+        
+        print(f"✅ 데이터 생성・저장 완료:")
+        print(f"   - 국제선 출발: {row_counts['international_departure']}건")
+        print(f"   - 국제선 도착: {row_counts['international_arrival']}건")
+        print(f"   - 국내선: {row_counts['domestic']}건")
+        print(f"🎉 {airline_id} 모든 데이터 저장 완료!")
+        return row_counts
+    
+    def save_candidate_data_partitioned(self, airline_id: str, context: Optional[Dict[str, Any]] = None) -> Dict:
+        """노선 청크를 생성하면서 type=<데이터셋>/day=<일> 파티션 레이아웃으로 저장"""
+        print(f"🚀 {airline_id} 운항후보 데이터 파티션 생성 시작...")
+        
+        context = context or self.prepare_candidate_generation(airline_id)
+        if context is None:
+            return None
+        
+        candidate_dir = context["candidate_dir"]
+        writer = PartitionedCandidateWriter(
+            candidate_dir, CANDIDATE_COLUMNS, compression=self.compression, month=int(context["month"]),
+            zone_map_rows=self.zone_map_rows, route_day_index=self.route_day_index
+        )
+        try:
+            for segment_key, chunk in self.iter_candidate_chunks(context):
+                writer.write_chunk(segment_key, chunk)
+        finally:
+            index = writer.close()
+        
+        print(f"✅ 파티션 저장 완료: {len(index['partitions'])}개 파티션")
+        for segment_key in index["types"]:
+            rows = sum(p["rows"] for p in index["partitions"] if p["type"] == segment_key)
+            print(f"   - {segment_key}: {rows}건")
+        print(f"🎉 {airline_id} 모든 데이터 저장 완료!")
+        return index
+    
+    def save_candidate_data_star(self, airline_id: str, context: Optional[Dict[str, Any]] = None) -> Dict:
+        """노선 청크를 생성하면서 노선/운항규모/출발시각 차원 + 팩트 테이블(스타 스키마)로 저장"""
+        print(f"🚀 {airline_id} 운항후보 데이터 스타 스키마 생성 시작...")
+        
+        context = context or self.prepare_candidate_generation(airline_id)
+        if context is None:
+            return None
+        
+        writer = StarSchemaCandidateWriter(
+            context["candidate_dir"], CANDIDATE_COLUMNS, self.departure_times,
+            compression=self.compression, month=int(context["month"]), zone_map_rows=self.zone_map_rows
+        )
+        try:
+            for segment_key, chunk in self.iter_candidate_chunks(context):
+                writer.write_chunk(segment_key, chunk)
+        finally:
+            index = writer.close()
+        
+        print(f"✅ 스타 스키마 저장 완료: 팩트 {index['fact_rows']}건")
+        for name, size in index["sizes"].items():
+            print(f"   - {index['files'][name]}: {size:,} bytes")
+        print(f"🎉 {airline_id} 모든 데이터 저장 완료!")
+        return index
+
+    def save_candidate_outputs(self, airline_id: str, layout: str = "flat", pipeline: bool = False,
+                               queue_size: int = 8, writer_threads: int = 2,
+                               context: Optional[Dict[str, Any]] = None):
+        """레이아웃/모드에 따라 운항후보 데이터 생성・저장 (실패 시 None)
+        
+        context를 넘기면 해당 컨텍스트(대상 월・출력 폴더)로 생성하고, 없으면 랜덤한 한 달을 준비한다.
+        """
+        if layout == "star":
+            result = self.save_candidate_data_star(airline_id, context=context)
+        elif layout == "partitioned":
+            result = self.save_candidate_data_partitioned(airline_id, context=context)
+        elif pipeline:
+            result = self.save_candidate_data_pipelined(
+                airline_id, queue_size=queue_size, writer_threads=writer_threads, context=context
+            )
+        else:
+            data_sets = self.generate_candidate_data(airline_id, context=context)
+            if data_sets is None:
+                return None
+            self.save_candidate_data(airline_id, data_sets, self.last_context["month_partition"])
+            result = {key: len(df) for key, df in data_sets.items()}
+        
+        if result is not None and layout == "flat":
+            # flat 파일에는 대상 월이 없으므로 후속 단계(검증・공동 배분 등)용으로 따로 기록
+            write_flat_index(
+                self.last_context["candidate_dir"], int(self.last_context["month"]),
+                int(self.last_context["max_days"]), self.compression
+            )
+            if self.excel:
+                self.save_candidate_excel(airline_id, self.last_context["month_partition"])
+        # 여러 달 모드는 모든 월을 저장한 뒤 한 번에 적재
+        if result is not None and self.sqlite_path and self.last_context["month_partition"] is None:
+            self.save_candidate_sqlite(airline_id)
+        return result
+    
+    def save_candidate_sqlite(self, airline_id: str) -> Optional[Dict[str, int]]:
+        """저장된 운항후보(+ 최소 운항 기준・공항 시간대 용량)를 SQLite DB에 교체 적재"""
+        # candidate_sqlite → slot_contention_cube → 이 모듈 순환 import를 피하기 위해 여기서 import
+        from candidate_sqlite import CandidateSqliteLoader
+        
+        loader = CandidateSqliteLoader(self.sqlite_path)
+        loader.output_dir = self.output_dir
+        month = int(self.last_context["month"]) if self.last_context else None
+        return loader.load([airline_id], month).get(airline_id)
+    
+    def save_candidate_excel(self, airline_id: str, month_partition: Optional[int] = None) -> Dict[str, int]:
+        """flat 레이아웃 데이터셋별 CSV를 청크 단위로 읽어 candidate_data.xlsx(데이터셋별 시트)로 내보내기"""
+        paths = self.get_candidate_paths(airline_id, month_partition)
+        excel_path = os.path.join(self.get_candidate_dir(airline_id, month_partition), CANDIDATE_EXCEL_FILE)
+        rows = export_csv_to_excel(excel_path, {sheet: paths[key] for key, sheet in CANDIDATE_EXCEL_SHEETS.items()})
+        print(f"✅ 운항후보 Excel 저장 완료: {excel_path} ({sum(rows.values())}건)")
+        return rows
+    
+    def save_candidate_outputs_by_month(self, airline_id: str, months: List[int], layout: str = "flat",
+                                        pipeline: bool = False, queue_size: int = 8,
+                                        writer_threads: int = 2) -> Dict:
+        """지정한 월들을 한 번에 생성하여 candidate/month=<월>/ 아래에 월별로 저장 (실패 시 None)
+        
+        항공사 데이터・노선・비행시간・가격 그리드・운항규모 테이블은 한 번만 준비하고,
+        월마다 다시 하는 것은 날짜 × 출발시각 단위 계산(배치 경로)뿐이다.
+        """
+        print(f"🚀 {airline_id} 운항후보 데이터 {len(months)}개월 생성 시작: {', '.join(f'{m}월' for m in months)}")
+        
+        base = self.prepare_airline_generation(airline_id)
+        if base is None:
+            return None
+        
+        self.generated_contexts = []
+        month_entries = []
+        for month in months:
+            max_days = self.month_days[month]
+            print(f"\n📅 {month}월 1일~{max_days}일 데이터 생성")
+            context = self.build_month_context(base, month, max_days, month_partition=month, batched=True)
+            result = self.save_candidate_outputs(
+                airline_id, layout=layout, pipeline=pipeline,
+                queue_size=queue_size, writer_threads=writer_threads, context=context
+            )
+            if result is None:
+                return None
+            month_entries.append({"month": month, "max_days": max_days, "rows": sum(context["row_counts"].values())})
+        
+        # 데이터셋별로 한 달이라도 후보가 출력된 노선 (generate_routes 순서)
+        emitted = {id(route) for context in self.generated_contexts for route in context["emitted_routes"]}
+        routes = {}
+        for route in base["routes"]:
+            if id(route) in emitted:
+                routes.setdefault(self.get_segment_key(route), []).append(route)
+        
+        index = write_month_index(
+            self.get_candidate_dir(airline_id), layout, self.compression, month_entries, routes
+        )
+        print(f"\n✅ 월별 파티션 저장 완료: {len(month_entries)}개월, 총 {sum(e['rows'] for e in month_entries)}건")
+        for entry in month_entries:
+            print(f"   - {month_partition_dir(entry['month'])}: {entry['rows']}건")
+        if self.sqlite_path:
+            self.save_candidate_sqlite(airline_id)
+        return index
 
 def main():
     """메인 함수"""
-    import sys
+    import argparse
     
     generator = CandidateDataGenerator()
     
     # 명령행 인수 확인
-    if len(sys.argv) != 2:
-        print("❌ 사용법: python generate_candidate_data.py <항공사ID>")
-        print(f"사용 가능한 항공사: {', '.join(generator.airlines)}")
-        print("예시: python generate_candidate_data.py airline_01")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(
+        description="運航候補別の最適収益・優先順位データ生成",
+        usage="python generate_candidate_data.py <항공사ID> [옵션]"
+    )
+    parser.add_argument("airline_id", help="항공사 ID (예: airline_01)")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="노선 청크 생성과 CSV 쓰기를 겹쳐서 실행 (flat 레이아웃, 메모리 사용량 일정)")
+    parser.add_argument("--queue-size", type=int, default=8,
+                        help="파이프라인 모드의 청크 큐 크기 (기본: 8)")
+    parser.add_argument("--writer-threads", type=int, default=2,
+                        help="파이프라인 모드의 CSV 인코딩/쓰기 스레드 수 (기본: 2)")
+    parser.add_argument("--compression", choices=COMPRESSION_CHOICES, default="none",
+                        help="출력 CSV 압축 방식 (기본: none)")
+    parser.add_argument("--layout", choices=["flat", "partitioned", "star"], default="flat",
+                        help="출력 레이아웃 (flat: 데이터셋별 CSV + 통합 CSV, "
+                             "partitioned: type=<데이터셋>/day=<일>/part.csv + partition_index.json, "
+                             "star: route_dim/scale_dim/slot_dim + fact_candidate.csv + star_index.json)")
+    parser.add_argument("--excel", action="store_true",
+                        help="flat 레이아웃 CSV와 함께 데이터셋별 시트의 candidate_data.xlsx도 저장 (write-only 스트리밍)")
+    parser.add_argument("--zone-maps", action="store_true",
+                        help="청크별 min/max 통계 sidecar(<파일>.zonemap.json) 기록 (조건 푸시다운 조회용)")
+    parser.add_argument("--zone-map-rows", type=int, default=DEFAULT_ZONE_MAP_ROWS,
+                        help=f"zone map 청크 행 수 (기본: {DEFAULT_ZONE_MAP_ROWS})")
+    parser.add_argument("--route-day-index", action="store_true",
+                        help="노선×날짜 오프셋 인덱스 sidecar(<파일>.routeday.npz) 기록 "
+                             "(노선×날짜별 상위 k건・기준값 이상 조회용, flat / partitioned 레이아웃)")
+    parser.add_argument("--revenue-floor", choices=["drop", "flag"],
+                        help="収益(円) < 運航可能な最小収益(円)인 후보를 배치 계산 단계에서 제외(drop)하거나 "
+                             "優先順位指数 0으로 표시(flag), 해당 행의 우선순위 계산 생략")
+    parser.add_argument("--top-k", type=int,
+                        help="노선×날짜(또는 노선 전체)별 상위 k건만 출력, 전체 모집단 통계는 population_stats.json에 기록")
+    parser.add_argument("--top-k-scope", choices=TOP_K_SCOPES, default="day",
+                        help="상위 k건 그룹 단위 (day: 노선×날짜, month: 노선별 월 전체, 기본: day)")
+    parser.add_argument("--top-k-by", choices=list(RANK_COLUMNS.keys()), default="priority",
+                        help="상위 k건 순위 기준 (priority: 優先順位指数, revenue: 収益(円), 기본: priority)")
+    parser.add_argument("--mc-samples", type=int,
+                        help="후보마다 수요 배수를 지정한 수만큼 표본 추출하여 収益/需要 P10/P50/P90과 "
+                             "運航可能な最小収益 달성 확률을 monte_carlo_quantiles.csv에 기록 (예: 1000)")
+    parser.add_argument("--no-priority-hashing", action="store_true",
+                        help="優先順位指数의 해시 고유성 점수・미세 조정 계산 생략 (동점은 priority_ranking.py로 결정적 순위 부여)")
+    parser.add_argument("--sqlite", metavar="DB_PATH",
+                        help="저장 후 운항후보・최소 운항 기준・공항 시간대 용량을 SQLite DB에 적재 "
+                             "(예: output/candidates.sqlite, 같은 항공사의 기존 행은 교체)")
+    parser.add_argument("--months",
+                        help="여러 달을 한 번에 생성 (all / 1-6 / 1,4,7 형식), 월별로 candidate/month=<월>/ 아래에 저장. "
+                             "노선・비행시간・가격 그리드・운항규모 테이블은 한 번만 계산")
+    args = parser.parse_args()
+    months = None
+    if args.months:
+        try:
+            months = parse_month_spec(args.months)
+        except ValueError as e:
+            parser.error(f"--months: {e}")
+    generator.compression = normalize_compression(args.compression)
+    if args.excel and args.layout != "flat":
+        parser.error("--excel은 flat 레이아웃에서만 사용할 수 있습니다")
+    generator.excel = args.excel
+    if args.route_day_index and args.layout == "star":
+        parser.error("--route-day-index는 flat / partitioned 레이아웃에서만 사용할 수 있습니다")
+    generator.route_day_index = args.route_day_index
+    if args.mc_samples is not None:
+        if args.mc_samples < 1:
+            parser.error("--mc-samples는 1 이상이어야 합니다")
+        generator.mc_samples = args.mc_samples
+    generator.revenue_floor_mode = args.revenue_floor
+    generator.priority_hashing = not args.no_priority_hashing
+    generator.sqlite_path = args.sqlite
+    if args.top_k is not None:
+        if args.top_k < 1:
+            parser.error("--top-k는 1 이상이어야 합니다")
+        generator.top_k = args.top_k
+        generator.top_k_scope = args.top_k_scope
+        generator.top_k_by = RANK_COLUMNS[args.top_k_by]
+    if args.zone_maps:
+        generator.zone_map_rows = args.zone_map_rows
     
-    airline_id = sys.argv[1]
+    airline_id = args.airline_id
     if airline_id not in generator.airlines:
         print(f"❌ 잘못된 항공사 ID: {airline_id}")
         print(f"사용 가능한 항공사: {', '.join(generator.airlines)}")
@@ -770,13 +1501,20 @@ def main():
         print(f"✅ {airline_id} candidate 폴더 삭제 완료")
     
     # 데이터 생성 및 저장
-    data_sets = generator.generate_candidate_data(airline_id)
-    if data_sets is not None:
-        generator.save_candidate_data(airline_id, data_sets)
-        print(f"🎉 {airline_id} 데이터 생성 완료!")
+    if months:
+        result = generator.save_candidate_outputs_by_month(
+            airline_id, months, layout=args.layout, pipeline=args.pipeline,
+            queue_size=args.queue_size, writer_threads=args.writer_threads
+        )
     else:
+        result = generator.save_candidate_outputs(
+            airline_id, layout=args.layout, pipeline=args.pipeline,
+            queue_size=args.queue_size, writer_threads=args.writer_threads
+        )
+    if result is None:
         print(f"❌ {airline_id} 데이터 생성 실패")
         sys.exit(1)
+    print(f"🎉 {airline_id} 데이터 생성 완료!")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main() 
@@ -10,11 +10,66 @@ import sys
 import json
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple
+from typing import Dict, List, Tuple, Optional
+
+from artifact_reader import ArtifactReader
+from candidate_months import load_month_index, month_route_frame
+from candidate_partitions import load_partition_index, partition_route_frame
+from candidate_star_schema import load_star_index, star_route_frame
+from excel_io import EXCEL_SHEET_NAMES, write_excel_frames
+from output_compression import (
+    COMPRESSION_CHOICES, normalize_compression, output_path, pandas_compression
+)
+
+# 국내선 (거리별 인기도)
+DOMESTIC_POPULARITY = {
+    "羽田-関西": 0.95,    # 도쿄-오사카 (매우 인기)
+    "羽田-中部": 0.90,    # 도쿄-나고야 (매우 인기)
+    "羽田-福岡": 0.85,    # 도쿄-후쿠오카 (인기)
+    "関西-中部": 0.80,    # 오사카-나고야 (인기)
+    "関西-福岡": 0.75,    # 오사카-후쿠오카 (보통)
+    "中部-福岡": 0.70,    # 나고야-후쿠오카 (보통)
+    "新千歳-那覇": 0.65,  # 삿포로-오키나와 (보통)
+}
+
+# 국제선 (거리별 인기도)
+INTERNATIONAL_POPULARITY = {
+    "羽田-金海": 0.95,        # 도쿄-부산 (매우 인기)
+    "羽田-仁川": 0.95,        # 도쿄-인천 (매우 인기)
+    "羽田-桃園": 0.90,        # 도쿄-타이페이 (인기)
+    "羽田-北京大興": 0.85,    # 도쿄-베이징 (인기)
+    "関西-金海": 0.85,        # 오사카-부산 (인기)
+    "関西-仁川": 0.85,        # 오사카-인천 (인기)
+    "関西-桃園": 0.80,        # 오사카-타이페이 (보통)
+    "関西-北京大興": 0.75,    # 오사카-베이징 (보통)
+    "福岡-金海": 0.90,        # 후쿠오카-부산 (매우 인기)
+    "福岡-仁川": 0.90,        # 후쿠오카-인천 (매우 인기)
+    "福岡-桃園": 0.85,        # 후쿠오카-타이페이 (인기)
+    "福岡-北京大興": 0.70,    # 후쿠오카-베이징 (보통)
+}
+
+# 거리 기반 인기도 기본값 (목록에 없는 노선)
+DEFAULT_DISTANCE_POPULARITY = 0.6
+
+# 비즈니스/관광 중심지 연결 노선
+BUSINESS_ROUTES = frozenset([
+    "羽田-関西", "関西-羽田",      # 도쿄-오사카 (비즈니스)
+    "羽田-中部", "中部-羽田",      # 도쿄-나고야 (비즈니스)
+    "羽田-金海", "金海-羽田",      # 도쿄-부산 (비즈니스+관광)
+    "羽田-仁川", "仁川-羽田",      # 도쿄-인천 (비즈니스+관광)
+    "関西-金海", "金海-関西",      # 오사카-부산 (비즈니스+관광)
+    "関西-仁川", "仁川-関西",      # 오사카-인천 (비즈니스+관광)
+])
+
+# 노선 테이블 컬럼
+ROUTE_TABLE_COLUMNS = ["出発国家", "出発空港", "到着国家", "到着空港", "type"]
 
 class MinimumOperationsGenerator:
     def __init__(self):
         self.output_dir = "output"
+        self.compression = None  # 출력 압축 방식 (None/"gzip"/"xz"/"bz2")
+        self.excel = False  # True면 CSV와 같은 내용의 .xlsx도 기록 (write-only 스트리밍)
+        self.artifact_reader = ArtifactReader()
     
     def load_airline_data(self, airline_id: str) -> Tuple[Dict, Dict]:
         """항공사별 internal_resource_data.json과 profile.py 로드"""
@@ -39,54 +94,86 @@ class MinimumOperationsGenerator:
             print(f"❌ Error loading data for {airline_id}: {e}")
             return None, None
     
+    def read_unique_routes(self, airline_id: str, segment_key: str) -> pd.DataFrame:
+        """candidate 데이터셋의 고유 노선 테이블 (flat CSV・Excel, 파티션 인덱스, 스타 스키마 노선 차원 또는 월별 인덱스에서)"""
+        candidate_dir = os.path.join(self.output_dir, airline_id, "analytics_data", "candidate")
+        
+        df = self.artifact_reader.read(os.path.join(self.output_dir, airline_id), f"candidate_{segment_key}")
+        if df is not None:
+            # 고유한 노선만 추출 (출발공항 + 도착공항 기준)
+            return df[['出発空港', '到着空港', '出発国家', '到着国家']].drop_duplicates()
+        
+        # 파티션 레이아웃은 인덱스의 노선 목록 사용 (데이터 파일을 읽지 않음)
+        index = load_partition_index(candidate_dir)
+        if index is not None:
+            return partition_route_frame(index, segment_key)
+        
+        # 스타 스키마 레이아웃은 노선 차원 테이블 사용 (팩트 테이블을 읽지 않음)
+        star_index = load_star_index(candidate_dir)
+        if star_index is not None:
+            return star_route_frame(star_index, candidate_dir, segment_key)
+        
+        # 여러 달 레이아웃은 인덱스의 전체 월 노선 합집합 사용
+        month_index = load_month_index(candidate_dir)
+        if month_index is not None:
+            return month_route_frame(month_index, segment_key)
+        
+        return None
+    
     def extract_existing_routes(self, airline_id: str) -> List[Dict]:
         """기존 candidate 데이터에서 노선 정보 추출"""
+        route_table = self.extract_route_table(airline_id)
+        return [
+            {
+                "departure": row['出発空港'],
+                "arrival": row['到着空港'],
+                "departure_country": row['出発国家'],
+                "arrival_country": row['到着国家'],
+                "type": row['type']
+            }
+            for row in route_table.to_dict('records')
+        ]
+    
+    def extract_route_table(self, airline_id: str) -> pd.DataFrame:
+        """기존 candidate 데이터에서 노선 테이블 추출 (ROUTE_TABLE_COLUMNS, 노선 순서는 extract_existing_routes와 동일)"""
         print(f"📂 {airline_id} 기존 노선 정보 추출 중...")
         
-        all_routes = []
+        tables = []
         
-        # 국제선 출발 데이터에서 노선 추출
-        international_path = os.path.join(
-            self.output_dir, airline_id, "analytics_data", "candidate", 
-            "international_departure.csv"
-        )
-        
-        if os.path.exists(international_path):
-            df = pd.read_csv(international_path)
-            # 고유한 노선만 추출 (출발공항 + 도착공항 기준)
-            unique_international = df[['出発空港', '到着空港', '出発国家', '到着国家']].drop_duplicates()
+        # 국제선 출발 데이터 / 국내선 데이터에서 노선 추출
+        for segment_key, route_type in [("international_departure", "international"), ("domestic", "domestic")]:
+            unique_routes = self.read_unique_routes(airline_id, segment_key)
+            if unique_routes is None:
+                continue
             
-            for _, row in unique_international.iterrows():
-                all_routes.append({
-                    "departure": row['出発空港'],
-                    "arrival": row['到着空港'],
-                    "departure_country": row['出発国家'],
-                    "arrival_country": row['到着国家'],
-                    "type": "international"
-                })
-        
-        # 국내선 데이터에서 노선 추출
-        domestic_path = os.path.join(
-            self.output_dir, airline_id, "analytics_data", "candidate", 
-            "domestic.csv"
-        )
+            table = unique_routes[['出発国家', '出発空港', '到着国家', '到着空港']].copy()
+            table['type'] = route_type
+            tables.append(table)
         
-        if os.path.exists(domestic_path):
-            df = pd.read_csv(domestic_path)
-            # 고유한 노선만 추출 (출발공항 + 도착공항 기준)
-            unique_domestic = df[['出発空港', '到着空港', '出発国家', '到着国家']].drop_duplicates()
-            
-            for _, row in unique_domestic.iterrows():
-                all_routes.append({
-                    "departure": row['出発空港'],
-                    "arrival": row['到着空港'],
-                    "departure_country": row['出発国家'],
-                    "arrival_country": row['到着国家'],
-                    "type": "domestic"
-                })
-        
-        print(f"✅ {airline_id} 노선 추출 완료: {len(all_routes)}개 노선")
-        return all_routes
+        if tables:
+            route_table = pd.concat(tables, ignore_index=True)
+        else:
+            route_table = pd.DataFrame(columns=ROUTE_TABLE_COLUMNS)
+        
+        print(f"✅ {airline_id} 노선 추출 완료: {len(route_table)}개 노선")
+        return route_table
+    
+    def build_route_table(self, routes: List[Dict]) -> pd.DataFrame:
+        """CandidateDataGenerator.generate_routes 형식의 노선 목록에서 노선 테이블 생성 (파일 읽기 없음)
+        
+        extract_route_table과 같이 국제선은 일본 출발 방향만, 국제선 → 국내선 순서로 담는다.
+        """
+        international = [r for r in routes if r["type"] == "international" and r.get("direction", "departure") == "departure"]
+        domestic = [r for r in routes if r["type"] == "domestic"]
+        route_table = pd.DataFrame(
+            [
+                [r["departure_country"], r["departure"], r["arrival_country"], r["arrival"], r["type"]]
+                for r in international + domestic
+            ],
+            columns=ROUTE_TABLE_COLUMNS
+        )
+        print(f"✅ 전달받은 노선 사용: {len(route_table)}개 노선")
+        return route_table
     
     def determine_minimum_operations(self, route: Dict, airline_profile: Dict) -> int:
         """노선별 월별 최소 운항 횟수 결정 (노선 인기도 + 항공사 전략 고려)"""
@@ -146,35 +233,10 @@ class MinimumOperationsGenerator:
     
     def get_distance_popularity(self, departure: str, arrival: str) -> float:
         """거리 기반 인기도 (가까울수록 높음)"""
-        # 주요 공항 간 거리별 인기도 (실제 데이터 기반)
+        # 주요 공항 간 거리별 인기도 (실제 데이터 기반, DOMESTIC_POPULARITY / INTERNATIONAL_POPULARITY)
         route_key = f"{departure}-{arrival}"
-        
-        # 국내선 (거리별 인기도)
-        domestic_popularity = {
-            "羽田-関西": 0.95,    # 도쿄-오사카 (매우 인기)
-            "羽田-中部": 0.90,    # 도쿄-나고야 (매우 인기)
-            "羽田-福岡": 0.85,    # 도쿄-후쿠오카 (인기)
-            "関西-中部": 0.80,    # 오사카-나고야 (인기)
-            "関西-福岡": 0.75,    # 오사카-후쿠오카 (보통)
-            "中部-福岡": 0.70,    # 나고야-후쿠오카 (보통)
-            "新千歳-那覇": 0.65,  # 삿포로-오키나와 (보통)
-        }
-        
-        # 국제선 (거리별 인기도)
-        international_popularity = {
-            "羽田-金海": 0.95,        # 도쿄-부산 (매우 인기)
-            "羽田-仁川": 0.95,        # 도쿄-인천 (매우 인기)
-            "羽田-桃園": 0.90,        # 도쿄-타이페이 (인기)
-            "羽田-北京大興": 0.85,    # 도쿄-베이징 (인기)
-            "関西-金海": 0.85,        # 오사카-부산 (인기)
-            "関西-仁川": 0.85,        # 오사카-인천 (인기)
-            "関西-桃園": 0.80,        # 오사카-타이페이 (보통)
-            "関西-北京大興": 0.75,    # 오사카-베이징 (보통)
-            "福岡-金海": 0.90,        # 후쿠오카-부산 (매우 인기)
-            "福岡-仁川": 0.90,        # 후쿠오카-인천 (매우 인기)
-            "福岡-桃園": 0.85,        # 후쿠오카-타이페이 (인기)
-            "福岡-北京大興": 0.70,    # 후쿠오카-베이징 (보통)
-        }
+        domestic_popularity = DOMESTIC_POPULARITY
+        international_popularity = INTERNATIONAL_POPULARITY
         
         # 정방향과 역방향 모두 확인
         if route_key in domestic_popularity:
@@ -190,22 +252,12 @@ class MinimumOperationsGenerator:
             return international_popularity[reverse_key]
         
         # 기본값 (거리 추정)
-        return 0.6
+        return DEFAULT_DISTANCE_POPULARITY
     
     def get_popular_route_bonus(self, departure: str, arrival: str) -> float:
         """특정 인기 노선 보너스"""
-        # 비즈니스/관광 중심지 연결 노선
-        business_routes = [
-            "羽田-関西", "関西-羽田",      # 도쿄-오사카 (비즈니스)
-            "羽田-中部", "中部-羽田",      # 도쿄-나고야 (비즈니스)
-            "羽田-金海", "金海-羽田",      # 도쿄-부산 (비즈니스+관광)
-            "羽田-仁川", "仁川-羽田",      # 도쿄-인천 (비즈니스+관광)
-            "関西-金海", "金海-関西",      # 오사카-부산 (비즈니스+관광)
-            "関西-仁川", "仁川-関西",      # 오사카-인천 (비즈니스+관광)
-        ]
-        
         route_key = f"{departure}-{arrival}"
-        if route_key in business_routes:
+        if route_key in BUSINESS_ROUTES:  # 비즈니스/관광 중심지 연결 노선
             return 0.2  # 20% 보너스
         
         return 0.0
@@ -323,8 +375,154 @@ class MinimumOperationsGenerator:
         
         return np.random.randint(base_min, base_max + 1)
     
-    def generate_minimum_operations_data(self, airline_id: str) -> pd.DataFrame:
-        """항공사별 운항 최소 배분 기준 데이터 생성"""
+    def build_route_lookup(self, table: Dict[str, float], airport_ids: Dict[str, int],
+                           reverse: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+        """"출발-도착" 키 테이블을 정수 키(출발ID × 공항수 + 도착ID) 정렬 배열과 값 배열로 변환
+        
+        reverse=True이면 역방향 노선(도착-출발)의 키로 등록한다. 노선 테이블에 없는 공항은 제외.
+        """
+        n_airports = len(airport_ids)
+        codes = []
+        values = []
+        for route_key, value in table.items():
+            first, second = route_key.split("-")
+            if first not in airport_ids or second not in airport_ids:
+                continue
+            if reverse:
+                first, second = second, first
+            codes.append(airport_ids[first] * n_airports + airport_ids[second])
+            values.append(value)
+        codes = np.array(codes, dtype=np.int64)
+        values = np.array(values, dtype=np.float64)
+        order = np.argsort(codes, kind='stable')
+        return codes[order], values[order]
+    
+    def lookup_route_values(self, route_codes: np.ndarray, table_codes: np.ndarray,
+                            table_values: np.ndarray, result: np.ndarray) -> np.ndarray:
+        """정수 키 조회 결과를 result에 덮어쓰기 (테이블에 없는 노선은 그대로)"""
+        if len(table_codes) == 0:
+            return result
+        positions = np.minimum(np.searchsorted(table_codes, route_codes), len(table_codes) - 1)
+        found = table_codes[positions] == route_codes
+        result[found] = table_values[positions[found]]
+        return result
+    
+    def calculate_route_popularity_batch(self, departures: np.ndarray, arrivals: np.ndarray,
+                                         is_domestic: np.ndarray, airline_profile: Dict) -> np.ndarray:
+        """calculate_route_popularity의 배열 버전 (인기도/비즈니스 노선 테이블은 한 번만 정수 키로 변환)"""
+        airports, codes = np.unique(np.concatenate([departures, arrivals]).astype(str), return_inverse=True)
+        airport_ids = {name: i for i, name in enumerate(airports.tolist())}
+        route_codes = codes[:len(departures)] * len(airports) + codes[len(departures):]
+        
+        # 1. 거리 기반 인기도: 우선순위가 낮은 것부터 덮어쓰기
+        #    (정방향 국내선 > 정방향 국제선 > 역방향 국내선 > 역방향 국제선 > 기본값)
+        distance_factor = np.full(len(departures), DEFAULT_DISTANCE_POPULARITY)
+        for table, reverse in [(INTERNATIONAL_POPULARITY, True), (DOMESTIC_POPULARITY, True),
+                               (INTERNATIONAL_POPULARITY, False), (DOMESTIC_POPULARITY, False)]:
+            self.lookup_route_values(route_codes, *self.build_route_lookup(table, airport_ids, reverse), distance_factor)
+        
+        # 2. 노선 타입별 기본 인기도
+        type_factor = np.where(is_domestic, 0.8, 0.6)
+        
+        # 3. 특정 인기 노선 보너스
+        popular_bonus = np.zeros(len(departures))
+        business_table = {route_key: 0.2 for route_key in BUSINESS_ROUTES}
+        self.lookup_route_values(route_codes, *self.build_route_lookup(business_table, airport_ids), popular_bonus)
+        
+        # 4. 브랜드 인지도 / 5. 기본 수요 영향
+        brand_factor = airline_profile.get("brand_recognition", 0.5)
+        demand_factor = min(airline_profile.get("base_demand", 100) / 150.0, 1.0)
+        
+        popularity = (distance_factor * 0.3 + 
+                      type_factor * 0.25 + 
+                      popular_bonus * 0.2 + 
+                      brand_factor * 0.15 + 
+                      demand_factor * 0.1)
+        return np.clip(popularity, 0.0, 1.0)
+    
+    def calculate_strategic_weight_batch(self, is_domestic: np.ndarray, airline_profile: Dict) -> np.ndarray:
+        """calculate_strategic_weight의 배열 버전"""
+        brand_recognition = airline_profile.get("brand_recognition", 0.5)
+        international_focus = airline_profile.get("international_focus", 0.5)
+        domestic_focus = airline_profile.get("domestic_focus", 0.5)
+        
+        brand_strategy = brand_recognition * 0.4
+        type_strategy = np.where(is_domestic, domestic_focus * 0.3, international_focus * 0.3)
+        size_strategy = np.where(is_domestic & (brand_recognition < 0.4), 0.2, 0.0)
+        competitive_strategy = np.where(is_domestic & (brand_recognition < 0.5), 0.1, 0.0)
+        
+        total_strategy = brand_strategy + type_strategy + size_strategy + competitive_strategy
+        return np.clip(total_strategy, 0.0, 1.0)
+    
+    def determine_monthly_operation_bands(self, is_domestic: np.ndarray, route_popularity: np.ndarray,
+                                          strategic_weight: np.ndarray,
+                                          airline_profile: Dict) -> Tuple[np.ndarray, np.ndarray]:
+        """determine_international/domestic_monthly_operations의 (최소, 최대) 범위를 배열로 계산"""
+        brand_recognition = airline_profile.get("brand_recognition", 0.5)
+        base_demand = airline_profile.get("base_demand", 100)
+        
+        # 1. 노선 인기도에 따른 범위 (국제선 / 국내선)
+        popularity_levels = [route_popularity > 0.9, route_popularity > 0.7, route_popularity > 0.5]
+        base_min = np.where(
+            is_domestic,
+            np.select(popularity_levels, [8, 7, 6], default=4),
+            np.select(popularity_levels, [6, 5, 4], default=3)
+        )
+        base_max = np.where(
+            is_domestic,
+            np.select(popularity_levels, [15, 12, 10], default=8),
+            np.select(popularity_levels, [10, 8, 7], default=6)
+        )
+        
+        # 2. 항공사 전략적 가중치에 따른 조정
+        strategy_bonus = np.select([strategic_weight > 0.8, strategic_weight > 0.6], [2, 1], default=0)
+        base_min = np.minimum(base_min + strategy_bonus, base_max)
+        
+        # 3. 소형 항공사 국내선 전략 (국내선만)
+        if brand_recognition < 0.4:
+            small_carrier = is_domestic & (route_popularity > 0.7)
+            base_min = np.where(small_carrier, np.minimum(base_min + 2, base_max), base_min)
+            base_max = np.where(small_carrier, np.minimum(base_max + 3, 18), base_max)
+        
+        # 4. 브랜드 인지도와 기본 수요에 따른 조정 (항공사 단위 조건)
+        if brand_recognition > 0.8 and base_demand > 120:
+            international_bonus = True
+        else:
+            international_bonus = brand_recognition > 0.6 and base_demand > 100
+        if brand_recognition > 0.7 and base_demand > 100:
+            domestic_bonus = True
+        else:
+            domestic_bonus = brand_recognition > 0.5 and base_demand > 80
+        brand_bonus = np.where(is_domestic, domestic_bonus, international_bonus)
+        base_min = np.where(brand_bonus, np.minimum(base_min + 1, base_max), base_min)
+        
+        return base_min, base_max
+    
+    def determine_minimum_operations_batch(self, route_table: pd.DataFrame, airline_profile: Dict) -> np.ndarray:
+        """노선 테이블 전체의 월별 최소 운항 횟수를 한 번에 결정
+        
+        determine_minimum_operations를 노선 순서대로 호출한 것과 같은 값이 나온다
+        (난수는 노선별 범위 배열로 한 번에 추출).
+        """
+        if len(route_table) == 0:
+            return np.zeros(0, dtype=np.int64)
+        
+        departures = route_table["出発空港"].to_numpy()
+        arrivals = route_table["到着空港"].to_numpy()
+        is_domestic = route_table["type"].to_numpy() != "international"
+        
+        route_popularity = self.calculate_route_popularity_batch(departures, arrivals, is_domestic, airline_profile)
+        strategic_weight = self.calculate_strategic_weight_batch(is_domestic, airline_profile)
+        base_min, base_max = self.determine_monthly_operation_bands(
+            is_domestic, route_popularity, strategic_weight, airline_profile
+        )
+        return np.random.randint(base_min, base_max + 1)
+    
+    def generate_minimum_operations_data(self, airline_id: str, routes: Optional[List[Dict]] = None) -> pd.DataFrame:
+        """항공사별 운항 최소 배분 기준 데이터 생성
+        
+        routes(CandidateDataGenerator.generate_routes 형식)를 넘기면 candidate 파일을 다시 읽지 않는다.
+        """
         print(f"🚀 {airline_id} 운항 최소 배분 기준 데이터 생성 시작...")
         
         # 항공사 데이터 로드
@@ -332,35 +530,45 @@ class MinimumOperationsGenerator:
         if not internal_data or not airline_profile:
             return None
         
-        # 노선 생성
-        routes = self.extract_existing_routes(airline_id)
-        
-        # 데이터 생성
-        data = []
-        for route in routes:
-            min_operations = self.determine_minimum_operations(route, airline_profile)
-            
-            row = {
-                "出発国家": route["departure_country"],
-                "出発空港": route["departure"],
-                "到着国家": route["arrival_country"],
-                "到着空港": route["arrival"],
-                "最低維持月別運航回数": min_operations
-            }
-            data.append(row)
+        # 노선 테이블 추출 (같은 프로세스에서 전달받은 노선이 있으면 그대로 사용)
+        if routes is not None:
+            route_table = self.build_route_table(routes)
+        else:
+            route_table = self.extract_route_table(airline_id)
         
-        df = pd.DataFrame(data)
+        # 데이터 생성 (노선 테이블 전체를 배열로 일괄 계산)
+        df = self.build_minimum_operations_frame(route_table, airline_profile)
         print(f"✅ {airline_id} 데이터 생성 완료: {len(df)}개 노선")
         return df
     
+    def build_minimum_operations_frame(self, route_table: pd.DataFrame, airline_profile: Dict) -> pd.DataFrame:
+        """노선 테이블로 월별 최소 운항 기준 DataFrame 생성"""
+        if len(route_table) == 0:
+            return pd.DataFrame()
+        return pd.DataFrame({
+            "出発国家": route_table["出発国家"].to_numpy(),
+            "出発空港": route_table["出発空港"].to_numpy(),
+            "到着国家": route_table["到着国家"].to_numpy(),
+            "到着空港": route_table["到着空港"].to_numpy(),
+            "最低維持月別運航回数": self.determine_minimum_operations_batch(route_table, airline_profile)
+        })
+    
     def save_minimum_operations_data(self, airline_id: str, df: pd.DataFrame):
         """운항 최소 배분 기준 데이터를 Excel로 저장"""
         print(f"💾 {airline_id} 데이터 저장 시작...")
         
         # CSV 파일로 저장
-        output_path = os.path.join(self.output_dir, airline_id, "monthly_minimum_operations_standard.csv")
-        df.to_csv(output_path, index=False, encoding='utf-8-sig')
-        print(f"✅ {airline_id} 월별 최소 운항 기준 CSV 저장 완료: {output_path}")
+        csv_path = output_path(
+            os.path.join(self.output_dir, airline_id, "monthly_minimum_operations_standard.csv"),
+            self.compression
+        )
+        df.to_csv(csv_path, index=False, encoding='utf-8-sig', compression=pandas_compression(self.compression))
+        print(f"✅ {airline_id} 월별 최소 운항 기준 CSV 저장 완료: {csv_path}")
+        
+        if self.excel:
+            excel_path = os.path.join(self.output_dir, airline_id, "monthly_minimum_operations_standard.xlsx")
+            write_excel_frames(excel_path, {EXCEL_SHEET_NAMES["monthly_minimum_operations_standard"]: df})
+            print(f"✅ {airline_id} 월별 최소 운항 기준 Excel 저장 완료: {excel_path}")
     
     def generate_all_airlines(self):
         """모든 항공사의 운항 최소 배분 기준 데이터 생성"""
@@ -396,18 +604,21 @@ class MinimumOperationsGenerator:
 
 def main():
     """메인 함수"""
-    import sys
+    import argparse
     
     generator = MinimumOperationsGenerator()
     
     # 명령행 인수 확인
-    if len(sys.argv) != 2:
-        print("❌ 사용법: python generate_minimum_operations.py <항공사ID>")
-        print("사용 가능한 항공사: airline_01 ~ airline_15")
-        print("예시: python generate_minimum_operations.py airline_01")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(usage="python generate_minimum_operations.py <항공사ID> [옵션]")
+    parser.add_argument("airline_id", help="항공사 ID (airline_01 ~ airline_15)")
+    parser.add_argument("--compression", choices=COMPRESSION_CHOICES, default="none",
+                        help="출력 CSV 압축 방식 (기본: none)")
+    parser.add_argument("--excel", action="store_true", help="CSV와 함께 .xlsx 파일도 저장")
+    args = parser.parse_args()
+    generator.compression = normalize_compression(args.compression)
+    generator.excel = args.excel
     
-    airline_id = sys.argv[1]
+    airline_id = args.airline_id
     
     # 항공사 ID 유효성 검사
     valid_airlines = [f"airline_{i:02d}" for i in range(1, 16)]
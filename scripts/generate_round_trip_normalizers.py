@@ -9,9 +9,9 @@ import os
 import sys
 import importlib.util
 
-def load_airline_profile(airline_id: str) -> dict:
+def load_airline_profile(airline_id: str, output_dir: str = "output") -> dict:
     """항공사별 profile.py 로드"""
-    profile_path = os.path.join("output", airline_id, "profile.py")
+    profile_path = os.path.join(output_dir, airline_id, "profile.py")
     
     # 동적으로 profile.py 모듈 로드
     spec = importlib.util.spec_from_file_location("profile", profile_path)
@@ -62,7 +62,8 @@ def get_airline_description(airline_id: str, profile: dict) -> str:
     
     return f"{airline_id} ({scale_desc} 규모 보유 - {size_desc})"
 
-def generate_typescript_file(airline_id: str, profile: dict, resource_weight: float, priority_weight: float):
+def generate_typescript_file(airline_id: str, profile: dict, resource_weight: float, priority_weight: float,
+                             output_dir: str = "output"):
     """TypeScript 정규화 함수 파일 생성"""
     
     description = get_airline_description(airline_id, profile)
@@ -185,10 +186,10 @@ export default normalizeRoundTripPriority;
 '''
     
     # 파일 저장
-    output_dir = os.path.join("output", airline_id, "analytics_data")
-    os.makedirs(output_dir, exist_ok=True)
+    analytics_dir = os.path.join(output_dir, airline_id, "analytics_data")
+    os.makedirs(analytics_dir, exist_ok=True)
     
-    output_path = os.path.join(output_dir, "round_trip_priority_normalizer.ts")
+    output_path = os.path.join(analytics_dir, "round_trip_priority_normalizer.ts")
     with open(output_path, 'w', encoding='utf-8') as f:
         f.write(typescript_content)
     
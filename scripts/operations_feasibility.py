@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+最低維持月別運航回数 실행 가능성 검사기
+월별 최소 운항 기준(monthly_minimum_operations_standard)을 연계공항 시간대별 割り当て可能回数
+(airport_schedule_data) 안에서 실제로 배정할 수 있는지 최대유량으로 확인하고,
+부족한 노선과 병목 공항을 보고한다.
+
+네트워크: source → 노선(출발측 / 도착측, 용량 = 최저維持月別運航回数)
+         → 공항 × 날짜 × 시간대 (노선・날짜・출발시각마다 용량 1)
+         → sink (용량 = 割り当て可能回数)
+항공편 하나는 출발공항의 출발 시간대와 도착공항의 도착 시간대(출발 + 비행시간)를 함께 쓰므로
+노선마다 출발측・도착측으로 한 번씩 흘리고 공항 시간대 용량은 출발・도착이 공유한다.
+출발・도착 시각의 짝은 강제하지 않는 완화 모델이므로, 이 검사를 통과하지 못하면 어떤 배정도 불가능하다.
+"""
+
+import os
+import sys
+import json
+import pandas as pd
+import numpy as np
+from typing import Dict, List, Tuple, Optional
+
+from flow_network import FlowNetwork
+from generate_candidate_data import CandidateDataGenerator
+from artifact_reader import ArtifactReader
+
+FEASIBILITY_REPORT_FILE = "operations_feasibility.json"
+
+SCHEDULE_SLOT_COLUMN = "割り当て可能時間帯（割り当て可能回数）"
+
+# 시간대 길이 (분, 공항 스케줄 데이터와 같은 30분 간격)
+SLOT_MINUTES = 30
+
+
+class OperationsFeasibilityChecker:
+    def __init__(self):
+        self.output_dir = "output"
+        self.flight_time_source = CandidateDataGenerator()  # 노선별 비행시간 계산 (운항후보와 같은 값)
+        self.artifact_reader = ArtifactReader()
+
+    def load_minimum_operations(self, airline_id: str) -> Optional[pd.DataFrame]:
+        """월별 최소 운항 기준 로드 (CSV・압축 CSV・Excel, analytics_data/ 포함, 없으면 None)"""
+        df = self.artifact_reader.read(os.path.join(self.output_dir, airline_id), "minimum_operations")
+        if df is None:
+            print(f"❌ {airline_id} 월별 최소 운항 기준 파일이 없습니다")
+        return df
+
+    def load_airport_schedule(self, airline_id: str) -> Optional[pd.DataFrame]:
+        """공항 스케줄 데이터 로드 (CSV・압축 CSV・Excel, analytics_data/ 포함, 없으면 None)"""
+        df = self.artifact_reader.read(os.path.join(self.output_dir, airline_id), "airport_schedule")
+        if df is None:
+            print(f"❌ {airline_id} 공항 스케줄 데이터 파일이 없습니다")
+        return df
+
+    def build_capacity_cube(self, schedule: pd.DataFrame) -> Tuple[List[str], List[str], np.ndarray]:
+        """공항 스케줄 DataFrame을 (공항 목록, 시간대 라벨, 공항 × 날짜 × 시간대 할당 가능 횟수)로 변환"""
+        airports = list(dict.fromkeys(schedule["空港"].tolist()))
+        if schedule.empty:
+            return airports, [], np.zeros((0, 0, 0), dtype=np.int64)
+
+        airport_ids = {airport: i for i, airport in enumerate(airports)}
+        days = schedule["日付"].astype(str).str.replace("日", "", regex=False).astype(int).to_numpy()
+        slot_rows = [json.loads(value) for value in schedule[SCHEDULE_SLOT_COLUMN]]
+        labels = [slot["時間帯"] for slot in slot_rows[0]]
+
+        cube = np.zeros((len(airports), int(days.max()), len(labels)), dtype=np.int64)
+        counts = np.array([[slot["割り当て可能回数"] for slot in row] for row in slot_rows], dtype=np.int64)
+        airport_index = schedule["空港"].map(airport_ids).to_numpy()
+        cube[airport_index, days - 1] = counts
+        return airports, labels, cube
+
+    def build_network(self, minimum_operations: pd.DataFrame, airports: List[str],
+                      cube: np.ndarray) -> Dict:
+        """노선 × 날짜 × 시간대 유량 네트워크 생성
+
+        노드 번호: 0 = source, 1 = sink, 2.. = 노선 출발측, 노선 도착측, 공항 × 날짜 × 시간대 순서.
+        """
+        route_count = len(minimum_operations)
+        airport_count, day_count, slot_count = cube.shape
+        dep_base = 2
+        arr_base = dep_base + route_count
+        slot_base = arr_base + route_count
+        network = FlowNetwork(slot_base + airport_count * day_count * slot_count)
+
+        required = minimum_operations["最低維持月別運航回数"].to_numpy(dtype=np.int64)
+        route_nodes = np.arange(route_count, dtype=np.int64)
+        dep_edges = network.add_edges(np.zeros(route_count), dep_base + route_nodes, required)
+        arr_edges = network.add_edges(np.zeros(route_count), arr_base + route_nodes, required)
+
+        # 노선별 출발 가능 시간대: 도착 시간대(출발 + 비행시간)도 운영 시간 안에 있어야 한다
+        airport_ids = {airport: i for i, airport in enumerate(airports)}
+        day_offsets = (np.arange(day_count, dtype=np.int64) * slot_count)[:, None]
+        for i, route in enumerate(minimum_operations[["出発空港", "到着空港"]].itertuples(index=False)):
+            flight_time = self.flight_time_source.calculate_flight_time(route.出発空港, route.到着空港)
+            offset = -(-flight_time // SLOT_MINUTES)
+            origin = airport_ids.get(route.出発空港)
+            destination = airport_ids.get(route.到着空港)
+            if origin is None or destination is None or offset >= slot_count:
+                continue
+            departure_slots = np.arange(slot_count - offset, dtype=np.int64)[None, :]
+            origin_nodes = slot_base + origin * day_count * slot_count + day_offsets + departure_slots
+            destination_nodes = slot_base + destination * day_count * slot_count + day_offsets + departure_slots + offset
+            network.add_edges(np.full(origin_nodes.size, dep_base + i), origin_nodes, 1)
+            network.add_edges(np.full(destination_nodes.size, arr_base + i), destination_nodes, 1)
+
+        slot_nodes = slot_base + np.arange(cube.size, dtype=np.int64)
+        network.add_edges(slot_nodes, np.ones(cube.size), cube.ravel())
+
+        return {
+            "network": network,
+            "dep_edges": dep_edges,
+            "arr_edges": arr_edges,
+            "required": required,
+            "slot_base": slot_base
+        }
+
+    def check(self, minimum_operations: pd.DataFrame, schedule: pd.DataFrame) -> Dict:
+        """최소 운항 기준이 공항 시간대 용량 안에서 배정 가능한지 검사, 보고서 dict 반환"""
+        airports, labels, cube = self.build_capacity_cube(schedule)
+        model = self.build_network(minimum_operations, airports, cube)
+        network = model["network"]
+
+        flow = network.max_flow(0, 1)
+        required = model["required"]
+        departure_flow = network.flows(model["dep_edges"])
+        arrival_flow = network.flows(model["arr_edges"])
+        assigned = np.minimum(departure_flow, arrival_flow)
+
+        blocking_routes = []
+        for i, row in enumerate(minimum_operations.itertuples(index=False)):
+            if assigned[i] >= required[i]:
+                continue
+            blocking_routes.append({
+                "出発空港": row.出発空港,
+                "到着空港": row.到着空港,
+                "最低維持月別運航回数": int(required[i]),
+                "配分可能回数": int(assigned[i]),
+                "不足回数": int(required[i] - assigned[i]),
+                "出発側不足": int(required[i] - departure_flow[i]),
+                "到着側不足": int(required[i] - arrival_flow[i])
+            })
+
+        # 최소 컷에 걸린 공항 시간대 (source 쪽에 남은 시간대 노드의 sink 간선은 모두 포화 상태)
+        blocking_airports = []
+        if blocking_routes:
+            source_side = network.source_side(0)
+            slot_base = model["slot_base"]
+            cut_slots = source_side[slot_base:slot_base + cube.size].reshape(cube.shape)
+            for a, airport in enumerate(airports):
+                if not cut_slots[a].any():
+                    continue
+                days, slots = np.nonzero(cut_slots[a])
+                blocking_airports.append({
+                    "空港": airport,
+                    "飽和時間帯数": int(len(days)),
+                    "飽和割り当て可能回数": int(cube[a][days, slots].sum()),
+                    "飽和日付": [f"{day}日" for day in np.unique(days + 1).tolist()],
+                    "飽和時間帯": [labels[s] for s in np.unique(slots).tolist()]
+                })
+            blocking_airports.sort(key=lambda a: a["飽和割り当て可能回数"], reverse=True)
+
+        return {
+            "feasible": not blocking_routes,
+            "routes": len(minimum_operations),
+            "airports": len(airports),
+            "days": int(cube.shape[1]),
+            "required_operations": int(required.sum()),
+            "assigned_operations": int(assigned.sum()),
+            # 유량은 운항 1회당 출발・도착 시간대 2단위이므로 max_flow는 required_flow와 비교
+            "required_flow": int(2 * required.sum()),
+            "max_flow": int(flow),
+            "blocking_routes": blocking_routes,
+            "blocking_airports": blocking_airports
+        }
+
+    def check_airline(self, airline_id: str, minimum_operations: Optional[pd.DataFrame] = None,
+                      schedule: Optional[pd.DataFrame] = None) -> Optional[Dict]:
+        """항공사별 실행 가능성 검사
+
+        같은 프로세스에서 만든 월별 최소 운항 기준 / 공항 스케줄 DataFrame을 넘기면 파일을 다시 읽지 않는다.
+        """
+        print(f"🚀 {airline_id} 최소 운항 기준 실행 가능성 검사 시작...")
+        if minimum_operations is None:
+            minimum_operations = self.load_minimum_operations(airline_id)
+        if schedule is None:
+            schedule = self.load_airport_schedule(airline_id)
+        if minimum_operations is None or schedule is None:
+            return None
+
+        report = self.check(minimum_operations, schedule)
+        report["airline_id"] = airline_id
+        if report["feasible"]:
+            print(f"✅ {airline_id} 배정 가능: 최소 운항 {report['required_operations']}회 "
+                  f"({report['routes']}개 노선, {report['airports']}개 공항, {report['days']}일)")
+        else:
+            print(f"❌ {airline_id} 배정 불가: {len(report['blocking_routes'])}개 노선 부족 "
+                  f"(배정 가능 {report['assigned_operations']}/{report['required_operations']}회)")
+            for route in report["blocking_routes"]:
+                print(f"   - {route['出発空港']} → {route['到着空港']}: "
+                      f"{route['配分可能回数']}/{route['最低維持月別運航回数']}회")
+            for airport in report["blocking_airports"]:
+                print(f"   ⛔ {airport['空港']}: 포화 시간대 {airport['飽和時間帯数']}개 "
+                      f"(할당 가능 {airport['飽和割り当て可能回数']}회)")
+        return report
+
+    def save_report(self, airline_id: str, report: Dict) -> str:
+        """검사 결과를 operations_feasibility.json으로 저장"""
+        path = os.path.join(self.output_dir, airline_id, FEASIBILITY_REPORT_FILE)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"✅ {airline_id} 실행 가능성 검사 결과 저장 완료: {path}")
+        return path
+
+
+def main():
+    """메인 함수"""
+    import argparse
+
+    checker = OperationsFeasibilityChecker()
+
+    parser = argparse.ArgumentParser(usage="python operations_feasibility.py [항공사ID ...]")
+    parser.add_argument("airline_ids", nargs="*", help="항공사 ID (생략 시 airline_01 ~ airline_15 전체)")
+    args = parser.parse_args()
+
+    valid_airlines = [f"airline_{i:02d}" for i in range(1, 16)]
+    airline_ids = args.airline_ids or valid_airlines
+    invalid = [a for a in airline_ids if a not in valid_airlines]
+    if invalid:
+        print(f"❌ 잘못된 항공사 ID: {', '.join(invalid)}")
+        print(f"사용 가능한 항공사: {', '.join(valid_airlines)}")
+        sys.exit(1)
+
+    failed = []
+    for airline_id in airline_ids:
+        report = checker.check_airline(airline_id)
+        if report is None:
+            failed.append(airline_id)
+            continue
+        checker.save_report(airline_id, report)
+        if not report["feasible"]:
+            failed.append(airline_id)
+
+    if failed:
+        print(f"\n❌ 배정 불가 또는 검사 실패: {', '.join(failed)}")
+        sys.exit(1)
+    print(f"\n🎉 {len(airline_ids)}개 항공사 최소 운항 기준 배정 가능!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+생성 산출물 압축 입출력 유틸리티
+gzip / xz / bz2 (표준 라이브러리 코덱)로 CSV 산출물을 쓰고, 읽을 때는 확장자로 자동 판별
+"""
+
+import os
+import bz2
+import gzip
+import lzma
+import zlib
+from typing import Optional, Tuple
+
+# 압축 방식별 파일 확장자
+COMPRESSION_SUFFIXES = {
+    "gzip": ".gz",
+    "xz": ".xz",
+    "bz2": ".bz2"
+}
+
+COMPRESSION_CHOICES = ["none"] + list(COMPRESSION_SUFFIXES.keys())
+
+# gzip은 속도 위주 레벨 사용 (기본값 9는 느리고 압축률 차이가 작음)
+GZIP_LEVEL = 6
+
+WRITE_BUFFER_SIZE = 1 << 22
+READ_BLOCK_SIZE = 1 << 16
+
+
+def normalize_compression(compression: Optional[str]) -> Optional[str]:
+    """'none'/빈 값은 None으로, 그 외는 지원 여부 확인"""
+    if not compression or compression == "none":
+        return None
+    if compression not in COMPRESSION_SUFFIXES:
+        raise ValueError(f"지원하지 않는 압축 방식: {compression} (사용 가능: {', '.join(COMPRESSION_CHOICES)})")
+    return compression
+
+
+def output_path(path: str, compression: Optional[str]) -> str:
+    """압축 방식에 맞는 출력 파일 경로 (예: domestic.csv → domestic.csv.gz)"""
+    compression = normalize_compression(compression)
+    if compression is None:
+        return path
+    return path + COMPRESSION_SUFFIXES[compression]
+
+
+def detect_compression(path: str) -> Optional[str]:
+    """파일 확장자로 압축 방식 판별"""
+    for compression, suffix in COMPRESSION_SUFFIXES.items():
+        if path.endswith(suffix):
+            return compression
+    return None
+
+
+def resolve_input_path(path: str) -> Optional[str]:
+    """비압축/압축본(.gz/.xz/.bz2) 중 존재하는 가장 최근 파일 경로 반환, 없으면 None"""
+    candidates = [path] + [path + suffix for suffix in COMPRESSION_SUFFIXES.values()]
+    existing = [p for p in candidates if os.path.exists(p)]
+    if not existing:
+        return None
+    return max(existing, key=os.path.getmtime)
+
+
+def pandas_compression(compression: Optional[str]):
+    """DataFrame.to_csv에 넘길 compression 인자"""
+    compression = normalize_compression(compression)
+    if compression is None:
+        return None
+    if compression == "gzip":
+        return {"method": "gzip", "compresslevel": GZIP_LEVEL, "mtime": 0}
+    return {"method": compression}
+
+
+def compress_bytes(data: bytes, compression: str) -> bytes:
+    """완결된 압축 스트림 하나로 압축"""
+    if compression == "gzip":
+        return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+    if compression == "bz2":
+        return bz2.compress(data)
+    return lzma.compress(data)
+
+
+def decompress_bytes(data: bytes, compression: Optional[str]) -> bytes:
+    """compress_bytes/write_block로 기록한 블록 해제 (비압축이면 그대로)"""
+    if compression is None:
+        return data
+    if compression == "gzip":
+        return gzip.decompress(data)
+    if compression == "bz2":
+        return bz2.decompress(data)
+    return lzma.decompress(data)
+
+
+def _open_compressor(raw, compression: str):
+    """raw 파일 객체 위에 압축 스트림 열기 (닫아도 raw는 닫히지 않음)"""
+    if compression == "gzip":
+        return gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=GZIP_LEVEL, mtime=0)
+    if compression == "bz2":
+        return bz2.BZ2File(raw, mode='wb')
+    return lzma.LZMAFile(raw, mode='wb')
+
+
+def _new_decompressor(compression: str):
+    if compression == "gzip":
+        return zlib.decompressobj(wbits=31)
+    if compression == "bz2":
+        return bz2.BZ2Decompressor()
+    return lzma.LZMADecompressor()
+
+
+class CsvOutputFile:
+    """BOM+헤더와 본문을 기록하는 CSV 출력 파일
+
+    압축 시 헤더와 본문을 별도 스트림으로 기록한다 (gzip/bz2/xz 모두 멀티스트림 파일을
+    하나의 스트림처럼 읽음). 덕분에 통합 파일을 재압축 없이 바이트 연결로 만들 수 있다.
+    block_streams=True이면 write_block()으로 쓴 블록마다 독립 스트림이 되어
+    (오프셋, 길이)만으로 블록 단위 읽기가 가능하다.
+    stream_bytes를 지정하면 압축 본문을 그 크기만큼 모아 독립 스트림으로 기록하고, 압축기와 파일을 열어 두지 않는다
+    (스트림을 기록할 때만 추가 모드로 연다). 동시에 여러 파일을 열어 두는 파티션 출력에서
+    파일마다 압축기・쓰기 버퍼 메모리가 쌓이지 않도록 하기 위함이다.
+    """
+
+    def __init__(self, path: str, header: bytes, compression: Optional[str] = None,
+                 block_streams: bool = False, stream_bytes: Optional[int] = None):
+        self.path = path
+        self.compression = normalize_compression(compression)
+        self.block_streams = block_streams
+        self.stream_bytes = stream_bytes if self.compression is not None and not block_streams else None
+        self._pending = bytearray()
+        self._raw = open(path, 'wb', buffering=WRITE_BUFFER_SIZE)
+        if self.compression is None:
+            self._raw.write(header)
+            self._body = self._raw
+        else:
+            self._raw.write(compress_bytes(header, self.compression))
+            self._body = None
+            if self.stream_bytes is not None:
+                self._raw.close()
+                self._raw = None
+            elif not block_streams:
+                self._body = _open_compressor(self._raw, self.compression)
+
+    def write(self, data: bytes):
+        if self.stream_bytes is not None:
+            self._pending += data
+            if len(self._pending) >= self.stream_bytes:
+                self._flush_stream()
+            return
+        if self._body is None:
+            self.write_block(data)
+            return
+        self._body.write(data)
+
+    def _flush_stream(self):
+        """모아 둔 압축 본문을 독립 스트림 하나로 기록"""
+        if self._pending:
+            with open(self.path, 'ab') as raw:
+                raw.write(compress_bytes(bytes(self._pending), self.compression))
+            self._pending = bytearray()
+
+    def write_block(self, data: bytes) -> Tuple[int, int]:
+        """독립적으로 읽을 수 있는 블록 기록, 파일 내 (오프셋, 길이) 반환"""
+        if self.compression is not None and not self.block_streams:
+            raise ValueError("write_block()은 block_streams=True로 연 압축 파일에서만 사용할 수 있습니다")
+        offset = self._raw.tell()
+        if self.compression is None:
+            self._raw.write(data)
+        else:
+            self._raw.write(compress_bytes(data, self.compression))
+        return offset, self._raw.tell() - offset
+
+    def close(self):
+        if self.stream_bytes is not None:
+            self._flush_stream()
+            return
+        if self._body is not None and self._body is not self._raw:
+            self._body.close()
+        self._raw.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def split_header_stream(path: str, compression: str) -> Tuple[bytes, int]:
+    """압축 파일의 첫 스트림을 풀어 (내용, 두 번째 스트림 시작 오프셋) 반환"""
+    decompressor = _new_decompressor(compression)
+    content = []
+    consumed = 0
+    with open(path, 'rb') as f:
+        while not decompressor.eof:
+            block = f.read(READ_BLOCK_SIZE)
+            if not block:
+                break
+            content.append(decompressor.decompress(block))
+            consumed += len(block)
+    if not decompressor.eof:
+        return b''.join(content), -1
+    return b''.join(content), consumed - len(decompressor.unused_data)
+
+
+def has_compressed_data(path: str, offset: int, compression: str) -> bool:
+    """offset 이후 압축 스트림(들)에 실제 데이터가 있는지 확인 (앞부분만 해제)"""
+    decompressor = _new_decompressor(compression)
+    pending = b''
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        while True:
+            block = pending or f.read(READ_BLOCK_SIZE)
+            pending = b''
+            if not block:
+                return False
+            if decompressor.decompress(block, 1):
+                return True
+            if decompressor.eof:
+                # 빈 스트림 뒤에 다른 스트림이 이어질 수 있음
+                pending = decompressor.unused_data
+                decompressor = _new_decompressor(compression)
+
+
+def copy_file_range(src_path: str, out, offset: int = 0):
+    """src_path의 offset 이후 바이트를 out에 그대로 복사"""
+    with open(src_path, 'rb') as f:
+        f.seek(offset)
+        while True:
+            block = f.read(WRITE_BUFFER_SIZE)
+            if not block:
+                break
+            out.write(block)
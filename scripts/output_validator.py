@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+생성 결과 검증기
+운항후보 / 월별 최소 운항 기준 / 공항 스케줄 출력을 배열 연산과 정렬 기반 중복 검사로 확인하고
+항목별 위반 건수와 예시 몇 건만 담은 간단한 보고서(validation_report.json)를 만든다.
+
+운항후보는 청크 단위로 스트리밍하고, 행마다 (노선, 日付, 出発時刻)를 정수 키 하나로 인코딩하여
+전체 키를 한 번 정렬해 중복을 찾는다 (수백만 행도 수 초).
+"""
+
+import os
+import sys
+import json
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Optional, Tuple
+
+from candidate_months import candidate_month_sources
+from artifact_reader import ArtifactReader
+from generate_candidate_data import CandidateDataGenerator
+from operations_feasibility import SCHEDULE_SLOT_COLUMN
+from slot_contention_cube import DEFAULT_CHUNK_ROWS, stream_candidate_chunks
+
+VALIDATION_REPORT_FILE = "validation_report.json"
+
+# 검사 항목별로 보고서에 남길 예시 수
+MAX_EXAMPLES = 5
+
+# 검증에 필요한 운항후보 컬럼
+VALIDATION_COLUMNS = ["日付", "出発空港", "到着空港", "出発時刻", "需要(名)", "運航規模", "優先順位指数"]
+
+# 정수 키 인코딩 자릿수 (공항 코드 < 2^16, 날짜 < 2^6, 출발시각 코드 < 2^8)
+AIRPORT_BITS = 16
+DAY_BITS = 6
+TIME_BITS = 8
+
+
+class _CodeTable:
+    """문자열 → 정수 코드 (청크마다 고유값만 사전에 등록)"""
+
+    def __init__(self):
+        self.codes: Dict[str, int] = {}
+        self.values: List[str] = []
+
+    def encode(self, series: pd.Series) -> np.ndarray:
+        codes, uniques = pd.factorize(series)
+        lookup = np.empty(len(uniques) + 1, dtype=np.int64)
+        lookup[-1] = -1  # 결측값
+        for i, value in enumerate(uniques):
+            if value not in self.codes:
+                self.codes[value] = len(self.values)
+                self.values.append(value)
+            lookup[i] = self.codes[value]
+        return lookup[codes]
+
+
+class _CheckResult:
+    """검사 항목 하나의 위반 건수와 예시"""
+
+    def __init__(self):
+        self.count = 0
+        self.examples: List[Any] = []
+
+    def add(self, count: int, examples: List[Any]):
+        self.count += int(count)
+        room = MAX_EXAMPLES - len(self.examples)
+        if room > 0:
+            self.examples.extend(examples[:room])
+
+    def to_dict(self) -> Dict:
+        result = {"count": self.count}
+        if self.examples:
+            result["examples"] = self.examples
+        return result
+
+
+class OutputValidator:
+    def __init__(self, chunk_rows: int = DEFAULT_CHUNK_ROWS):
+        self.output_dir = "output"
+        self.chunk_rows = chunk_rows
+        self.month_days = CandidateDataGenerator().month_days  # 월 → 일수
+        self.artifact_reader = ArtifactReader()
+
+    # ------------------------------------------------------------------
+    # 운항후보
+    # ------------------------------------------------------------------
+
+    def candidate_targets(self, candidate_dir: str, month: Optional[int] = None) -> List[Tuple[Optional[int], str]]:
+        """검증할 (월, 운항후보 폴더) 목록 (기록된 월이 없으면 month, 그것도 없으면 None)"""
+        return candidate_month_sources(candidate_dir, month)
+
+    def validate_candidates(self, candidate_dir: str, month: Optional[int], scales: List[str]) -> Dict:
+        """운항후보 청크 스트리밍 검증, 항목별 결과와 노선 집합 반환 (월을 모르면 31일까지 허용)"""
+        max_day = self.month_days.get(month, 31)
+        airports = _CodeTable()
+        times = _CodeTable()
+        checks = {name: _CheckResult() for name in [
+            "duplicate_candidate_keys", "priority_out_of_range", "negative_demand",
+            "unknown_operation_scale", "day_out_of_month"
+        ]}
+        keys = []
+        routes = set()
+        rows = 0
+
+        for chunk in stream_candidate_chunks(candidate_dir, self.chunk_rows, columns=VALIDATION_COLUMNS):
+            rows += len(chunk)
+            origin = airports.encode(chunk["出発空港"])
+            destination = airports.encode(chunk["到着空港"])
+            departure = times.encode(chunk["出発時刻"])
+            days = pd.to_numeric(chunk["日付"].astype(str).str.rstrip("日"), errors="coerce").to_numpy()
+            priority = pd.to_numeric(chunk["優先順位指数"], errors="coerce").to_numpy(dtype=np.float64)
+            demand = pd.to_numeric(chunk["需要(名)"], errors="coerce").to_numpy(dtype=np.float64)
+
+            invalid = {
+                "priority_out_of_range": ~((priority >= 0) & (priority <= 100)),
+                "negative_demand": ~(demand >= 0),
+                "unknown_operation_scale": ~chunk["運航規模"].isin(scales).to_numpy(),
+                "day_out_of_month": ~((days >= 1) & (days <= max_day))
+            }
+            for name, mask in invalid.items():
+                if mask.any():
+                    example_columns = ["出発空港", "到着空港", "日付", "出発時刻"]
+                    example_columns += {"priority_out_of_range": ["優先順位指数"], "negative_demand": ["需要(名)"],
+                                        "unknown_operation_scale": ["運航規模"]}.get(name, [])
+                    examples = chunk.loc[mask, example_columns].head(MAX_EXAMPLES).astype(str).to_dict("records")
+                    checks[name].add(mask.sum(), examples)
+
+            # (노선, 日付, 出発時刻) 정수 키 (결측・범위 밖 값은 0으로 묶여 중복으로 보일 수 있으므로 제외)
+            day_codes = np.nan_to_num(days, nan=0).astype(np.int64)
+            valid_key = (origin >= 0) & (destination >= 0) & (departure >= 0) & (day_codes >= 1) & (day_codes < (1 << DAY_BITS))
+            route_codes = (origin << AIRPORT_BITS) | destination
+            keys.append((((route_codes << DAY_BITS) | day_codes) << TIME_BITS | departure)[valid_key])
+            routes.update(np.unique(route_codes[valid_key]).tolist())
+
+        # 정렬 후 인접 키 비교로 중복 검출
+        all_keys = np.sort(np.concatenate(keys)) if keys else np.zeros(0, dtype=np.int64)
+        duplicated = all_keys[1:][all_keys[1:] == all_keys[:-1]]
+        if len(duplicated):
+            examples = []
+            for key in np.unique(duplicated)[:MAX_EXAMPLES].tolist():
+                departure = key & ((1 << TIME_BITS) - 1)
+                day = (key >> TIME_BITS) & ((1 << DAY_BITS) - 1)
+                route = key >> (TIME_BITS + DAY_BITS)
+                examples.append({
+                    "出発空港": airports.values[route >> AIRPORT_BITS],
+                    "到着空港": airports.values[route & ((1 << AIRPORT_BITS) - 1)],
+                    "日付": f"{day}日",
+                    "出発時刻": times.values[departure]
+                })
+            checks["duplicate_candidate_keys"].add(len(duplicated), examples)
+
+        route_names = {
+            (airports.values[code >> AIRPORT_BITS], airports.values[code & ((1 << AIRPORT_BITS) - 1)])
+            for code in routes
+        }
+        return {"rows": rows, "checks": checks, "routes": route_names, "max_day": max_day}
+
+    # ------------------------------------------------------------------
+    # 최소 운항 기준 / 공항 스케줄
+    # ------------------------------------------------------------------
+
+    def validate_minimum_operations(self, df: pd.DataFrame, candidate_routes: Optional[set]) -> Dict[str, _CheckResult]:
+        """월별 최소 운항 기준 검증 (노선 중복, 0 이하 횟수, 운항후보에 없는 노선)"""
+        checks = {name: _CheckResult() for name in [
+            "duplicate_minimum_operation_routes", "non_positive_minimum_operations",
+            "minimum_operation_routes_missing"
+        ]}
+        route_columns = ["出発空港", "到着空港"]
+
+        duplicated = df.duplicated(route_columns, keep="first").to_numpy()
+        checks["duplicate_minimum_operation_routes"].add(
+            duplicated.sum(), df.loc[duplicated, route_columns].head(MAX_EXAMPLES).to_dict("records")
+        )
+        counts = pd.to_numeric(df["最低維持月別運航回数"], errors="coerce").to_numpy(dtype=np.float64)
+        invalid = ~(counts > 0)
+        checks["non_positive_minimum_operations"].add(
+            invalid.sum(),
+            df.loc[invalid, route_columns + ["最低維持月別運航回数"]].head(MAX_EXAMPLES).astype(str).to_dict("records")
+        )
+        if candidate_routes is not None:
+            wanted = pd.MultiIndex.from_tuples(sorted(candidate_routes)) if candidate_routes else pd.MultiIndex.from_tuples([], names=route_columns)
+            missing = ~pd.MultiIndex.from_frame(df[route_columns]).isin(wanted)
+            checks["minimum_operation_routes_missing"].add(
+                missing.sum(), df.loc[missing, route_columns].head(MAX_EXAMPLES).to_dict("records")
+            )
+        return checks
+
+    def validate_airport_schedule(self, df: pd.DataFrame, max_day: int,
+                                  minimum_operations: Optional[pd.DataFrame]) -> Dict[str, _CheckResult]:
+        """공항 스케줄 검증 (공항・날짜 중복, 월 범위 밖 날짜, 음수 割り当て可能回数, 최소 운항 기준 공항 누락)"""
+        checks = {name: _CheckResult() for name in [
+            "duplicate_schedule_keys", "schedule_day_out_of_month", "negative_slot_capacity",
+            "schedule_airports_missing"
+        ]}
+        duplicated = df.duplicated(["空港", "日付"], keep="first").to_numpy()
+        checks["duplicate_schedule_keys"].add(
+            duplicated.sum(), df.loc[duplicated, ["空港", "日付"]].head(MAX_EXAMPLES).to_dict("records")
+        )
+        days = pd.to_numeric(df["日付"].astype(str).str.rstrip("日"), errors="coerce").to_numpy()
+        invalid_day = ~((days >= 1) & (days <= max_day))
+        checks["schedule_day_out_of_month"].add(
+            invalid_day.sum(), df.loc[invalid_day, ["空港", "日付"]].head(MAX_EXAMPLES).to_dict("records")
+        )
+
+        # 割り当て可能回数: JSON 문자열에서 숫자만 한 번에 추출
+        capacities = df[SCHEDULE_SLOT_COLUMN].astype(str).str.extractall(r'"割り当て可能回数":\s*(-?\d+)')[0]
+        negative = capacities.astype(int) < 0
+        negative_rows = np.unique(capacities.index.get_level_values(0)[negative.to_numpy()])
+        checks["negative_slot_capacity"].add(
+            negative.sum(), df.loc[negative_rows, ["空港", "日付"]].head(MAX_EXAMPLES).to_dict("records")
+        )
+
+        if minimum_operations is not None:
+            needed = pd.unique(pd.concat([minimum_operations["出発空港"], minimum_operations["到着空港"]]))
+            missing = sorted(set(needed) - set(df["空港"].unique()))
+            checks["schedule_airports_missing"].add(len(missing), missing)
+        return checks
+
+    # ------------------------------------------------------------------
+    # 항공사 단위
+    # ------------------------------------------------------------------
+
+    def load_operation_scales(self, airline_id: str) -> Optional[List[str]]:
+        """internal_resource_data.json의 運航規模種類"""
+        path = os.path.join(self.output_dir, airline_id, "internal_resource_data.json")
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)["運航規模種類"]
+
+    def validate_airline(self, airline_id: str, minimum_operations: Optional[pd.DataFrame] = None,
+                         schedule: Optional[pd.DataFrame] = None, month: Optional[int] = None) -> Optional[Dict]:
+        """항공사 출력 전체 검증, 보고서 dict 반환
+
+        같은 프로세스에서 만든 최소 운항 기준 / 공항 스케줄 DataFrame을 넘기면 해당 파일은 다시 읽지 않는다.
+        month는 운항후보 폴더에 대상 월 기록이 없을 때(이전 버전 flat 출력) 날짜 범위 검사에 쓸 월이다.
+        """
+        print(f"🔎 {airline_id} 생성 결과 검증 중...")
+        airline_dir = os.path.join(self.output_dir, airline_id)
+        scales = self.load_operation_scales(airline_id)
+        if scales is None:
+            print(f"❌ {airline_id} internal_resource_data.json이 없습니다")
+            return None
+
+        if minimum_operations is None:
+            minimum_operations = self.artifact_reader.read(airline_dir, "minimum_operations")
+        if schedule is None:
+            schedule = self.artifact_reader.read(airline_dir, "airport_schedule")
+
+        report: Dict[str, Any] = {"airline_id": airline_id, "rows": {}, "checks": {}}
+        candidate_routes: Optional[set] = None
+        max_day = 0
+        candidate_dir = os.path.join(airline_dir, "analytics_data", "candidate")
+        if os.path.isdir(candidate_dir):
+            candidate_routes = set()
+            for target_month, target_dir in self.candidate_targets(candidate_dir, month):
+                result = self.validate_candidates(target_dir, target_month, scales)
+                label = "candidate" if target_dir == candidate_dir else f"candidate_month_{target_month:02d}"
+                report["rows"][label] = result["rows"]
+                for name, check in result["checks"].items():
+                    report["checks"][f"{label}.{name}"] = check.to_dict()
+                candidate_routes |= result["routes"]
+                max_day = max(max_day, result["max_day"])
+
+        if minimum_operations is not None:
+            report["rows"]["minimum_operations"] = len(minimum_operations)
+            for name, check in self.validate_minimum_operations(minimum_operations, candidate_routes).items():
+                report["checks"][name] = check.to_dict()
+        if schedule is not None:
+            report["rows"]["airport_schedule"] = len(schedule)
+            checks = self.validate_airport_schedule(schedule, max_day or 31, minimum_operations)
+            for name, check in checks.items():
+                report["checks"][name] = check.to_dict()
+
+        report["errors"] = sum(check["count"] for check in report["checks"].values())
+        report["valid"] = report["errors"] == 0
+        failed = {name: check["count"] for name, check in report["checks"].items() if check["count"]}
+        if report["valid"]:
+            print(f"✅ {airline_id} 검증 통과: {sum(report['rows'].values())}행, {len(report['checks'])}개 항목")
+        else:
+            print(f"❌ {airline_id} 검증 실패: " + ", ".join(f"{name} {count}건" for name, count in failed.items()))
+        return report
+
+    def save_report(self, airline_id: str, report: Dict) -> str:
+        """검증 결과를 validation_report.json으로 저장"""
+        path = os.path.join(self.output_dir, airline_id, VALIDATION_REPORT_FILE)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        return path
+
+
+def main():
+    """메인 함수"""
+    import argparse
+    import time
+
+    valid_airlines = [f"airline_{i:02d}" for i in range(1, 16)]
+
+    parser = argparse.ArgumentParser(usage="python output_validator.py [항공사ID ...] [옵션]")
+    parser.add_argument("airline_ids", nargs="*", help="항공사 ID (생략 시 airline_01 ~ airline_15 전체)")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS,
+                        help=f"한 번에 읽을 운항후보 행 수 (기본: {DEFAULT_CHUNK_ROWS})")
+    parser.add_argument("--month", type=int, choices=range(1, 13), metavar="1-12",
+                        help="운항후보에 대상 월 기록이 없을 때 날짜 범위 검사에 사용할 월 (기본: 31일까지 허용)")
+    args = parser.parse_args()
+
+    airline_ids = args.airline_ids or valid_airlines
+    invalid = [a for a in airline_ids if a not in valid_airlines]
+    if invalid:
+        print(f"❌ 잘못된 항공사 ID: {', '.join(invalid)}")
+        print(f"사용 가능한 항공사: {', '.join(valid_airlines)}")
+        sys.exit(1)
+    if args.chunk_rows < 1:
+        parser.error("--chunk-rows는 1 이상이어야 합니다")
+
+    validator = OutputValidator(chunk_rows=args.chunk_rows)
+    started = time.time()
+    failed = []
+    for airline_id in airline_ids:
+        report = validator.validate_airline(airline_id, month=args.month)
+        if report is None:
+            failed.append(airline_id)
+            continue
+        validator.save_report(airline_id, report)
+        if not report["valid"]:
+            failed.append(airline_id)
+
+    print(f"\n⏱️ 검증 {time.time() - started:.1f}초")
+    if failed:
+        print(f"❌ 검증 실패: {', '.join(failed)}")
+        sys.exit(1)
+    print(f"🎉 {len(airline_ids)}개 항공사 생성 결과 검증 통과!")
+
+
+if __name__ == "__main__":
+    main()
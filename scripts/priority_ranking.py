@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+優先順位指数 충돌 검사 / 결정적 순위 부여
+calculate_priority_index는 해시 미세 조정(10^-11 ~ 10^-14)으로 값을 흩어 놓지만 소수점 7자리로 반올림하므로
+고유성이 보장되지는 않는다. 여기서는 생성된 운항후보를 한 번 정렬하여(O(n log n)) 같은 값을 가진 후보를 찾고,
+명시적인 보조 키로 동점을 풀어 항상 같은 결과가 나오는 전체 순위를 만든다.
+
+순위 키: 優先順位指数 내림차순 → (항공사) → 노선 ID → 월 → 日付 → 出発時刻 오름차순
+노선 ID는 (出発空港, 到着空港)의 사전순 번호이므로 출력 레이아웃・생성 순서와 관계없이 같다.
+"""
+
+import os
+import sys
+import json
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional
+
+from output_validator import OutputValidator
+from slot_contention_cube import DEFAULT_CHUNK_ROWS, stream_candidate_chunks
+
+PRIORITY_COLLISION_FILE = "priority_collisions.json"
+PRIORITY_RANKING_FILE = "priority_ranking.csv"
+
+RANKING_COLUMNS = ["日付", "出発空港", "到着空港", "出発時刻", "優先順位指数"]
+
+# 충돌 예시로 남길 동점 그룹 수 / 그룹당 후보 수
+MAX_COLLISION_EXAMPLES = 5
+MAX_GROUP_EXAMPLES = 3
+
+
+def tie_break_order(priority: np.ndarray, *secondary_keys: np.ndarray) -> np.ndarray:
+    """優先順位指数 내림차순, 동점은 보조 키 오름차순(앞의 키가 우선)인 행 순서"""
+    # np.lexsort는 마지막 키를 주 키로 쓴다
+    return np.lexsort(tuple(reversed(secondary_keys)) + (-priority,))
+
+
+def collision_summary(sorted_priority: np.ndarray) -> Dict:
+    """優先順位指数 내림차순으로 정렬된 배열의 충돌 통계 (인접한 같은 값 = 충돌)"""
+    n = len(sorted_priority)
+    equal = sorted_priority[1:] == sorted_priority[:-1]
+    colliding = np.zeros(n, dtype=bool)
+    colliding[1:] |= equal
+    colliding[:-1] |= equal
+
+    # 동점 그룹: 같은 값이 이어지는 구간 [start, end)
+    starts = np.flatnonzero(np.concatenate(([True], ~equal))) if n else np.zeros(0, dtype=np.int64)
+    sizes = np.diff(np.append(starts, n))
+    return {
+        "rows": int(n),
+        "distinct_values": int(len(starts)),
+        "colliding_rows": int(colliding.sum()),
+        "collision_groups": int((sizes > 1).sum()),
+        "largest_group": int(sizes.max(initial=0)),
+        "collision_rate": float(colliding.sum() / n) if n else 0.0,
+        "group_starts": starts,
+        "group_sizes": sizes
+    }
+
+
+class PriorityCollisionChecker:
+    def __init__(self, chunk_rows: int = DEFAULT_CHUNK_ROWS):
+        self.output_dir = "output"
+        self.chunk_rows = chunk_rows
+
+    def load_candidates(self, airline_id: str) -> Optional[pd.DataFrame]:
+        """순위 계산용 운항후보 키 컬럼 로드 (모든 레이아웃・여러 달 출력 지원)"""
+        candidate_dir = os.path.join(self.output_dir, airline_id, "analytics_data", "candidate")
+        if not os.path.isdir(candidate_dir):
+            print(f"❌ {airline_id} 운항후보 폴더가 없습니다: {candidate_dir}")
+            return None
+
+        frames = []
+        for month, target_dir in OutputValidator().candidate_targets(candidate_dir):
+            for chunk in stream_candidate_chunks(target_dir, self.chunk_rows, columns=RANKING_COLUMNS):
+                chunk = chunk[RANKING_COLUMNS].copy()
+                chunk["月"] = month or 0
+                frames.append(chunk)
+        if not frames:
+            print(f"⚠️ {airline_id} 운항후보가 없습니다")
+            return pd.DataFrame(columns=RANKING_COLUMNS + ["月"])
+        return pd.concat(frames, ignore_index=True)
+
+    def encode_keys(self, df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """보조 키를 정수로 인코딩 (노선 ID・出発時刻은 사전순 번호)"""
+        departure, _ = pd.factorize(df["出発空港"], sort=True)
+        arrival, arrival_values = pd.factorize(df["到着空港"], sort=True)
+        slots, _ = pd.factorize(df["出発時刻"], sort=True)  # "HH:MM"은 사전순 = 시각순
+        day_codes, day_labels = pd.factorize(df["日付"])
+        days = np.array([int(str(label).rstrip("日")) for label in day_labels], dtype=np.int64)
+        return {
+            "priority": pd.to_numeric(df["優先順位指数"], errors="coerce").to_numpy(dtype=np.float64),
+            "route": departure.astype(np.int64) * len(arrival_values) + arrival,
+            "month": df["月"].to_numpy(dtype=np.int64),
+            "day": days[day_codes],
+            "slot": slots.astype(np.int64)
+        }
+
+    def rank(self, df: pd.DataFrame, keys: Dict[str, np.ndarray],
+             airline: Optional[np.ndarray] = None) -> Dict:
+        """결정적 순위(1 = 최고)와 충돌 통계
+
+        revenue_floor flag 모드에서 0.0으로 표시된 후보는 의도된 동점이므로 충돌 통계에서 따로 센다.
+        """
+        secondary = [keys["route"], keys["month"], keys["day"], keys["slot"]]
+        if airline is not None:
+            secondary.insert(0, airline)
+        order = tie_break_order(keys["priority"], *secondary)
+        ranks = np.empty(len(order), dtype=np.int64)
+        ranks[order] = np.arange(1, len(order) + 1)
+
+        sorted_priority = keys["priority"][order]
+        scored = sorted_priority != 0.0
+        summary = collision_summary(sorted_priority[scored])
+        summary["zero_priority_rows"] = int((~scored).sum())
+
+        # 큰 동점 그룹부터 예시 (그룹 안은 보조 키 순서)
+        starts, sizes = summary.pop("group_starts"), summary.pop("group_sizes")
+        scored_order = order[scored]
+        examples = []
+        for g in np.argsort(-sizes, kind="stable")[:MAX_COLLISION_EXAMPLES]:
+            if sizes[g] < 2:
+                break
+            rows = scored_order[starts[g]:starts[g] + min(sizes[g], MAX_GROUP_EXAMPLES)]
+            examples.append({
+                "優先順位指数": float(sorted_priority[scored][starts[g]]),
+                "rows": int(sizes[g]),
+                "candidates": df.loc[rows, ["日付", "出発空港", "到着空港", "出発時刻"]].to_dict("records")
+            })
+        summary["examples"] = examples
+        return {"ranks": ranks, "summary": summary}
+
+    def check(self, airline_ids: List[str], across: bool = False) -> Optional[Dict]:
+        """항공사별 (across=True면 전체 항공사 합산까지) 충돌 검사, 순위와 보고서 반환"""
+        frames: Dict[str, pd.DataFrame] = {}
+        keys: Dict[str, Dict[str, np.ndarray]] = {}
+        report: Dict = {"airlines": {}}
+        ranks: Dict[str, pd.DataFrame] = {}
+        for airline_id in airline_ids:
+            df = self.load_candidates(airline_id)
+            if df is None:
+                return None
+            frames[airline_id] = df
+            keys[airline_id] = self.encode_keys(df)
+            result = self.rank(df, keys[airline_id])
+            report["airlines"][airline_id] = result["summary"]
+            ranks[airline_id] = df[RANKING_COLUMNS].assign(優先順位=result["ranks"])
+            summary = result["summary"]
+            print(f"🔢 {airline_id}: {summary['rows']}건 중 충돌 {summary['colliding_rows']}건 "
+                  f"({summary['collision_rate']:.4%}, 동점 그룹 {summary['collision_groups']}개)")
+
+        if across and airline_ids:
+            # 항공사를 첫 보조 키로 두고 전체를 한 번에 정렬 (노선 ID는 항공사 안에서의 번호)
+            combined = pd.concat([frames[a] for a in airline_ids], ignore_index=True)
+            combined_keys = {
+                name: np.concatenate([keys[a][name] for a in airline_ids]) for name in keys[airline_ids[0]]
+            }
+            airline = np.repeat(np.arange(len(airline_ids), dtype=np.int64), [len(frames[a]) for a in airline_ids])
+            result = self.rank(combined, combined_keys, airline)
+            report["all_airlines"] = result["summary"]
+            bounds = np.cumsum([0] + [len(frames[a]) for a in airline_ids])
+            for i, airline_id in enumerate(airline_ids):
+                ranks[airline_id]["全体優先順位"] = result["ranks"][bounds[i]:bounds[i + 1]]
+            summary = result["summary"]
+            print(f"🔢 전체 {len(airline_ids)}개 항공사: {summary['rows']}건 중 충돌 {summary['colliding_rows']}건 "
+                  f"({summary['collision_rate']:.4%})")
+
+        return {"report": report, "ranks": ranks}
+
+    def save_report(self, report: Dict, airline_ids: List[str]) -> List[str]:
+        """항공사별 priority_collisions.json (전체 검사 결과는 output/priority_collisions.json) 저장"""
+        paths = []
+        for airline_id in airline_ids:
+            path = os.path.join(self.output_dir, airline_id, PRIORITY_COLLISION_FILE)
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(report["airlines"][airline_id], f, ensure_ascii=False, indent=2)
+            paths.append(path)
+        if "all_airlines" in report:
+            path = os.path.join(self.output_dir, PRIORITY_COLLISION_FILE)
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump({"airlines": airline_ids, **report["all_airlines"]}, f, ensure_ascii=False, indent=2)
+            paths.append(path)
+        return paths
+
+    def save_ranking(self, airline_id: str, ranking: pd.DataFrame) -> str:
+        """결정적 순위를 priority_ranking.csv로 저장 (優先順位 순)"""
+        path = os.path.join(self.output_dir, airline_id, PRIORITY_RANKING_FILE)
+        ranking.sort_values("優先順位", kind="stable").to_csv(path, index=False, encoding='utf-8')
+        return path
+
+
+def main():
+    """메인 함수"""
+    import argparse
+
+    valid_airlines = [f"airline_{i:02d}" for i in range(1, 16)]
+
+    parser = argparse.ArgumentParser(usage="python priority_ranking.py [항공사ID ...] [옵션]")
+    parser.add_argument("airline_ids", nargs="*", help="항공사 ID (생략 시 airline_01 ~ airline_15 전체)")
+    parser.add_argument("--across", action="store_true",
+                        help="항공사별 검사에 더해 전체 항공사 후보를 한 번에 정렬하여 충돌 검사")
+    parser.add_argument("--write-ranks", action="store_true",
+                        help="결정적 순위를 output/<항공사>/priority_ranking.csv로 저장")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS,
+                        help=f"한 번에 읽을 운항후보 행 수 (기본: {DEFAULT_CHUNK_ROWS})")
+    args = parser.parse_args()
+
+    airline_ids = args.airline_ids or valid_airlines
+    invalid = [a for a in airline_ids if a not in valid_airlines]
+    if invalid:
+        print(f"❌ 잘못된 항공사 ID: {', '.join(invalid)}")
+        print(f"사용 가능한 항공사: {', '.join(valid_airlines)}")
+        sys.exit(1)
+    if args.chunk_rows < 1:
+        parser.error("--chunk-rows는 1 이상이어야 합니다")
+
+    checker = PriorityCollisionChecker(chunk_rows=args.chunk_rows)
+    result = checker.check(airline_ids, across=args.across)
+    if result is None:
+        sys.exit(1)
+    for path in checker.save_report(result["report"], airline_ids):
+        print(f"✅ 충돌 검사 결과 저장: {path}")
+    if args.write_ranks:
+        for airline_id in airline_ids:
+            path = checker.save_ranking(airline_id, result["ranks"][airline_id])
+            print(f"✅ {airline_id} 결정적 순위 저장: {path}")
+    print("🎉 優先順位指数 충돌 검사 완료!")
+
+
+if __name__ == "__main__":
+    main()
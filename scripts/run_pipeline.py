@@ -0,0 +1,452 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+전체 데이터 생성 파이프라인 실행기
+항공사별 단계(운항후보 → 최소 운항 기준 → 공항 스케줄 → 실행 가능성 검사, 왕복 정규화 함수)를 의존성 DAG로 실행
+
+- 항공사끼리는 프로세스 단위로 병렬 실행
+- 같은 항공사 안에서도 의존성이 없는 단계는 동시에 실행
+- 출력이 입력보다 최신이고 옵션이 같으면 해당 단계는 건너뜀 (pipeline_state.json)
+- 같은 프로세스에서 실행된 단계의 결과는 후속 단계에 메모리로 전달
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import contextlib
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, as_completed, wait
+from typing import Any, Dict, List, Optional
+
+from candidate_months import MONTH_INDEX_FILE, parse_month_spec
+from generate_candidate_data import CandidateDataGenerator
+from generate_minimum_operations import MinimumOperationsGenerator
+from generate_airport_schedule_data import AirportScheduleDataGenerator
+from operations_feasibility import FEASIBILITY_REPORT_FILE, OperationsFeasibilityChecker
+from output_validator import VALIDATION_REPORT_FILE, OutputValidator
+from generate_round_trip_normalizers import load_airline_profile, calculate_weights, generate_typescript_file
+from output_compression import COMPRESSION_CHOICES, normalize_compression, output_path
+
+PIPELINE_STATE_FILE = "pipeline_state.json"
+PIPELINE_LOG_FILE = "pipeline.log"
+
+# 단계별 선행 단계 (실행 순서는 의존성으로 결정)
+STAGE_DEPENDENCIES = {
+    "candidate": [],
+    "minimum_operations": ["candidate"],
+    "airport_schedule": ["candidate", "minimum_operations"],
+    "operations_feasibility": ["minimum_operations", "airport_schedule"],
+    "output_validation": ["candidate", "minimum_operations", "airport_schedule"],
+    "round_trip_normalizer": []
+}
+
+STAGE_NAMES = list(STAGE_DEPENDENCIES.keys())
+
+# 모든 단계가 공통으로 읽는 항공사 입력 파일
+AIRLINE_INPUT_FILES = ["internal_resource_data.json", "profile.py"]
+
+
+class PipelineOrchestrator:
+    """항공사 × 단계 DAG 실행기"""
+
+    def __init__(self, output_dir: str = "output", compression: Optional[str] = None,
+                 layout: str = "flat", pipeline: bool = False, force: bool = False,
+                 seed: Optional[int] = None, stage_threads: int = 2, verbose: bool = False,
+                 months: Optional[List[int]] = None, excel: bool = False):
+        self.output_dir = output_dir
+        self.compression = normalize_compression(compression)
+        self.layout = layout
+        self.pipeline = pipeline
+        self.force = force
+        self.seed = seed
+        self.stage_threads = max(1, stage_threads)
+        self.verbose = verbose
+        self.excel = excel  # True면 CSV와 함께 .xlsx도 기록 (운항후보는 flat 레이아웃만)
+        self.months = months  # 지정 시 운항후보를 해당 월들로 한 번에 생성 (candidate/month=<월>/)
+
+    # ------------------------------------------------------------------
+    # 단계 정의 (옵션 / 입력 / 출력)
+    # ------------------------------------------------------------------
+
+    def stage_options(self, stage: str) -> Dict[str, Any]:
+        """출력 내용에 영향을 주는 단계별 옵션 (바뀌면 다시 실행)"""
+        if stage == "candidate":
+            return {"layout": self.layout, "pipeline": self.pipeline, "compression": self.compression,
+                    "months": self.months, "excel": self.excel, "seed": self.seed}
+        if stage in ["minimum_operations", "airport_schedule"]:
+            # 두 단계도 np.random으로 값을 뽑으므로 시드가 바뀌면 다시 실행
+            return {"compression": self.compression, "excel": self.excel, "seed": self.seed}
+        return {}
+
+    def stage_outputs(self, airline_id: str, stage: str) -> List[str]:
+        """단계가 만드는 파일 목록 (최신 여부 판단용)"""
+        airline_dir = os.path.join(self.output_dir, airline_id)
+        candidate_dir = os.path.join(airline_dir, "analytics_data", "candidate")
+        if stage == "candidate":
+            if self.months:
+                return [os.path.join(candidate_dir, MONTH_INDEX_FILE)]
+            if self.layout == "partitioned":
+                return [os.path.join(candidate_dir, "partition_index.json")]
+            if self.layout == "star":
+                return [os.path.join(candidate_dir, "star_index.json")]
+            return [
+                output_path(os.path.join(candidate_dir, f"{key}.csv"), self.compression)
+                for key in ["international_departure", "international_arrival", "domestic"]
+            ]
+        if stage == "minimum_operations":
+            return [output_path(os.path.join(airline_dir, "monthly_minimum_operations_standard.csv"), self.compression)]
+        if stage == "airport_schedule":
+            return [output_path(os.path.join(airline_dir, "airport_schedule_data.csv"), self.compression)]
+        if stage == "operations_feasibility":
+            return [os.path.join(airline_dir, FEASIBILITY_REPORT_FILE)]
+        if stage == "output_validation":
+            return [os.path.join(airline_dir, VALIDATION_REPORT_FILE)]
+        return [os.path.join(airline_dir, "analytics_data", "round_trip_priority_normalizer.ts")]
+
+    def stage_inputs(self, airline_id: str, stage: str) -> List[str]:
+        """단계가 읽는 파일 목록 (항공사 입력 + 선행 단계 출력)"""
+        inputs = [os.path.join(self.output_dir, airline_id, name) for name in AIRLINE_INPUT_FILES]
+        for dependency in STAGE_DEPENDENCIES[stage]:
+            inputs.extend(self.stage_outputs(airline_id, dependency))
+        return inputs
+
+    # ------------------------------------------------------------------
+    # 최신 여부 판단
+    # ------------------------------------------------------------------
+
+    def state_path(self, airline_id: str) -> str:
+        return os.path.join(self.output_dir, airline_id, PIPELINE_STATE_FILE)
+
+    def load_state(self, airline_id: str) -> Dict:
+        path = self.state_path(airline_id)
+        if not os.path.exists(path):
+            return {}
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def save_state(self, airline_id: str, state: Dict):
+        with open(self.state_path(airline_id), 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+
+    def is_up_to_date(self, airline_id: str, stage: str, state: Dict, rerun: List[str]) -> bool:
+        """출력이 모두 있고, 입력보다 최신이며, 옵션이 같고, 선행 단계가 다시 실행되지 않았으면 True"""
+        if self.force or any(dependency in rerun for dependency in STAGE_DEPENDENCIES[stage]):
+            return False
+        if state.get(stage, {}).get("options") != self.stage_options(stage):
+            return False
+
+        outputs = self.stage_outputs(airline_id, stage)
+        if not all(os.path.exists(path) for path in outputs):
+            return False
+        inputs = [path for path in self.stage_inputs(airline_id, stage) if os.path.exists(path)]
+        if not inputs:
+            return True
+        return min(os.path.getmtime(p) for p in outputs) >= max(os.path.getmtime(p) for p in inputs)
+
+    # ------------------------------------------------------------------
+    # 단계 실행 (upstream: 같은 프로세스에서 실행된 선행 단계 결과)
+    # ------------------------------------------------------------------
+
+    def run_candidate(self, airline_id: str, upstream: Dict[str, Any]):
+        generator = CandidateDataGenerator()
+        generator.output_dir = self.output_dir
+        generator.compression = self.compression
+        generator.excel = self.excel
+
+        candidate_dir = generator.get_candidate_dir(airline_id)
+        if os.path.exists(candidate_dir):
+            shutil.rmtree(candidate_dir)
+
+        if self.months:
+            result = generator.save_candidate_outputs_by_month(
+                airline_id, self.months, layout=self.layout, pipeline=self.pipeline
+            )
+        else:
+            result = generator.save_candidate_outputs(airline_id, layout=self.layout, pipeline=self.pipeline)
+        if result is None:
+            raise RuntimeError(f"{airline_id} 운항후보 데이터 생성 실패")
+        # 후속 단계에는 출력 요약 대신 노선 목록・대상 월을 넘긴다 (candidate 파일 재파싱 생략)
+        return generator.get_stage_handoff()
+
+    def run_minimum_operations(self, airline_id: str, upstream: Dict[str, Any]):
+        generator = MinimumOperationsGenerator()
+        generator.output_dir = self.output_dir
+        generator.compression = self.compression
+        generator.excel = self.excel
+
+        candidate = upstream.get("candidate")
+        routes = candidate["routes"] if candidate else None
+        df = generator.generate_minimum_operations_data(airline_id, routes=routes)
+        if df is None:
+            raise RuntimeError(f"{airline_id} 최소 운항 기준 데이터 생성 실패")
+        generator.save_minimum_operations_data(airline_id, df)
+        return df
+
+    def run_airport_schedule(self, airline_id: str, upstream: Dict[str, Any]):
+        generator = AirportScheduleDataGenerator()
+        generator.output_dir = self.output_dir
+        generator.compression = self.compression
+        generator.excel = self.excel
+
+        candidate = upstream.get("candidate")
+        df = generator.generate_airport_schedule_data(
+            airline_id,
+            minimum_operations=upstream.get("minimum_operations"),
+            month_days=candidate["max_days"] if candidate else None
+        )
+        if df is None:
+            raise RuntimeError(f"{airline_id} 공항 스케줄 데이터 생성 실패")
+        generator.save_airport_schedule_data(airline_id, df)
+        return df
+
+    def run_operations_feasibility(self, airline_id: str, upstream: Dict[str, Any]):
+        checker = OperationsFeasibilityChecker()
+        checker.output_dir = self.output_dir
+
+        report = checker.check_airline(
+            airline_id,
+            minimum_operations=upstream.get("minimum_operations"),
+            schedule=upstream.get("airport_schedule")
+        )
+        if report is None:
+            raise RuntimeError(f"{airline_id} 실행 가능성 검사 실패")
+        checker.save_report(airline_id, report)
+        # 최소 운항 기준을 공항 시간대 용량 안에서 배정할 수 없으면 해당 항공사 실행을 실패로 처리
+        if not report["feasible"]:
+            raise RuntimeError(f"{airline_id} 최소 운항 기준 배정 불가 ({len(report['blocking_routes'])}개 노선 부족)")
+        return report
+
+    def run_output_validation(self, airline_id: str, upstream: Dict[str, Any]):
+        validator = OutputValidator()
+        validator.output_dir = self.output_dir
+
+        candidate = upstream.get("candidate")
+        report = validator.validate_airline(
+            airline_id,
+            minimum_operations=upstream.get("minimum_operations"),
+            schedule=upstream.get("airport_schedule"),
+            month=candidate["month"] if candidate else None
+        )
+        if report is None:
+            raise RuntimeError(f"{airline_id} 생성 결과 검증 실패")
+        validator.save_report(airline_id, report)
+        if not report["valid"]:
+            raise RuntimeError(f"{airline_id} 생성 결과 검증 실패 ({report['errors']}건)")
+        return report
+
+    def run_round_trip_normalizer(self, airline_id: str, upstream: Dict[str, Any]):
+        profile = load_airline_profile(airline_id, self.output_dir)
+        resource_weight, priority_weight = calculate_weights(profile)
+        return generate_typescript_file(
+            airline_id, profile, resource_weight, priority_weight, output_dir=self.output_dir
+        )
+
+    def run_stage(self, airline_id: str, stage: str, upstream: Dict[str, Any]):
+        return getattr(self, f"run_{stage}")(airline_id, upstream)
+
+    # ------------------------------------------------------------------
+    # 항공사 단위 DAG 실행
+    # ------------------------------------------------------------------
+
+    def run_airline(self, airline_id: str) -> Dict[str, Dict]:
+        """항공사 하나의 단계 DAG 실행, 단계별 {status, seconds} 반환"""
+        # 같은 프로세스에서 다른 항공사의 profile 모듈이 캐시되어 있으면 제거
+        sys.modules.pop("profile", None)
+        if self.seed is not None:
+            np.random.seed(self.seed + int(airline_id.split("_")[-1]))
+        else:
+            np.random.seed()  # fork된 워커끼리 같은 난수열을 쓰지 않도록 재시드
+
+        state = self.load_state(airline_id)
+        report: Dict[str, Dict] = {}
+        results: Dict[str, Any] = {}
+        rerun: List[str] = []
+        pending = list(STAGE_NAMES)
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=self.stage_threads) as pool:
+            while pending or running:
+                for stage in list(pending):
+                    dependencies = STAGE_DEPENDENCIES[stage]
+                    if any(report.get(d, {}).get("status") in ["failed", "blocked"] for d in dependencies):
+                        report[stage] = {"status": "blocked", "seconds": 0.0}
+                        pending.remove(stage)
+                        continue
+                    if not all(d in report for d in dependencies):
+                        continue
+                    pending.remove(stage)
+                    if self.is_up_to_date(airline_id, stage, state, rerun):
+                        report[stage] = {"status": "skipped", "seconds": 0.0}
+                        continue
+                    upstream = {d: results[d] for d in dependencies if d in results}
+                    running[pool.submit(self._timed_stage, airline_id, stage, upstream)] = stage
+
+                if not running:
+                    continue
+                done, _ = wait(list(running.keys()), return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage = running.pop(future)
+                    result, seconds, error = future.result()
+                    if error is not None:
+                        print(f"❌ {airline_id} {stage} 실패: {error}")
+                        report[stage] = {"status": "failed", "seconds": seconds, "error": str(error)}
+                        continue
+                    results[stage] = result
+                    rerun.append(stage)
+                    report[stage] = {"status": "ran", "seconds": seconds}
+                    state[stage] = {"options": self.stage_options(stage), "finished_at": time.time()}
+
+        self.save_state(airline_id, state)
+        return report
+
+    def _timed_stage(self, airline_id: str, stage: str, upstream: Dict[str, Any]):
+        start = time.perf_counter()
+        try:
+            result = self.run_stage(airline_id, stage, upstream)
+            return result, time.perf_counter() - start, None
+        except Exception as e:
+            return None, time.perf_counter() - start, e
+
+    def run_airline_logged(self, airline_id: str) -> Dict[str, Dict]:
+        """항공사 DAG 실행 (verbose가 아니면 출력은 output/<항공사>/pipeline.log로)"""
+        if self.verbose:
+            return self.run_airline(airline_id)
+        log_path = os.path.join(self.output_dir, airline_id, PIPELINE_LOG_FILE)
+        with open(log_path, 'w', encoding='utf-8') as log, contextlib.redirect_stdout(log):
+            return self.run_airline(airline_id)
+
+    # ------------------------------------------------------------------
+    # 전체 실행
+    # ------------------------------------------------------------------
+
+    def run(self, airline_ids: List[str], jobs: int = 1) -> Dict[str, Dict]:
+        """항공사들을 병렬로 실행하고 항공사별 리포트 반환"""
+        reports = {}
+        start = time.perf_counter()
+        if jobs <= 1 or len(airline_ids) <= 1:
+            for airline_id in airline_ids:
+                reports[airline_id] = self.run_airline_logged(airline_id)
+                self.print_airline_report(airline_id, reports[airline_id])
+        else:
+            with ProcessPoolExecutor(max_workers=min(jobs, len(airline_ids))) as pool:
+                futures = {pool.submit(_run_airline_worker, self, airline_id): airline_id
+                           for airline_id in airline_ids}
+                for future in as_completed(futures):
+                    airline_id = futures[future]
+                    reports[airline_id] = future.result()
+                    self.print_airline_report(airline_id, reports[airline_id])
+
+        elapsed = time.perf_counter() - start
+        critical_path = max((self.airline_critical_path(r) for r in reports.values()), default=0.0)
+        print(f"\n⏱️ 전체 {elapsed:.1f}초 (항공사 단위 임계 경로 최대 {critical_path:.1f}초)")
+        return reports
+
+    def airline_critical_path(self, report: Dict[str, Dict]) -> float:
+        """단계 의존성을 따라 가장 긴 경로의 실행 시간"""
+        finish = {}
+        for stage in STAGE_NAMES:
+            dependencies = STAGE_DEPENDENCIES[stage]
+            finish[stage] = max((finish[d] for d in dependencies), default=0.0) + report.get(stage, {}).get("seconds", 0.0)
+        return max(finish.values(), default=0.0)
+
+    def print_airline_report(self, airline_id: str, report: Dict[str, Dict]):
+        icons = {"ran": "✅", "skipped": "⏭️", "failed": "❌", "blocked": "⛔"}
+        summary = ", ".join(
+            f"{icons[report[stage]['status']]} {stage} ({report[stage]['seconds']:.1f}s)"
+            for stage in STAGE_NAMES if stage in report
+        )
+        print(f"📊 {airline_id}: {summary}")
+
+    def print_plan(self, airline_ids: List[str]):
+        """실행 계획 출력 (현재 상태 기준, 선행 단계 재실행 여부는 반영하지 않음)"""
+        for airline_id in airline_ids:
+            state = self.load_state(airline_id)
+            plan = []
+            rerun = []
+            for stage in STAGE_NAMES:
+                if self.is_up_to_date(airline_id, stage, state, rerun):
+                    plan.append(f"⏭️ {stage}")
+                else:
+                    plan.append(f"▶️ {stage}")
+                    rerun.append(stage)
+            print(f"📋 {airline_id}: {', '.join(plan)}")
+
+
+def _run_airline_worker(orchestrator: PipelineOrchestrator, airline_id: str) -> Dict[str, Dict]:
+    """프로세스 풀 워커 진입점"""
+    return orchestrator.run_airline_logged(airline_id)
+
+
+def main():
+    """메인 함수"""
+    import argparse
+
+    all_airlines = [f"airline_{i:02d}" for i in range(1, 16)]
+
+    parser = argparse.ArgumentParser(
+        description="운항후보 → 최소 운항 기준 → 공항 스케줄 → 실행 가능성 검사 (+ 왕복 정규화 함수) 파이프라인 일괄 실행",
+        usage="python run_pipeline.py [항공사ID ...] [옵션]"
+    )
+    parser.add_argument("airline_ids", nargs="*", help="항공사 ID (생략 시 airline_01 ~ airline_15 전체)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                        help="동시에 실행할 항공사 수 (기본: CPU 수)")
+    parser.add_argument("--stage-threads", type=int, default=2,
+                        help="항공사 안에서 동시에 실행할 독립 단계 수 (기본: 2)")
+    parser.add_argument("--compression", choices=COMPRESSION_CHOICES, default="none",
+                        help="출력 CSV 압축 방식 (기본: none)")
+    parser.add_argument("--layout", choices=["flat", "partitioned", "star"], default="flat",
+                        help="운항후보 출력 레이아웃 (기본: flat)")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="운항후보 생성과 CSV 쓰기를 겹쳐서 실행 (flat 레이아웃)")
+    parser.add_argument("--excel", action="store_true",
+                        help="CSV와 함께 .xlsx도 저장 (write-only 스트리밍, 운항후보는 flat 레이아웃만)")
+    parser.add_argument("--months", help="운항후보를 여러 달 한 번에 생성 (all / 1-6 / 1,4,7 형식)")
+    parser.add_argument("--output-dir", default="output",
+                        help="항공사 입력・출력 폴더 (기본: output)")
+    parser.add_argument("--force", action="store_true", help="최신 여부와 관계없이 모든 단계 실행")
+    parser.add_argument("--seed", type=int, help="난수 시드 (항공사별로 seed + 항공사 번호 사용)")
+    parser.add_argument("--dry-run", action="store_true", help="실행 계획만 출력")
+    parser.add_argument("--verbose", action="store_true",
+                        help="단계 로그를 화면에 출력 (기본: output/<항공사>/pipeline.log)")
+    args = parser.parse_args()
+
+    airline_ids = args.airline_ids or all_airlines
+    invalid = [a for a in airline_ids if a not in all_airlines]
+    if invalid:
+        print(f"❌ 잘못된 항공사 ID: {', '.join(invalid)}")
+        print(f"사용 가능한 항공사: {', '.join(all_airlines)}")
+        sys.exit(1)
+
+    months = None
+    if args.months:
+        try:
+            months = parse_month_spec(args.months)
+        except ValueError as e:
+            parser.error(f"--months: {e}")
+    if args.excel and args.layout != "flat":
+        parser.error("--excel은 flat 레이아웃에서만 사용할 수 있습니다")
+
+    orchestrator = PipelineOrchestrator(
+        output_dir=args.output_dir, compression=args.compression, layout=args.layout, pipeline=args.pipeline,
+        force=args.force, seed=args.seed, stage_threads=args.stage_threads, verbose=args.verbose,
+        months=months, excel=args.excel
+    )
+
+    if args.dry_run:
+        orchestrator.print_plan(airline_ids)
+        return
+
+    print(f"🚀 파이프라인 실행 시작: {len(airline_ids)}개 항공사 (동시 {max(1, min(args.jobs, len(airline_ids)))}개)")
+    reports = orchestrator.run(airline_ids, jobs=args.jobs)
+
+    failed = [a for a, report in reports.items() if any(r["status"] in ["failed", "blocked"] for r in report.values())]
+    if failed:
+        print(f"❌ 실패한 항공사: {', '.join(failed)}")
+        sys.exit(1)
+    print("🎉 파이프라인 실행 완료!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,465 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+항공사 공동 공항 시간대 배분기
+여러 항공사의 운항후보와 airport_schedule_data를 한 번에 읽어, 같은 공항・날짜・시간대를 두고
+경쟁하는 후보들에게 공항 시간대 용량을 배분한다.
+
+- 항공편 하나는 출발공항의 출발 시간대와 도착공항의 도착 시간대(출발 + 飛行時間)를 하나씩 쓴다
+- 공항 × 날짜 × 시간대 용량은 항공사별 스케줄 중 최대값 (각 항공사 파일은 같은 공항을 따로 뽑은 값)
+- 노선 × 날짜별 배분 횟수는 推奨最大運航数까지
+- 항공사별 후보 큐(優先順位指数 내림차순)를 힙으로 병합하며, 힙 키가 공정성 규칙을 정한다
+    priority                 : 전체 우선순위 순서
+    proportional             : 요청 대비 배분 비율이 가장 낮은 항공사부터 (요청량 비례 배분)
+    minimum_operations_first : 최저維持月別運航回数를 못 채운 노선을 먼저 우선순위 순으로, 나머지는 그 다음
+- 용량・횟수는 줄어들기만 하므로 한 번 배분 불가인 후보는 다시 보지 않는다 (후보마다 한 번만 검사)
+- 날짜 축을 공유하므로 모든 항공사의 운항후보가 같은 달이어야 한다 (다른 달이 섞이면 배분하지 않음)
+"""
+
+import os
+import sys
+import json
+import heapq
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Tuple, Optional
+
+from artifact_reader import ArtifactReader
+from candidate_months import common_candidate_month, load_month_index, month_partition_dir, selected_candidate_month
+from candidate_partitions import load_partition_index, parse_day_numbers, read_candidate_partitions
+from candidate_pipeline import SEGMENT_KEYS
+from candidate_star_schema import load_star_index, read_candidate_star
+from operations_feasibility import SLOT_MINUTES, OperationsFeasibilityChecker
+from output_compression import resolve_input_path
+
+ALLOCATION_RULES = ["priority", "proportional", "minimum_operations_first"]
+
+ALLOCATION_FILE = "shared_slot_allocation.csv"
+ALLOCATION_SUMMARY_FILE = "shared_slot_allocation.json"
+
+# 배분 대상에서 제외하는 사유 (앞의 사유부터 판정, 요약의 excluded 키)
+EXCLUSION_REASONS = ["unprofitable", "outside_operating_window", "unknown_airport", "day_out_of_range"]
+
+# 배분에 필요한 운항후보 컬럼
+ALLOCATION_COLUMNS = [
+    "日付", "出発空港", "到着空港", "出発時刻", "飛行時間", "推奨最大運航数",
+    "収益(円)", "運航可能な最小収益(円)", "優先順位指数"
+]
+
+
+def load_candidate_frame(candidate_dir: str, columns: List[str], month: Optional[int] = None) -> Optional[pd.DataFrame]:
+    """운항후보 데이터를 레이아웃(flat / 파티션 / 스타 스키마 / 월별)에 관계없이 필요한 컬럼만 읽기 (없으면 None)"""
+    month_index = load_month_index(candidate_dir)
+    if month_index is not None:
+        months = [entry["month"] for entry in month_index["months"]]
+        if month is None:
+            month = months[0]
+        if month not in months:
+            print(f"❌ {candidate_dir}에 {month}월 운항후보가 없습니다 (생성된 월: {months})")
+            return None
+        return load_candidate_frame(os.path.join(candidate_dir, month_partition_dir(month)), columns)
+
+    frames = []
+    for segment_key in SEGMENT_KEYS:
+        path = resolve_input_path(os.path.join(candidate_dir, f"{segment_key}.csv"))
+        if path is not None:
+            frames.append(pd.read_csv(path, usecols=columns))
+    if frames:
+        return pd.concat(frames, ignore_index=True)[columns]
+
+    if load_partition_index(candidate_dir) is not None:
+        return read_candidate_partitions(candidate_dir)[columns]
+    if load_star_index(candidate_dir) is not None:
+        return read_candidate_star(candidate_dir, columns=columns)
+    return None
+
+
+class SharedSlotAllocator:
+    """항공사 공동 공항 시간대 배분기"""
+
+    def __init__(self, rule: str = "priority", month: Optional[int] = None):
+        if rule not in ALLOCATION_RULES:
+            raise ValueError(f"배분 규칙은 {', '.join(ALLOCATION_RULES)} 중 하나여야 합니다: {rule}")
+        self.output_dir = "output"
+        self.rule = rule
+        self.month = month  # 월별 레이아웃에서 사용할 월 (기본: 첫 번째 월)
+        self.schedule_reader = OperationsFeasibilityChecker()
+        self.artifact_reader = ArtifactReader()
+
+    # ------------------------------------------------------------------
+    # 입력 로드
+    # ------------------------------------------------------------------
+
+    def load_airline_inputs(self, airline_id: str) -> Optional[Dict]:
+        """항공사 하나의 운항후보 / 공항 스케줄 / 최소 운항 기준 로드"""
+        airline_dir = os.path.join(self.output_dir, airline_id)
+        candidate_dir = os.path.join(airline_dir, "analytics_data", "candidate")
+        try:
+            month = selected_candidate_month(candidate_dir, self.month)
+        except ValueError as e:
+            print(f"❌ {airline_id} {e}")
+            return None
+        candidates = load_candidate_frame(candidate_dir, ALLOCATION_COLUMNS, month)
+        self.schedule_reader.output_dir = self.output_dir
+        schedule = self.schedule_reader.load_airport_schedule(airline_id)
+        if candidates is None or schedule is None:
+            print(f"❌ {airline_id} 운항후보 또는 공항 스케줄 데이터가 없습니다")
+            return None
+
+        minimum_operations = self.artifact_reader.read(airline_dir, "minimum_operations")
+        return {"candidates": candidates, "schedule": schedule, "minimum_operations": minimum_operations,
+                "month": month}
+
+    def build_shared_capacity(self, schedules: Dict[str, pd.DataFrame]) -> Tuple[Dict[str, int], List[str], np.ndarray]:
+        """항공사별 스케줄을 공항 × 날짜 × 시간대 공동 용량으로 합치기 (같은 칸은 항공사 간 최대값)"""
+        cubes = []
+        airports: Dict[str, int] = {}
+        labels: List[str] = []
+        for schedule in schedules.values():
+            airline_airports, airline_labels, cube = self.schedule_reader.build_capacity_cube(schedule)
+            if cube.size == 0:
+                continue
+            if labels and airline_labels != labels:
+                raise ValueError("항공사별 공항 스케줄의 시간대 구성이 다릅니다")
+            labels = airline_labels
+            for airport in airline_airports:
+                airports.setdefault(airport, len(airports))
+            cubes.append(([airports[a] for a in airline_airports], cube))
+
+        day_count = max((cube.shape[1] for _, cube in cubes), default=0)
+        shared = np.zeros((len(airports), day_count, len(labels)), dtype=np.int64)
+        for airport_index, cube in cubes:
+            view = shared[airport_index, :cube.shape[1]]
+            shared[airport_index, :cube.shape[1]] = np.maximum(view, cube)
+        return airports, labels, shared
+
+    def encode_candidates(self, airline_ids: List[str], inputs: Dict[str, Dict], airports: Dict[str, int],
+                          labels: List[str], capacity: np.ndarray) -> Dict[str, np.ndarray]:
+        """후보를 정수 배열로 변환 (출발/도착 시간대 ID, 노선×날짜 ID, 노선 ID), 항공사별 우선순위 내림차순 정렬
+
+        운항 불가 후보(収益 < 運航可能な最小収益)와 운영 시간대 밖에서 출발・도착하는 후보는 제외하고,
+        항공사별 적재 건수와 제외 사유별 건수를 encoded["exclusions"]에 남긴다 (사유는 EXCLUSION_REASONS 순서로 하나만).
+        """
+        _, day_count, slot_count = capacity.shape
+        slot_of_time = {label.split(" ~ ")[0]: i for i, label in enumerate(labels)}
+
+        parts = []
+        route_keys: List[Tuple[str, str, str]] = []
+        route_ids: Dict[Tuple[str, str, str], int] = {}
+        exclusions: Dict[str, Dict] = {}
+        for a, airline_id in enumerate(airline_ids):
+            df = inputs[airline_id]["candidates"]
+            days = parse_day_numbers(df["日付"])
+            departure_slot = df["出発時刻"].map(slot_of_time).to_numpy(dtype=np.float64)
+            arrival_slot = departure_slot + np.ceil(df["飛行時間"].to_numpy(dtype=np.float64) / SLOT_MINUTES)
+            origin = df["出発空港"].map(airports).to_numpy(dtype=np.float64)
+            destination = df["到着空港"].map(airports).to_numpy(dtype=np.float64)
+
+            reasons = {
+                "unprofitable": ~(df["収益(円)"].to_numpy() >= df["運航可能な最小収益(円)"].to_numpy()),
+                "outside_operating_window": np.isnan(departure_slot) | ~(arrival_slot < slot_count),
+                "unknown_airport": np.isnan(origin) | np.isnan(destination),
+                "day_out_of_range": ~(days <= day_count)
+            }
+            keep = np.ones(len(df), dtype=bool)
+            excluded = {}
+            for reason in EXCLUSION_REASONS:
+                hit = reasons[reason] & keep
+                excluded[reason] = int(hit.sum())
+                keep &= ~hit
+            exclusions[airline_id] = {"loaded": int(len(df)), "excluded": excluded}
+            df = df[keep]
+            if df.empty:
+                continue
+
+            # 항공사 × 노선 ID (최소 운항 기준 집계 단위)
+            codes, uniques = pd.MultiIndex.from_frame(df[["出発空港", "到着空港"]]).factorize()
+            route_base = len(route_keys)
+            for departure, arrival in uniques:
+                route_ids[(airline_id, departure, arrival)] = len(route_keys)
+                route_keys.append((airline_id, departure, arrival))
+
+            day_index = days[keep] - 1
+            parts.append(pd.DataFrame({
+                "airline": a,
+                "row": np.flatnonzero(keep),
+                "route": route_base + codes,
+                "route_day": (route_base + codes) * day_count + day_index,
+                "departure_slot": (origin[keep].astype(np.int64) * day_count + day_index) * slot_count
+                                  + departure_slot[keep].astype(np.int64),
+                "arrival_slot": (destination[keep].astype(np.int64) * day_count + day_index) * slot_count
+                                + arrival_slot[keep].astype(np.int64),
+                "route_day_limit": df["推奨最大運航数"].to_numpy(dtype=np.int64),
+                "priority": df["優先順位指数"].to_numpy(dtype=np.float64)
+            }))
+
+        columns = ["airline", "row", "route", "route_day", "departure_slot", "arrival_slot", "route_day_limit", "priority"]
+        table = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=columns)
+        table = table.sort_values(["airline", "priority"], ascending=[True, False], kind="stable")
+
+        encoded = {column: table[column].to_numpy() for column in columns}
+        encoded["route_keys"] = route_keys
+        encoded["route_ids"] = route_ids
+        encoded["route_day_count"] = len(route_keys) * day_count
+        encoded["exclusions"] = exclusions
+        return encoded
+
+    def build_route_minimums(self, airline_ids: List[str], inputs: Dict[str, Dict],
+                             encoded: Dict) -> np.ndarray:
+        """노선 ID별 최저維持月別運航回数 (기준이 없는 노선은 0)"""
+        minimums = np.zeros(len(encoded["route_keys"]), dtype=np.int64)
+        for airline_id in airline_ids:
+            df = inputs[airline_id]["minimum_operations"]
+            if df is None:
+                continue
+            for row in df[["出発空港", "到着空港", "最低維持月別運航回数"]].itertuples(index=False):
+                route_id = encoded["route_ids"].get((airline_id, row[0], row[1]))
+                if route_id is not None:
+                    minimums[route_id] = int(row[2])
+        return minimums
+
+    # ------------------------------------------------------------------
+    # 배분
+    # ------------------------------------------------------------------
+
+    def allocate(self, encoded: Dict, capacity: np.ndarray, airline_count: int,
+                 route_minimums: np.ndarray) -> np.ndarray:
+        """힙 기반 배분, 후보별 배분 순서 반환 (배분되지 않으면 -1)"""
+        candidate_count = len(encoded["priority"])
+        order = np.full(candidate_count, -1, dtype=np.int64)
+        if candidate_count == 0:
+            return order
+
+        # 항공사별 후보 구간 [start, end) (encode_candidates에서 항공사 → 우선순위 순으로 정렬됨)
+        bounds = np.searchsorted(encoded["airline"], np.arange(airline_count + 1))
+        route_day_limit = np.zeros(encoded["route_day_count"], dtype=np.int64)
+        route_day_limit[encoded["route_day"]] = encoded["route_day_limit"]
+
+        # 비례 배분 가중치: 노선 × 날짜별 min(후보 수, 推奨最大運航数)의 합 (항공사 요청량)
+        route_day_rows = np.bincount(encoded["route_day"], minlength=encoded["route_day_count"])
+        route_day_airline = np.zeros(encoded["route_day_count"], dtype=np.int64)
+        route_day_airline[encoded["route_day"]] = encoded["airline"]
+        weights = np.bincount(
+            route_day_airline, weights=np.minimum(route_day_rows, route_day_limit), minlength=airline_count
+        )
+        weights = np.maximum(weights, 1.0).tolist()
+
+        slot_left = capacity.ravel().tolist()
+        route_day_left = route_day_limit.tolist()
+        need = route_minimums.tolist()
+
+        departure_slot = encoded["departure_slot"].tolist()
+        arrival_slot = encoded["arrival_slot"].tolist()
+        route_day = encoded["route_day"].tolist()
+        route = encoded["route"].tolist()
+        negative_priority = (-encoded["priority"]).tolist()
+        allocated = [False] * candidate_count
+        served = [0] * airline_count
+        proportional = self.rule == "proportional"
+
+        def key(a: int, i: int) -> Tuple[float, float, int]:
+            """힙 키: 작을수록 먼저 배분 (항공사 a의 다음 후보가 i일 때)"""
+            if proportional:
+                return (served[a] / weights[a], negative_priority[i], a)
+            return (negative_priority[i], 0.0, a)
+
+        # minimum_operations_first: 1단계는 최소 운항 기준 미달 노선만, 2단계는 남은 후보 전체
+        phases = [True, False] if self.rule == "minimum_operations_first" else [False]
+        ends = bounds[1:].tolist()
+        next_order = 0
+        for minimum_phase in phases:
+            cursor = bounds[:-1].tolist()
+            heap = [key(a, cursor[a]) for a in range(airline_count) if cursor[a] < ends[a]]
+            heapq.heapify(heap)
+            while heap:
+                current = heap[0]
+                a = current[2]
+                i = cursor[a]
+                end = ends[a]
+                # 배분 불가 후보 건너뛰기 (용량・횟수는 줄어들기만 하므로 다시 볼 필요 없음)
+                while i < end and (
+                    allocated[i]
+                    or slot_left[departure_slot[i]] <= 0
+                    or slot_left[arrival_slot[i]] <= 0
+                    or route_day_left[route_day[i]] <= 0
+                    or (minimum_phase and need[route[i]] <= 0)
+                ):
+                    i += 1
+                cursor[a] = i
+                if i == end:
+                    heapq.heappop(heap)
+                    continue
+                updated = key(a, i)
+                if updated != current:
+                    # 건너뛴 만큼 키가 바뀌었으면 다시 줄을 세운다
+                    heapq.heapreplace(heap, updated)
+                    continue
+
+                slot_left[departure_slot[i]] -= 1
+                slot_left[arrival_slot[i]] -= 1
+                route_day_left[route_day[i]] -= 1
+                need[route[i]] -= 1
+                allocated[i] = True
+                served[a] += 1
+                order[i] = next_order
+                next_order += 1
+
+                cursor[a] = i + 1
+                if i + 1 < end:
+                    heapq.heapreplace(heap, key(a, i + 1))
+                else:
+                    heapq.heappop(heap)
+        return order
+
+    # ------------------------------------------------------------------
+    # 실행 / 요약
+    # ------------------------------------------------------------------
+
+    def run(self, airline_ids: List[str]) -> Optional[Dict]:
+        """항공사 목록 전체를 한 번에 배분, 항공사별 배분 결과 DataFrame과 요약 반환"""
+        inputs = {}
+        for airline_id in airline_ids:
+            loaded = self.load_airline_inputs(airline_id)
+            if loaded is not None:
+                inputs[airline_id] = loaded
+        airline_ids = [a for a in airline_ids if a in inputs]
+        if not airline_ids:
+            return None
+
+        # 다른 달의 같은 날짜를 같은 시간대 칸으로 합치지 않도록 대상 월이 하나인지 확인
+        airline_months = {a: inputs[a]["month"] for a in airline_ids}
+        try:
+            month = common_candidate_month(airline_months)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return None
+        unknown = [a for a, m in airline_months.items() if m is None]
+        if unknown and month is not None:
+            print(f"⚠️ 대상 월 기록이 없는 항공사는 {month}월 데이터로 간주합니다: {', '.join(unknown)}")
+
+        airports, labels, capacity = self.build_shared_capacity({a: inputs[a]["schedule"] for a in airline_ids})
+        encoded = self.encode_candidates(airline_ids, inputs, airports, labels, capacity)
+        route_minimums = self.build_route_minimums(airline_ids, inputs, encoded)
+        order = self.allocate(encoded, capacity, len(airline_ids), route_minimums)
+
+        # 시간대별 경쟁 현황 (후보 수요 > 용량인 칸)
+        demand = np.bincount(
+            np.concatenate([encoded["departure_slot"], encoded["arrival_slot"]]).astype(np.int64),
+            minlength=capacity.size
+        ).reshape(capacity.shape)
+        used = np.bincount(
+            np.concatenate([encoded["departure_slot"][order >= 0], encoded["arrival_slot"][order >= 0]]).astype(np.int64),
+            minlength=capacity.size
+        ).reshape(capacity.shape)
+        contested = demand > capacity
+
+        allocations = {}
+        airline_summary = {}
+        allocated_routes = np.bincount(encoded["route"][order >= 0].astype(np.int64), minlength=len(route_minimums))
+        for a, airline_id in enumerate(airline_ids):
+            mask = encoded["airline"] == a
+            chosen = mask & (order >= 0)
+            rows = encoded["row"][chosen].astype(np.int64)
+            df = inputs[airline_id]["candidates"].iloc[rows][
+                ["日付", "出発空港", "到着空港", "出発時刻", "飛行時間", "優先順位指数"]
+            ].reset_index(drop=True)
+            df["配分順序"] = order[chosen]
+            allocations[airline_id] = df.sort_values("配分順序", kind="stable").reset_index(drop=True)
+
+            route_ids = [i for i, key in enumerate(encoded["route_keys"]) if key[0] == airline_id]
+            short_routes = [
+                f"{encoded['route_keys'][i][1]}-{encoded['route_keys'][i][2]}"
+                for i in route_ids if allocated_routes[i] < route_minimums[i]
+            ]
+            airline_summary[airline_id] = {
+                "loaded": encoded["exclusions"][airline_id]["loaded"],
+                "excluded": encoded["exclusions"][airline_id]["excluded"],
+                "candidates": int(mask.sum()),
+                "allocated": int(chosen.sum()),
+                "minimum_operations_short_routes": short_routes
+            }
+            if not mask.any():
+                reasons = ", ".join(f"{reason} {count:,}건"
+                                    for reason, count in airline_summary[airline_id]["excluded"].items() if count)
+                print(f"⚠️ {airline_id}: 배분할 후보가 없습니다 "
+                      f"(적재 {airline_summary[airline_id]['loaded']:,}건 전부 제외" + (f": {reasons})" if reasons else ")"))
+
+        airport_names = list(airports.keys())
+        airport_summary = {
+            airport_names[i]: {
+                "capacity": int(capacity[i].sum()),
+                "used": int(used[i].sum()),
+                "contested_slots": int(contested[i].sum())
+            }
+            for i in range(len(airport_names))
+        }
+        summary = {
+            "rule": self.rule,
+            "month": month,
+            "airlines": airline_summary,
+            "airports": airport_summary,
+            "allocated": int((order >= 0).sum()),
+            "contested_slots": int(contested.sum())
+        }
+        return {"allocations": allocations, "summary": summary}
+
+    def save(self, result: Dict):
+        """항공사별 배분 결과 CSV와 전체 요약 JSON 저장"""
+        for airline_id, df in result["allocations"].items():
+            path = os.path.join(self.output_dir, airline_id, ALLOCATION_FILE)
+            df.to_csv(path, index=False, encoding='utf-8-sig')
+            print(f"✅ {airline_id} 시간대 배분 결과 저장 완료: {path} ({len(df)}건)")
+
+        summary_path = os.path.join(self.output_dir, ALLOCATION_SUMMARY_FILE)
+        with open(summary_path, 'w', encoding='utf-8') as f:
+            json.dump(result["summary"], f, ensure_ascii=False, indent=2)
+        print(f"✅ 배분 요약 저장 완료: {summary_path}")
+
+
+def main():
+    """메인 함수"""
+    import argparse
+    import time
+
+    valid_airlines = [f"airline_{i:02d}" for i in range(1, 16)]
+
+    parser = argparse.ArgumentParser(
+        description="여러 항공사의 운항후보에 공동 공항 시간대 용량 배분",
+        usage="python shared_slot_allocation.py [항공사ID ...] [옵션]"
+    )
+    parser.add_argument("airline_ids", nargs="*", help="항공사 ID (생략 시 airline_01 ~ airline_15 전체)")
+    parser.add_argument("--rule", choices=ALLOCATION_RULES, default="priority",
+                        help="공정성 규칙 (기본: priority)")
+    parser.add_argument("--month", type=int,
+                        help="배분할 월 (월별 레이아웃(--months)은 해당 월을 읽고, 한 달 출력은 같은 월인지 확인)")
+    args = parser.parse_args()
+
+    airline_ids = args.airline_ids or valid_airlines
+    invalid = [a for a in airline_ids if a not in valid_airlines]
+    if invalid:
+        print(f"❌ 잘못된 항공사 ID: {', '.join(invalid)}")
+        print(f"사용 가능한 항공사: {', '.join(valid_airlines)}")
+        sys.exit(1)
+
+    allocator = SharedSlotAllocator(rule=args.rule, month=args.month)
+    print(f"🚀 {len(airline_ids)}개 항공사 공동 시간대 배분 시작 (규칙: {args.rule})...")
+    started = time.time()
+    result = allocator.run(airline_ids)
+    if result is None:
+        print("❌ 시간대 배분을 실행할 수 없습니다 (운항후보가 없거나 항공사별 대상 월이 다름)")
+        sys.exit(1)
+
+    summary = result["summary"]
+    print(f"✅ 배분 완료: {summary['allocated']}편, 경쟁 시간대 {summary['contested_slots']}개 "
+          f"({time.time() - started:.1f}초)")
+    for airline_id, airline in summary["airlines"].items():
+        short = airline["minimum_operations_short_routes"]
+        excluded = airline["loaded"] - airline["candidates"]
+        print(f"   - {airline_id}: {airline['allocated']}/{airline['candidates']}건"
+              + (f" (적재 {airline['loaded']:,}건 중 {excluded:,}건 제외)" if excluded else "")
+              + (f", 최소 운항 미달 노선 {len(short)}개" if short else ""))
+    allocator.save(result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+항공사 × 공항 × 날짜 × 시간대 경합 큐브 (메모리 매핑)
+각 항공사의 운항후보 파일을 청크 단위로 스트리밍하여 시간대별 후보 수・수요 합계・최고 우선순위를
+디스크의 NumPy 메모리 매핑 배열(.npy)에 누적하고, 항공사별 割り当て可能回数 큐브를 함께 저장한다.
+조회는 필요한 부분만 메모리 매핑으로 읽으므로 전체 데이터가 메모리보다 커도 동작한다.
+
+- 후보 하나는 출발공항의 출발 시간대와 도착공항의 도착 시간대(출발 + 飛行時間) 두 칸에 집계된다
+- 운영 시간대(07:00~22:00) 밖의 출발・도착은 해당 칸에 집계하지 않는다
+- 레이아웃(flat / 파티션 / 스타 스키마 / 월별)과 압축 여부에 관계없이 읽는다
+- 날짜 축은 모든 항공사가 공유하므로 항공사별 운항후보의 대상 월이 같아야 한다 (다르면 생성하지 않음)
+"""
+
+import os
+import sys
+import json
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Iterator
+
+from candidate_months import common_candidate_month, load_month_index, month_partition_dir, selected_candidate_month
+from candidate_partitions import load_partition_index, parse_day_numbers
+from candidate_pipeline import SEGMENT_KEYS
+from candidate_star_schema import FACT_COLUMNS, ROUTE_DIM_COLUMNS, SCALE_DIM_COLUMNS, load_star_index
+from generate_airport_schedule_data import AirportScheduleDataGenerator
+from generate_candidate_data import CandidateDataGenerator
+from operations_feasibility import SLOT_MINUTES, OperationsFeasibilityChecker
+from output_compression import resolve_input_path
+
+CONTENTION_DIR = "slot_contention"
+CONTENTION_META_FILE = "cube_meta.json"
+
+# 큐브 배열 (이름 → dtype), 모양은 모두 (항공사, 공항, 날짜, 시간대)
+CUBE_ARRAYS = {
+    "counts": np.int32,         # 후보 수
+    "demand": np.float64,       # 需要(名) 합계
+    "best_priority": np.float64,  # 最高 優先順位指数 (후보가 없으면 -inf)
+    "capacity": np.int32        # 항공사 airport_schedule_data의 割り当て可能回数
+}
+
+# 스트리밍할 운항후보 컬럼
+CONTENTION_COLUMNS = ["日付", "出発空港", "到着空港", "出発時刻", "飛行時間", "需要(名)", "優先順位指数"]
+
+DEFAULT_CHUNK_ROWS = 200000
+
+# 한 달 최대 일수 (큐브 날짜 축 길이)
+MAX_MONTH_DAYS = 31
+
+
+def stream_candidate_chunks(candidate_dir: str, chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                            month: Optional[int] = None,
+                            columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+    """운항후보 데이터를 columns(기본: CONTENTION_COLUMNS) 형식 DataFrame 청크로 순서대로 읽기 (파일 전체를 올리지 않음)"""
+    columns = list(columns or CONTENTION_COLUMNS)
+    month_index = load_month_index(candidate_dir)
+    if month_index is not None:
+        months = [entry["month"] for entry in month_index["months"]]
+        month = months[0] if month is None else month
+        if month not in months:
+            raise ValueError(f"{candidate_dir}에 {month}월 운항후보가 없습니다 (생성된 월: {months})")
+        yield from stream_candidate_chunks(
+            os.path.join(candidate_dir, month_partition_dir(month)), chunk_rows, columns=columns
+        )
+        return
+
+    paths = [resolve_input_path(os.path.join(candidate_dir, f"{key}.csv")) for key in SEGMENT_KEYS]
+    paths = [path for path in paths if path is not None]
+    if not paths:
+        index = load_partition_index(candidate_dir)
+        if index is not None:
+            paths = [os.path.join(candidate_dir, p["path"]) for p in index["partitions"]]
+    if paths:
+        for path in paths:
+            for chunk in pd.read_csv(path, usecols=columns, chunksize=chunk_rows):
+                yield chunk[columns]
+        return
+
+    star_index = load_star_index(candidate_dir)
+    if star_index is not None:
+        yield from _stream_star_chunks(candidate_dir, star_index, chunk_rows, columns)
+
+
+def _stream_star_chunks(candidate_dir: str, index: Dict, chunk_rows: int,
+                        columns: List[str]) -> Iterator[pd.DataFrame]:
+    """스타 스키마 팩트 테이블을 청크로 읽고 columns에 필요한 차원만 결합"""
+    files = index["files"]
+    route_dim = pd.read_csv(os.path.join(candidate_dir, files["route_dim"])).set_index("route_id")
+    scale_dim = pd.read_csv(os.path.join(candidate_dir, files["scale_dim"])).set_index("scale_id")
+    slot_dim = pd.read_csv(os.path.join(candidate_dir, files["slot_dim"])).set_index("slot")["出発時刻"]
+    fact_columns = ["route_id", "day", "slot", "scale_id"] + [c for c in FACT_COLUMNS if c in columns]
+    fact_columns = list(dict.fromkeys(fact_columns))
+    for fact in pd.read_csv(os.path.join(candidate_dir, files["fact"]), usecols=fact_columns, chunksize=chunk_rows):
+        frame = {}
+        for column in columns:
+            if column == "日付":
+                frame[column] = (fact["day"].astype(str) + "日").to_numpy()
+            elif column == "出発時刻":
+                frame[column] = fact["slot"].map(slot_dim).to_numpy()
+            elif column in ROUTE_DIM_COLUMNS:
+                frame[column] = fact["route_id"].map(route_dim[column]).to_numpy()
+            elif column in SCALE_DIM_COLUMNS:
+                frame[column] = fact["scale_id"].map(scale_dim[column]).to_numpy()
+            else:
+                frame[column] = fact[column].to_numpy()
+        yield pd.DataFrame(frame, columns=columns)
+
+
+class SlotContentionCube:
+    """메모리 매핑 경합 큐브 생성/조회"""
+
+    def __init__(self, cube_dir: str, meta: Dict, mode: str = "r"):
+        self.cube_dir = cube_dir
+        self.meta = meta
+        self.airlines: List[str] = meta["airlines"]
+        self.airports: List[str] = meta["airports"]
+        self.slot_labels: List[str] = meta["slot_labels"]
+        self.airline_ids = {airline_id: i for i, airline_id in enumerate(self.airlines)}
+        self.airport_ids = {airport: i for i, airport in enumerate(self.airports)}
+        self.arrays = {
+            name: np.load(os.path.join(cube_dir, f"{name}.npy"), mmap_mode=mode) for name in CUBE_ARRAYS
+        }
+
+    # ------------------------------------------------------------------
+    # 생성
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def build(cls, airline_ids: List[str], output_dir: str = "output", cube_dir: Optional[str] = None,
+              chunk_rows: int = DEFAULT_CHUNK_ROWS, month: Optional[int] = None) -> "SlotContentionCube":
+        """항공사별 운항후보를 청크 단위로 스트리밍하여 큐브 생성 (메모리에는 청크 하나만 올림)
+
+        항공사별 대상 월이 서로 다르거나 month와 맞지 않으면 ValueError (다른 달의 같은 날짜를 한 칸에 합치지 않음).
+        """
+        candidate_dirs = {
+            airline_id: os.path.join(output_dir, airline_id, "analytics_data", "candidate") for airline_id in airline_ids
+        }
+        airline_months = {
+            airline_id: selected_candidate_month(candidate_dir, month)
+            for airline_id, candidate_dir in candidate_dirs.items()
+        }
+        month = common_candidate_month(airline_months)
+
+        cube_dir = cube_dir or os.path.join(output_dir, CONTENTION_DIR)
+        os.makedirs(cube_dir, exist_ok=True)
+
+        schedule_reader = OperationsFeasibilityChecker()
+        schedule_reader.output_dir = output_dir
+        labels, _ = AirportScheduleDataGenerator().build_slot_template()
+
+        # 공항 축: 운항후보 생성기가 아는 공항 + 스케줄에만 있는 공항
+        airports = list(CandidateDataGenerator().airport_coordinates.keys())
+        schedules = {}
+        for airline_id in airline_ids:
+            schedule = schedule_reader.load_airport_schedule(airline_id)
+            if schedule is not None:
+                schedules[airline_id] = schedule
+                airports.extend(a for a in schedule["空港"].unique() if a not in airports)
+
+        meta = {
+            "airlines": list(airline_ids),
+            "airports": airports,
+            "days": MAX_MONTH_DAYS,
+            "slot_labels": labels,
+            "month": month,
+            "airline_months": airline_months,
+            "chunk_rows": chunk_rows,
+            "rows": {},
+            "skipped_rows": {}
+        }
+        shape = (len(airline_ids), len(airports), MAX_MONTH_DAYS, len(labels))
+        for name, dtype in CUBE_ARRAYS.items():
+            array = np.lib.format.open_memmap(os.path.join(cube_dir, f"{name}.npy"), mode="w+", dtype=dtype, shape=shape)
+            array[:] = -np.inf if name == "best_priority" else 0
+            array.flush()
+            del array
+
+        cube = cls(cube_dir, meta, mode="r+")
+        for airline_id in airline_ids:
+            if airline_id in schedules:
+                cube.add_capacity(airline_id, schedules[airline_id], schedule_reader)
+            candidate_dir = candidate_dirs[airline_id]
+            print(f"📥 {airline_id} 운항후보 스트리밍 집계 중...")
+            rows = skipped = 0
+            for chunk in stream_candidate_chunks(candidate_dir, chunk_rows, airline_months[airline_id]):
+                skipped += cube.add_chunk(airline_id, chunk)
+                rows += len(chunk)
+            meta["rows"][airline_id] = rows
+            meta["skipped_rows"][airline_id] = skipped
+            if rows == 0:
+                print(f"⚠️ {airline_id} 운항후보가 없습니다: {candidate_dir}")
+            else:
+                print(f"✅ {airline_id} 집계 완료: {rows}건 (운영 시간대 밖 {skipped}건 제외)")
+
+        cube.flush()
+        with open(os.path.join(cube_dir, CONTENTION_META_FILE), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+        return cls(cube_dir, meta)
+
+    @classmethod
+    def open(cls, cube_dir: str) -> Optional["SlotContentionCube"]:
+        """생성된 큐브를 읽기 전용 메모리 매핑으로 열기 (없으면 None)"""
+        meta_path = os.path.join(cube_dir, CONTENTION_META_FILE)
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            return cls(cube_dir, json.load(f))
+
+    def add_capacity(self, airline_id: str, schedule: pd.DataFrame, schedule_reader: OperationsFeasibilityChecker):
+        """항공사 공항 스케줄의 割り当て可能回数를 큐브에 기록"""
+        airports, labels, cube = schedule_reader.build_capacity_cube(schedule)
+        if cube.size == 0:
+            return
+        if labels != self.slot_labels:
+            raise ValueError(f"{airline_id} 공항 스케줄의 시간대 구성이 다릅니다")
+        airline = self.airline_ids[airline_id]
+        airport_index = [self.airport_ids[a] for a in airports]
+        self.arrays["capacity"][airline, airport_index, :cube.shape[1]] = cube
+
+    def add_chunk(self, airline_id: str, chunk: pd.DataFrame) -> int:
+        """운항후보 청크를 출발・도착 시간대 칸에 누적, 집계하지 못한 행 수 반환"""
+        airline = self.airline_ids[airline_id]
+        day_count = self.meta["days"]
+        slot_count = len(self.slot_labels)
+        slot_of_time = {label.split(" ~ ")[0]: i for i, label in enumerate(self.slot_labels)}
+
+        days = parse_day_numbers(chunk["日付"]) - 1
+        departure_slot = chunk["出発時刻"].map(slot_of_time).to_numpy(dtype=np.float64)
+        arrival_slot = departure_slot + np.ceil(chunk["飛行時間"].to_numpy(dtype=np.float64) / SLOT_MINUTES)
+        origin = chunk["出発空港"].map(self.airport_ids).to_numpy(dtype=np.float64)
+        destination = chunk["到着空港"].map(self.airport_ids).to_numpy(dtype=np.float64)
+        demand = chunk["需要(名)"].to_numpy(dtype=np.float64)
+        priority = chunk["優先順位指数"].to_numpy(dtype=np.float64)
+
+        cells = []
+        valid_rows = np.zeros(len(chunk), dtype=bool)
+        for airport, slot in [(origin, departure_slot), (destination, arrival_slot)]:
+            valid = ~np.isnan(airport) & ~np.isnan(slot) & (slot < slot_count) & (days >= 0) & (days < day_count)
+            valid_rows |= valid
+            cells.append(np.where(
+                valid,
+                (np.nan_to_num(airport).astype(np.int64) * day_count + days) * slot_count + np.nan_to_num(slot).astype(np.int64),
+                -1
+            ))
+        cells = np.concatenate(cells)
+        keep = cells >= 0
+        cells = cells[keep]
+        demand = np.concatenate([demand, demand])[keep]
+        priority = np.concatenate([priority, priority])[keep]
+
+        cell_count = len(self.airports) * day_count * slot_count
+        counts = self.arrays["counts"][airline].reshape(-1)
+        counts += np.bincount(cells, minlength=cell_count).astype(np.int32)
+        total_demand = self.arrays["demand"][airline].reshape(-1)
+        total_demand += np.bincount(cells, weights=demand, minlength=cell_count)
+
+        # 칸별 최대 우선순위: 정렬 후 구간 최대값으로 한 번에 계산
+        if len(cells):
+            order = np.argsort(cells, kind="stable")
+            unique_cells, starts = np.unique(cells[order], return_index=True)
+            chunk_best = np.maximum.reduceat(priority[order], starts)
+            best = self.arrays["best_priority"][airline].reshape(-1)
+            best[unique_cells] = np.maximum(best[unique_cells], chunk_best)
+        return int((~valid_rows).sum())
+
+    def flush(self):
+        for array in self.arrays.values():
+            if isinstance(array, np.memmap):
+                array.flush()
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+
+    def airport_index(self, airport: str) -> int:
+        if airport not in self.airport_ids:
+            raise KeyError(f"큐브에 없는 공항입니다: {airport}")
+        return self.airport_ids[airport]
+
+    def slot_frame(self, airport: str, day: Optional[int] = None) -> pd.DataFrame:
+        """공항(과 날짜)의 시간대별 전체 항공사 경합 현황 (해당 공항 구간만 읽음)
+
+        割り当て可能回数는 항공사별 스케줄 중 최대값, 競合率 = 候補数 / 割り当て可能回数.
+        """
+        a = self.airport_index(airport)
+        day_slice = slice(day - 1, day) if day is not None else slice(None)
+        counts = np.asarray(self.arrays["counts"][:, a, day_slice])
+        demand = np.asarray(self.arrays["demand"][:, a, day_slice])
+        best = np.asarray(self.arrays["best_priority"][:, a, day_slice])
+        capacity = np.asarray(self.arrays["capacity"][:, a, day_slice]).max(axis=0)
+
+        day_count, slot_count = capacity.shape
+        first_day = day if day is not None else 1
+        total = counts.sum(axis=0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = np.where(capacity > 0, total / np.maximum(capacity, 1), np.where(total > 0, np.inf, 0.0))
+        best_priority = best.max(axis=0)
+        return pd.DataFrame({
+            "空港": airport,
+            "日付": [f"{d}日" for d in np.repeat(np.arange(first_day, first_day + day_count), slot_count)],
+            "時間帯": np.tile(np.array(self.slot_labels, dtype=object), day_count),
+            "候補数": total.ravel(),
+            "航空会社数": (counts > 0).sum(axis=0).ravel(),
+            "需要合計(名)": demand.sum(axis=0).ravel(),
+            "最高優先順位指数": np.where(np.isfinite(best_priority), best_priority, np.nan).ravel(),
+            "割り当て可能回数": capacity.ravel(),
+            "競合率": ratio.ravel()
+        })
+
+    def most_contested(self, airport: str, day: Optional[int] = None, limit: int = 10) -> pd.DataFrame:
+        """공항(과 날짜)에서 競合率이 가장 높은 시간대 상위 limit개"""
+        frame = self.slot_frame(airport, day)
+        frame = frame[frame["候補数"] > 0]
+        return frame.sort_values(["競合率", "候補数"], ascending=False, kind="stable").head(limit).reset_index(drop=True)
+
+    def airline_breakdown(self, airport: str, day: int, slot_label: str) -> pd.DataFrame:
+        """한 칸(공항・날짜・시간대)의 항공사별 후보 수・수요・최고 우선순위・割り当て可能回数"""
+        a = self.airport_index(airport)
+        if slot_label not in self.slot_labels:
+            raise KeyError(f"시간대가 올바르지 않습니다: {slot_label}")
+        s = self.slot_labels.index(slot_label)
+        best = np.asarray(self.arrays["best_priority"][:, a, day - 1, s])
+        frame = pd.DataFrame({
+            "航空会社": self.airlines,
+            "候補数": np.asarray(self.arrays["counts"][:, a, day - 1, s]),
+            "需要合計(名)": np.asarray(self.arrays["demand"][:, a, day - 1, s]),
+            "最高優先順位指数": np.where(np.isfinite(best), best, np.nan),
+            "割り当て可能回数": np.asarray(self.arrays["capacity"][:, a, day - 1, s])
+        })
+        return frame[frame["候補数"] > 0].sort_values("候補数", ascending=False, kind="stable").reset_index(drop=True)
+
+
+def main():
+    """메인 함수"""
+    import argparse
+    import time
+
+    valid_airlines = [f"airline_{i:02d}" for i in range(1, 16)]
+    default_dir = os.path.join("output", CONTENTION_DIR)
+
+    parser = argparse.ArgumentParser(
+        description="항공사 × 공항 × 날짜 × 시간대 경합 큐브 생성/조회",
+        usage="python slot_contention_cube.py build [항공사ID ...] [옵션] | top <공항> [--day N] [옵션]"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = subparsers.add_parser("build", help="운항후보를 스트리밍하여 큐브 생성")
+    build_parser.add_argument("airline_ids", nargs="*", help="항공사 ID (생략 시 airline_01 ~ airline_15 전체)")
+    build_parser.add_argument("--cube-dir", default=default_dir, help=f"큐브 저장 폴더 (기본: {default_dir})")
+    build_parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS,
+                              help=f"한 번에 읽을 운항후보 행 수 (기본: {DEFAULT_CHUNK_ROWS})")
+    build_parser.add_argument("--month", type=int,
+                              help="집계할 월 (월별 레이아웃(--months)은 해당 월을 읽고, 한 달 출력은 같은 월인지 확인)")
+
+    top_parser = subparsers.add_parser("top", help="공항의 경합이 심한 시간대 조회")
+    top_parser.add_argument("airport", help="공항명 (예: 羽田)")
+    top_parser.add_argument("--day", type=int, help="날짜 (생략 시 전체 날짜)")
+    top_parser.add_argument("--limit", type=int, default=10, help="출력할 시간대 수 (기본: 10)")
+    top_parser.add_argument("--breakdown", action="store_true", help="1위 시간대의 항공사별 내역도 출력")
+    top_parser.add_argument("--cube-dir", default=default_dir, help=f"큐브 폴더 (기본: {default_dir})")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        airline_ids = args.airline_ids or valid_airlines
+        invalid = [a for a in airline_ids if a not in valid_airlines]
+        if invalid:
+            print(f"❌ 잘못된 항공사 ID: {', '.join(invalid)}")
+            sys.exit(1)
+        if args.chunk_rows < 1:
+            parser.error("--chunk-rows는 1 이상이어야 합니다")
+        started = time.time()
+        try:
+            cube = SlotContentionCube.build(airline_ids, cube_dir=args.cube_dir, chunk_rows=args.chunk_rows,
+                                            month=args.month)
+        except ValueError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        month_label = f"{cube.meta['month']}월, " if cube.meta["month"] is not None else ""
+        print(f"🎉 경합 큐브 생성 완료: {args.cube_dir} "
+              f"({month_label}{len(cube.airlines)}개 항공사 × {len(cube.airports)}개 공항, {time.time() - started:.1f}초)")
+        return
+
+    cube = SlotContentionCube.open(args.cube_dir)
+    if cube is None:
+        print(f"❌ 경합 큐브가 없습니다: {args.cube_dir} (먼저 build 실행)")
+        sys.exit(1)
+    try:
+        top = cube.most_contested(args.airport, day=args.day, limit=args.limit)
+    except KeyError as e:
+        print(f"❌ {e.args[0]}")
+        sys.exit(1)
+    with pd.option_context("display.width", 200, "display.max_columns", 20):
+        print(top.to_string(index=False))
+        if args.breakdown and not top.empty:
+            day = int(str(top.loc[0, "日付"]).rstrip("日"))
+            print(f"\n🔍 {args.airport} {top.loc[0, '日付']} {top.loc[0, '時間帯']} 항공사별 내역:")
+            print(cube.airline_breakdown(args.airport, day, top.loc[0, "時間帯"]).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()